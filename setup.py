@@ -0,0 +1,22 @@
+""" Optional Cython build of the search modules.
+
+    pip install .                                                # pure Python
+    ROOMBASIM_COMPILE=1 pip install --no-build-isolation .       # needs Cython and a C compiler
+
+A compiled module sits next to its .py source and is picked up by the normal import
+system, so nothing else changes; roombasim.SOLVERS.compiled(name) tells which was loaded.
+"""
+import os
+from setuptools import setup
+
+# modules with the hot generation and search loops
+COMPILED = ('MazeSolver', 'BFSAlgo', 'DFSAlgo', 'GreedyAlgo', 'AStarAlgo', 'DijkstraAlgo',
+            'AnytimeAlgo', 'BatteryAlgo', 'MazeGenAlgo', 'MazeRoomGen')
+
+ext_modules = []
+if os.environ.get('ROOMBASIM_COMPILE'):
+    from Cython.Build import cythonize
+    ext_modules = cythonize(['src/roombasim/{}.py'.format(name) for name in COMPILED],
+                            compiler_directives={'language_level': 3})
+
+setup(ext_modules=ext_modules)
@@ -1,7 +1,10 @@
+import io
+import struct
+import zlib
 import numpy as np
 import unittest
-from Maze import Maze
-from MazeRoomGen import DungeonRooms
+from roombasim.Maze import Maze
+from roombasim.MazeRoomGen import DungeonRooms
 
 
 class GeneratorsTest(unittest.TestCase):
@@ -60,6 +63,35 @@ class GeneratorsTest(unittest.TestCase):
         print()
         print(m)
 
+    def test_renderer(self):
+        """ test the vectorized drawing matches the cell-by-cell one, as text and as PNG """
+        m = Maze(3)
+        m.generator = DungeonRooms(7, 9, rooms=[[(1, 1), (5, 5)]])
+        m.generate()
+        m.generate_entrances(2)
+        # any walk will do for drawing: down the first open column
+        c = int(np.flatnonzero(m.grid[1] == 0)[0])
+        m.solutions = [[(r, c) for r in range(1, 4)]]
+
+        rows = [['#' if cell else ' ' for cell in row] for row in m.grid]
+        for r, c in m.solutions[0]:
+            rows[r][c] = '+'
+        rows[m.start[0]][m.start[1]] = 'S'
+        for r, c in m.end:
+            rows[r][c] = 'E'
+        assert m.tostring(True, True) == '\n'.join(''.join(row) for row in rows)
+        assert m.tostring() == '\n'.join(''.join('#' if cell else ' ' for cell in row) for row in m.grid)
+
+        text, binary = io.StringIO(), io.BytesIO()
+        m.write_text(text)
+        m.write_text(binary)
+        assert text.getvalue() == binary.getvalue().decode() == m.tostring(True, True) + '\n'
+
+        png = io.BytesIO()
+        m.write_png(png)
+        pixels = read_png_indices(png.getvalue())
+        assert (pixels == m.render_codes(True, True)).all()
+
 
 def boundary_is_solid(grid):
     """ Helper method to test of the maze is sane.
@@ -124,3 +156,27 @@ def all_corners_complete(grid):
                 return False
 
     return True
+
+
+def read_png_indices(data):
+    """ decode an 8-bit indexed PNG with unfiltered scanlines, as MazeRenderer writes them
+
+    Args:
+        data (bytes): PNG file
+    Returns:
+        np.array: palette index of every pixel
+    """
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    pos, idat = 8, b''
+    while pos < len(data):
+        n, = struct.unpack('>I', data[pos:pos + 4])
+        kind, body = data[pos + 4:pos + 8], data[pos + 8:pos + 8 + n]
+        assert struct.unpack('>I', data[pos + 8 + n:pos + 12 + n])[0] == zlib.crc32(kind + body)
+        if kind == b'IHDR':
+            W, H = struct.unpack('>II', body[:8])
+        elif kind == b'IDAT':
+            idat += body
+        pos += 12 + n
+    scan = np.frombuffer(zlib.decompress(idat), dtype=np.uint8).reshape(H, W + 1)
+    assert not scan[:, 0].any()
+    return scan[:, 1:]
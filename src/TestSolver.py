@@ -1,11 +1,38 @@
 import unittest
+import asyncio
+import contextlib
+import io
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import numpy as np
 from enum import Enum
-from MazeRoomGen import DungeonRooms
-from Maze import Maze
-from BFSAlgo import BFSAlgo
-from DFSAlgo import DFSAlgo
-from GreedyAlgo import GreedyAlgo
-from AStarAlgo import AStarAlgo
+from roombasim import SOLVERS, Registry
+from roombasim.MazeRoomGen import DungeonRooms
+from roombasim.Maze import Maze
+from roombasim.MazeSolver import MazeSolver
+from roombasim.BFSAlgo import BFSAlgo
+from roombasim.DFSAlgo import DFSAlgo
+from roombasim.GreedyAlgo import GreedyAlgo
+from roombasim.AStarAlgo import AStarAlgo
+from roombasim.SolutionCache import SolutionCache
+from roombasim.Landmarks import Landmarks
+from roombasim.DeadEndFilling import DeadEndFiller
+from roombasim.DijkstraAlgo import DijkstraAlgo
+from roombasim.CooperativePlanner import CooperativePlanner
+from roombasim.CoveragePlanner import CoveragePlanner
+from roombasim.FrontierExplorer import FrontierExplorer, UNKNOWN
+from roombasim.BatteryAlgo import BatteryAlgo
+from roombasim.AnytimeAlgo import AnytimeAlgo
+from roombasim.SolveServer import SolveServer
+from roombasim.SolverSelector import SolverSelector
+from roombasim.Path import Path
+from roombasim import Benchmark
+from roombasim.ExpansionTrace import ExpansionTrace, heat_map
+from roombasim import Visualization
 
 
 class Algo(Enum):
@@ -26,18 +53,18 @@ class TestSolver(unittest.TestCase):
         Returns:
             bool: Does the same cell appear in the solution more than once?
         """
-        for i in range(len(solution[:-1])):
-            if solution[i] in solution[i + 1:]:
-                return True
-        return False
+        if not isinstance(solution, Path):
+            solution = Path.from_cells(solution, max((c for _, c in solution), default=0) + 1)
+        return len(solution.repeats()) > 0
 
     @staticmethod
-    def one_away(cell1, cell2):
+    def one_away(cell1, cell2, connectivity=4):
         """ Is one cell exactly one move from another?
 
         Args:
             cell1 (tuple): Maze position to compare
             cell2 (tuple): Maze position to compare
+            connectivity (int): 4, or 8 if diagonal moves are allowed
         Returns:
             bool: As the two cells next to each other?
         """
@@ -48,22 +75,25 @@ class TestSolver(unittest.TestCase):
             return True
         elif c1 == c2 and abs(r1 - r2) == 1:
             return True
+        elif connectivity == 8 and abs(r1 - r2) == 1 and abs(c1 - c2) == 1:
+            return True
 
         return False
 
     @staticmethod
-    def solution_is_sane(solution):
+    def solution_is_sane(solution, connectivity=4):
         """ verify that each cell in a solution path is next to the previous cell
 
         Args:
             solution (list): path from start to finish
+            connectivity (int): 4, or 8 if diagonal moves are allowed
         Returns:
             bool: Does the solution seem sane and feasible?
         """
         assert len(solution) > 0
 
         for i in range(1, len(solution)):
-            if not TestSolver.one_away(solution[i - 1], solution[i]):
+            if not TestSolver.one_away(solution[i - 1], solution[i], connectivity):
                 print("\n{}\nsolution prev {}, curr {}: {}".format(solution, solution[i - 1], i, solution[i]))
                 return False
 
@@ -97,16 +127,30 @@ class TestSolver(unittest.TestCase):
              None
         """
         if algo == Algo.BFS:
-            maze.solver = BFSAlgo()
+            maze.solver = BFSAlgo(stats=True)
         elif algo == Algo.DFS:
-            maze.solver = DFSAlgo()
+            maze.solver = DFSAlgo(stats=True)
         elif algo == Algo.Greedy:
-            maze.solver = GreedyAlgo()
+            maze.solver = GreedyAlgo(stats=True)
         elif algo == Algo.Astar:
-            maze.solver = AStarAlgo()
+            maze.solver = AStarAlgo(stats=True)
 
         maze.solve()
         TestSolver.validate(maze)
+        TestSolver.stats_are_sane(maze.solver)
+
+    @staticmethod
+    def stats_are_sane(solver):
+        """ verify the per-solve counters of a solver created with stats=True
+        Args:
+            solver (MazeSolver): solver after a solve
+        Returns:
+             None
+        """
+        stats = solver.stats
+        assert stats.expanded > 0 and len(stats.leg_times) > 0
+        assert stats.generated >= stats.visited_peak >= stats.frontier_peak > 0
+        assert stats.preprocess_time > 0 and stats.search_time >= sum(stats.leg_times)
 
     @staticmethod
     def validate(maze):
@@ -117,8 +161,25 @@ class TestSolver(unittest.TestCase):
              None
         """
         for sol in maze.solutions:
-            assert TestSolver.one_away(maze.start, sol[1])
-            assert TestSolver.solution_is_sane(sol)
+            assert TestSolver.one_away(maze.start, sol[1], maze.connectivity)
+            assert TestSolver.solution_is_sane(sol, maze.connectivity)
+            if maze.connectivity == 8:
+                assert not TestSolver.cuts_corner(maze.grid, sol)
+
+    @staticmethod
+    def cuts_corner(grid, solution):
+        """ Does any diagonal step of a solution squeeze past a wall?
+
+        Args:
+            grid (np.array): maze array
+            solution (list): path from start to finish
+        Returns:
+            bool: Is there a diagonal step with a wall on either side of it?
+        """
+        for (r1, c1), (r2, c2) in zip(solution, solution[1:]):
+            if r1 != r2 and c1 != c2 and (grid[r1, c2] or grid[r2, c1]):
+                return True
+        return False
 
     @staticmethod
     def print_maze_solution(maze, algo):
@@ -160,6 +221,876 @@ class TestSolver(unittest.TestCase):
         TestSolver._solve(m, Algo.Astar)
         TestSolver.print_maze_solution(m, Algo.Astar)
 
+    @staticmethod
+    def test_solution_cache():
+        """ Test repeated solves hit the cache, and a new grid invalidates it """
+        m = TestSolver.create_maze_with_varied_goals(3)
+        m.cache = SolutionCache(max_entries=2)
+        m.solver = BFSAlgo()
+
+        m.solve()
+        first = m.solutions
+        cost = m.solver.cost
+        m.solve()
+        assert m.cache.hits == 1 and m.cache.misses == 1
+        assert m.solutions == first
+        assert m.solver.cost == cost
+
+        # a freshly generated grid must not reuse the old entry
+        m.generate()
+        m.generate_entrances(3)
+        m.solve()
+        assert m.cache.misses == 2
+        TestSolver.validate(m)
+
+        # so must the same grid array edited in place
+        m.grid[2, 2] = 1 - m.grid[2, 2]
+        m.solve()
+        assert m.cache.misses == 3
+        TestSolver.validate(m)
+
+        # LRU eviction by entry count
+        m.solver = DFSAlgo()
+        m.solve()
+        assert len(m.cache) == 2
+
+    @staticmethod
+    def test_multi_target():
+        """ Test nearest-first multi-target solves visit every end, and expand less when ends are badly ordered """
+        m = TestSolver.create_maze_with_varied_goals(4)
+        for solver in (BFSAlgo(multi_target=True), DFSAlgo(multi_target=True), GreedyAlgo(multi_target=True)):
+            m.solver = solver
+            m.solve()
+            TestSolver.validate(m)
+            assert all(end in m.solutions[0] for end in m.end)
+
+        # a single corridor, with the ends listed far-first
+        m = Maze()
+        m.grid = np.ones((3, 23), dtype=np.int8)
+        m.grid[1, 1:-1] = 0
+        m.start = (1, 10)
+        m.end = [(1, 21), (1, 1), (1, 11)]
+
+        m.solver = BFSAlgo()
+        m.solve()
+        ordered_cost = m.solver.cost
+
+        m.solver = BFSAlgo(multi_target=True)
+        m.solve()
+        TestSolver.validate(m)
+        assert m.solutions[0][1] == (1, 11)
+        assert m.solver.cost < ordered_cost
+
+    @staticmethod
+    def test_AStar_landmarks():
+        """ Test A* with ALT landmarks finds sane solutions with fewer expansions """
+        m = Maze(seed=7)
+        m.generator = DungeonRooms(20, 20, hunt_order='serpentine')
+        m.generate()
+        m.generate_entrances(3)
+
+        m.solver = AStarAlgo()
+        m.solve()
+        plain_cost = m.solver.cost
+
+        landmarks = Landmarks(m.grid, k=4)
+        assert len(landmarks.landmarks) == landmarks.fields.shape[0] <= 4
+        assert landmarks.matches(m.grid)
+
+        m.solver = AStarAlgo(landmarks=landmarks)
+        m.solve()
+        TestSolver.validate(m)
+        assert m.solver.cost < plain_cost
+
+        # still admissible once cells are walled off, as by dead-end filling or a robot footprint
+        m.reducer = DeadEndFiller()
+        m.solve()
+        TestSolver.validate(m)
+        assert not landmarks.matches(np.zeros_like(m.grid)) and not landmarks.matches(m.grid[1:])
+
+        room = Maze()
+        room.grid = np.ones((15, 15), dtype=np.int8)
+        room.grid[1:-1, 1:-1] = 0
+        room.grid[4:11, 7] = 1
+        room.start, room.end = (7, 3), [(7, 11), (3, 3)]
+        room.min_clearance = 2
+        room.solver = AStarAlgo(landmarks=Landmarks(room.grid, k=4))
+        room.solve()
+        solutions = room.solutions
+        room.solver = AStarAlgo()
+        room.solve()
+        assert len(solutions[0]) == len(room.solutions[0])
+
+    @staticmethod
+    def test_dead_end_filling():
+        """ Test solvers find sane solutions on a dead-end-filled grid, and reductions are cached """
+        m = TestSolver.create_maze_with_varied_goals(3)
+        m.reducer = DeadEndFiller()
+
+        for algo in Algo:
+            TestSolver._solve(m, algo)
+
+        reduced = m.reducer.reduce(m.grid, [m.start] + m.end)
+        assert m.reducer.filled > 0
+        assert (reduced >= m.grid).all()
+        assert all(reduced[cell] == 0 for cell in [m.start] + m.end)
+        assert len(m.reducer._cache) == 1
+
+        # a corridor with a side branch: the branch is filled, the corridor is kept
+        g = np.ones((5, 7), dtype=np.int8)
+        g[1, 1:6] = 0
+        g[2:4, 3] = 0
+        reduced, filled = DeadEndFiller.fill(g, [(1, 1), (1, 5)])
+        assert filled == 2
+        assert (reduced[1, 1:6] == 0).all()
+
+    @staticmethod
+    def test_Dijkstra_floor_costs():
+        """ Test bucket-queue Dijkstra and weighted A* find sane, minimum-cost solutions over weighted floors """
+        m = TestSolver.create_maze_with_varied_goals(1)
+        m.generate_floors((1, 2, 5), patch=2)
+
+        m.solver = DijkstraAlgo()
+        m.solve()
+        TestSolver.validate(m)
+        assert m.solver.distance == sum(int(m.costs[cell]) for cell in m.solutions[0][1:])
+        assert m.solver.distance == TestSolver.min_cost(m.grid, m.costs, m.start, m.end[0])
+
+        m.solver = DijkstraAlgo(heuristic=True)
+        m.solve()
+        TestSolver.validate(m)
+        assert m.solver.distance == TestSolver.min_cost(m.grid, m.costs, m.start, m.end[0])
+
+    @staticmethod
+    def min_cost(grid, costs, start, end):
+        """ Reference heapq Dijkstra: minimum cost of travelling between two cells
+
+        Args:
+            grid (np.array): maze array
+            costs (np.array): cost of entering each cell
+            start (tuple): cell to start from
+            end (tuple): cell to reach
+        Returns:
+            int: minimum total cost of entering every cell after the start
+        """
+        from heapq import heappop, heappush
+        dist = {start: 0}
+        heap = [(0, start)]
+        while heap:
+            d, (r, c) = heappop(heap)
+            if (r, c) == end:
+                return d
+            for n in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                nd = d + int(costs[n])
+                if not grid[n] and nd < dist.get(n, nd + 1):
+                    dist[n] = nd
+                    heappush(heap, (dist[n], n))
+
+    @staticmethod
+    def test_8_connected():
+        """ Test every solver finds sane diagonal solutions, no longer than 4-connected ones """
+        m = TestSolver.create_maze_with_varied_goals(3)
+        m.solver = BFSAlgo()
+        m.solve()
+        orthogonal = len(m.solutions[0])
+
+        m.connectivity = 8
+        for algo in Algo:
+            TestSolver._solve(m, algo)
+        for solver in (BFSAlgo(multi_target=True), DijkstraAlgo(heuristic=True),
+                       AStarAlgo(landmarks=Landmarks(m.grid, k=2, connectivity=8))):
+            m.solver = solver
+            m.solve()
+            TestSolver.validate(m)
+
+        m.solver = BFSAlgo()
+        m.solve()
+        assert len(m.solutions[0]) <= orthogonal
+
+        # open floor: a diagonal line
+        m = Maze()
+        m.connectivity = 8
+        m.grid = np.ones((7, 7), dtype=np.int8)
+        m.grid[1:-1, 1:-1] = 0
+        m.start = (1, 1)
+        m.end = [(5, 5)]
+        m.solver = AStarAlgo()
+        m.solve()
+        assert m.solutions[0] == [(1, 1), (2, 2), (3, 3), (4, 4), (5, 5)]
+
+        # random floors: A*, plain and with landmarks, must find routes as short as BFS
+        rng = np.random.default_rng(1)
+        checked = 0
+        for _ in range(60):
+            m.grid = (rng.random((11, 12)) < 0.3).astype(np.int8)
+            m.grid[[0, -1], :] = m.grid[:, [0, -1]] = 1
+            m.grid[1, 1] = m.grid[9, 10] = 0
+            m.start, m.end = (1, 1), [(9, 10)]
+            field = MazeSolver._distance_field(9 * 12 + 10, 11, 12, m.grid.ravel().tolist(), 8)
+            if field[1 * 12 + 1] < 0:
+                continue
+            checked += 1
+            m.solver = BFSAlgo()
+            m.solve()
+            shortest = len(m.solutions[0])
+            for solver in (AStarAlgo(), AStarAlgo(landmarks=Landmarks(m.grid, k=3, connectivity=8))):
+                m.solver = solver
+                m.solve()
+                TestSolver.validate(m)
+                assert len(m.solutions[0]) == shortest
+        assert checked > 30
+
+    @staticmethod
+    def test_cooperative_planner():
+        """ Test prioritized multi-agent plans are sane and collision-free """
+        # a corridor with a side bay: the second robot must step aside to let the first pass
+        g = np.ones((4, 9), dtype=np.int8)
+        g[1, 1:8] = 0
+        g[2, 6] = 0
+        planner = CooperativePlanner(g)
+        paths = planner.plan([((1, 1), (1, 7)), ((1, 7), (1, 1))])
+        assert planner.unplanned == []
+        assert paths[0] == [(1, c) for c in range(1, 8)]
+        assert (2, 6) in paths[1] and paths[1][-1] == (1, 1)
+        assert not TestSolver.collisions(paths)
+
+        m = TestSolver.create_maze_with_varied_goals(0)
+        free = [tuple(cell) for cell in np.argwhere(m.grid[1:-1, 1:-1] == 0) + 1]
+        agents = list(zip(free[:6], free[-6:][::-1]))
+        for window in (None, 4):
+            planner = CooperativePlanner(m.grid, window=window)
+            paths = planner.plan(agents)
+            horizon = None if window is None else window + 1
+            assert not TestSolver.collisions(paths, horizon)
+            for i, path in enumerate(paths):
+                if i not in planner.unplanned:
+                    assert path[0] == agents[i][0] and path[-1] == agents[i][1]
+                    assert all(p == q or TestSolver.one_away(p, q) for p, q in zip(path, path[1:]))
+
+        # the second robot's goal is on the first one's route until t = 148, and waiting it out
+        # takes about 90000 expansions: the budget must stop that search, not only the next agent
+        g = np.ones((22, 152), dtype=np.int8)
+        g[1:-1, 1:-1] = 0
+        planner = CooperativePlanner(g, time_budget=0.05)
+        paths = planner.plan([((20, 1), (20, 150)), ((19, 149), (20, 149))])
+        assert 1 in planner.unplanned and paths[1] == [(19, 149)]
+        assert planner.cost < 50000
+
+    @staticmethod
+    def collisions(paths, horizon=None):
+        """ Do any two agents share a cell, or swap cells, at the same time step?
+        Agents stay at the end of their path once they reach it.
+
+        Args:
+            paths (list): per agent, the cell occupied at each time step
+            horizon (int): only check this many time steps, all of them if None
+        Returns:
+            bool: Is there a collision between any two agents?
+        """
+        T = max(len(p) for p in paths) if horizon is None else horizon
+
+        def at(path, t):
+            return path[min(t, len(path) - 1)]
+
+        for t in range(T):
+            cells = [at(p, t) for p in paths]
+            if len(set(cells)) != len(cells):
+                return True
+            if t > 0:
+                moves = {(at(p, t - 1), at(p, t)) for p in paths}
+                if any((b, a) in moves for a, b in moves if a != b):
+                    return True
+        return False
+
+    @staticmethod
+    def test_coverage_planner():
+        """ Test coverage routes are sane, visit every free cell, and sweep open rooms without revisits """
+        m = TestSolver.create_maze_with_varied_goals(0)
+        planner = CoveragePlanner(m.grid)
+        assert len(planner.cells) > 0
+
+        start = tuple(np.argwhere(m.grid == 0)[0])
+        route = planner.plan(start)
+        assert route[0] == start
+        assert TestSolver.solution_is_sane(route)
+        assert all(m.grid[cell] == 0 for cell in route)
+        assert planner.coverage == 1.0
+        assert len(set(route)) == (m.grid == 0).sum()
+
+        # a single open room is one boustrophedon cell, swept lane by lane
+        g = np.ones((8, 10), dtype=np.int8)
+        g[1:-1, 1:-1] = 0
+        planner = CoveragePlanner(g)
+        route = planner.plan((1, 1))
+        assert len(planner.cells) == 1
+        assert route[:7] == [(1, 1), (2, 1), (3, 1), (4, 1), (5, 1), (6, 1), (6, 2)]
+        assert planner.coverage == 1.0 and planner.revisits == 0.0
+
+    @staticmethod
+    def test_frontier_explorer():
+        """ Test frontier exploration reveals every free cell, moving one cell at a time """
+        m = TestSolver.create_maze_with_varied_goals(1)
+        explorer = FrontierExplorer(m.grid, m.start, sensor_range=2)
+        assert 0 < explorer.explored() < 1
+
+        trajectory = explorer.run()
+        assert trajectory[0] == m.start
+        assert TestSolver.solution_is_sane(trajectory)
+        assert explorer.explored() == 1.0
+        assert not explorer.frontier
+
+        known = explorer.known_grid()
+        seen = known != UNKNOWN
+        assert (known[seen] == m.grid[seen]).all()
+        assert seen[m.grid == 0].all()
+
+    @staticmethod
+    def test_battery_constrained():
+        """ Test battery-constrained tours visit every end, never run flat, and finish at a dock """
+        m = Maze(seed=3)
+        m.generator = DungeonRooms(10, 10, rooms=[[(1, 1), (5, 5)]])
+        m.generate()
+        m.generate_entrances(4)
+
+        m.solver = BatteryAlgo(capacity=10 ** 6)
+        m.solve()
+        TestSolver.validate(m)
+        assert m.solutions[0][-1] == m.start
+
+        capacity = 60
+        chargers = [(1, 19), (19, 1), (19, 19)]
+        m.solver = BatteryAlgo(capacity=capacity, chargers=chargers)
+        m.solve()
+        TestSolver.validate(m)
+        route = m.solutions[0]
+        assert all(end in route for end in m.end)
+        assert route[-1] in chargers + [m.start]
+        assert m.solver.charges > 0
+
+        docks = set(chargers + [m.start])
+        charge = capacity
+        for cell in route[1:]:
+            charge -= 1
+            assert charge >= 0
+            if cell in docks:
+                charge = capacity
+
+        # the distance fields are an LRU of max_fields, and solving the same grid again reuses its digest
+        m.solver = BatteryAlgo(capacity=capacity, chargers=chargers, max_fields=3)
+        m.solve()
+        digest = m.solver._digest
+        m.solve()
+        assert m.solutions[0] == route and len(m.solver._fields) == 3 and m.solver._digest is digest
+
+        m.solver = BatteryAlgo(capacity=4, chargers=chargers)
+        try:
+            m.solve()
+            assert False, 'A tour this short cannot exist.'
+        except AssertionError as e:
+            assert 'battery' in str(e)
+
+    @staticmethod
+    def test_clearance():
+        """ Test the distance-to-wall transform, and that solvers keep a wide robot clear of walls """
+        m = Maze()
+        m.grid = np.ones((9, 11), dtype=np.int8)
+        m.grid[1:-1, 1:-1] = 0
+        m.grid[4, 2:9] = 1
+        m.grid[1:4, 5] = 1
+        clearance = m.clearance()
+        assert clearance[1, 1] == 1 and clearance[6, 5] == 2
+        assert (clearance[m.grid == 1] == 0).all()
+        assert m.clearance() is clearance
+        m.grid[6, 5] = 1
+        assert m.clearance()[6, 5] == 0
+        m.grid[6, 5] = 0
+
+        # a 3x3 robot keeps its centre at least two cells from every wall
+        m.start = (6, 2)
+        m.end = [(6, 8)]
+        m.min_clearance = 2
+        for algo in Algo:
+            TestSolver._solve(m, algo)
+            assert all(clearance[cell] >= 2 for cell in m.solutions[0])
+
+        m.end = [(1, 1)]
+        try:
+            m.solve()
+            assert False, 'An end against a wall is too tight for the robot.'
+        except AssertionError as e:
+            assert 'footprint' in str(e)
+
+    @staticmethod
+    def test_k_shortest():
+        """ Test the alternative routes: distinct, loopless, sane and shortest first """
+        m = Maze()
+        m.grid = np.ones((7, 9), dtype=np.int8)
+        m.grid[1:-1, 1:-1] = 0
+        m.grid[3, 3:6] = 1
+        m.start = (3, 1)
+        m.end = [(3, 7)]
+        m.solver = BFSAlgo(k=5)
+        m.solve()
+        assert len(m.solutions) == 5
+        assert len({tuple(s) for s in m.solutions}) == 5
+        lengths = [len(s) for s in m.solutions]
+        assert lengths == sorted(lengths) and lengths[0] == lengths[1] == 9
+        for s in m.solutions:
+            assert TestSolver.solution_is_sane(s)
+            assert not TestSolver.duplicates_in_solution(s)
+            assert s[0] == m.start and s[-1] == m.end[0]
+        assert m.tostring(False, True, index=1) != m.tostring(False, True)
+
+        # several ends: every alternative still visits them all, in the same order
+        m.end = [(1, 4), (5, 4), (3, 7)]
+        m.solver = AStarAlgo(k=4)
+        m.solve()
+        assert len(m.solutions) == 4
+        for s in m.solutions:
+            assert TestSolver.solution_is_sane(s)
+            assert [s.index(e) for e in m.end] == sorted(s.index(e) for e in m.end)
+
+        # a corridor with a dead-end branch has exactly one loopless route
+        m.grid = np.ones((7, 9), dtype=np.int8)
+        m.grid[3, 1:-1] = 0
+        m.grid[1:3, 4] = 0
+        m.end = [(3, 7)]
+        m.solver = DFSAlgo(k=3)
+        m.solve()
+        assert m.solutions == [[(3, c) for c in range(1, 8)]]
+
+    @staticmethod
+    def test_anytime():
+        """ Test that anytime A* tightens its bound round by round, down to an optimal route """
+        m = Maze(seed=11)
+        m.generator = DungeonRooms(30, 30, rooms=[[(3, 3), (15, 15)], [(20, 5), (28, 25)]])
+        m.generate()
+        m.generate_entrances(3)
+        m.solver = AnytimeAlgo(weights=(5, 2, 1.5, 1))
+        m.solve()
+        results = m.solver.results
+        assert len(results) >= 1 and m.solver.bound == results[-1][0] == 1
+        for (b1, s1), (b2, s2) in zip(results, results[1:]):
+            assert b2 <= b1 and len(s2) <= len(s1)
+        for bound, sol in results:
+            assert 1 <= bound <= 5
+            assert TestSolver.solution_is_sane(sol)
+        assert m.solutions[0] == results[-1][1]
+
+        # w = 1 is plain A*, and the bound holds against it for the same visiting order
+        m.solver = AStarAlgo()
+        m.solve()
+        assert len(m.solutions[0]) == len(results[-1][1])
+        for bound, sol in results:
+            assert len(sol) - 1 <= bound * (len(m.solutions[0]) - 1)
+
+        # a spent budget still yields the first, inflated route
+        m.solver = AnytimeAlgo(weights=(5, 1), max_expansions=1)
+        m.solve()
+        assert len(m.solver.results) == 1 and m.solver.bound <= 5
+        assert TestSolver.solution_is_sane(m.solutions[0])
+
+        # the expansion budget is per solve, so a reused solver does as well every time
+        m.solver = AnytimeAlgo(weights=(5, 2, 1.5, 1), max_expansions=3000)
+        m.solve()
+        first = (list(m.solver.results), m.solver.bound)
+        m.solve()
+        assert (m.solver.results, m.solver.bound) == first and isinstance(m.solutions[0], Path)
+
+    @staticmethod
+    def test_step_wise():
+        """ Test that stepping a solve in small slices gives what one blocking call gives """
+        m = TestSolver.create_maze_with_varied_goals(3)
+        solvers = [BFSAlgo(), DFSAlgo(multi_target=True), GreedyAlgo(), AStarAlgo(k=2),
+                   DijkstraAlgo(heuristic=True), AnytimeAlgo()]
+        for solver in solvers:
+            m.solver = solver
+            m.solve()
+            blocking, cost = m.solutions, solver.cost
+
+            solver.cost = 0
+            solver.begin(m.grid, m.start, m.end)
+            steps = 1
+            while not solver.step(10):
+                steps += 1
+            assert solver.solutions == blocking and solver.cost == cost
+            # a step never expands twice its budget
+            assert steps > cost // 20
+            assert solver.step(10)
+
+            solver.cost = 0
+            pauses = sum(1 for _ in m.iter_solve(n_expansions=25))
+            # each distance field behind alternative routes settles every open cell once
+            work = cost + (solver.k > 1) * len(m.end) * int(np.count_nonzero(m.grid == 0))
+            assert m.solutions == blocking and pauses <= work // 25 + 2 * len(m.end) + 1
+
+        # a short route on a wide floor: the whole-floor distance fields behind alternative
+        # routes pause like searches, rather than running in one step
+        m = Maze()
+        m.grid = np.ones((41, 41), dtype=np.int8)
+        m.grid[1:-1, 1:-1] = 0
+        m.start, m.end = (1, 1), [(1, 3)]
+        m.solver = BFSAlgo(k=2)
+        pauses = sum(1 for _ in m.iter_solve(n_expansions=25))
+        assert len(m.solutions) == 2 and pauses >= 39 * 39 // 25
+
+        m.solver = BatteryAlgo(capacity=10 ** 6)
+        pauses = sum(1 for _ in m.iter_solve(n_expansions=25))
+        assert pauses >= 2 * (39 * 39 // 25)
+
+    @staticmethod
+    def test_solve_server():
+        """ Test the JSON-lines service: concurrent solves on one maze share a batch, repeats hit the cache """
+        async def session():
+            server = SolveServer(workers=2)
+            listener = await server.start()
+            reader, writer = await asyncio.open_connection(*listener.sockets[0].getsockname()[:2])
+
+            async def send(**job):
+                writer.write(json.dumps(job).encode() + b'\n')
+                await writer.drain()
+
+            async def receive(n):
+                responses = [json.loads(await reader.readline()) for _ in range(n)]
+                return {r['id']: r for r in responses}
+
+            await send(id=0, op='generate', maze='m', rows=10, cols=10, seed=2, entrances=2)
+            generated = (await receive(1))[0]
+            for i, solver in enumerate(['BFS', 'AStar', 'AStar', 'Dijkstra']):
+                await send(id=i + 1, op='solve', maze='m', solver=solver)
+            solved = await receive(4)
+            batches = server.batches
+            await send(id=5, op='solve', maze='m', solver='BFS')
+            await send(id=6, op='solve', maze='nowhere')
+            writer.write(b'{not json\n')
+            await writer.drain()
+            late = await receive(3)
+
+            writer.close()
+            await server.close()
+            return generated, solved, batches, late
+
+        generated, solved, batches, late = asyncio.run(session())
+        assert generated['ok'] and generated['shape'] == [21, 21]
+        assert all(r['ok'] and not r['cached'] for r in solved.values())
+        assert batches == 1
+        assert solved[2]['solutions'] == solved[3]['solutions']
+        for r in solved.values():
+            sol = [tuple(cell) for cell in r['solutions'][0]]
+            assert sol[0] == tuple(generated['start']) and all(tuple(e) in sol for e in generated['end'])
+            assert TestSolver.solution_is_sane(sol)
+        assert late[5]['cached'] and late[5]['solutions'] == solved[1]['solutions']
+        assert not late[6]['ok'] and 'Unknown maze' in late[6]['error']
+        assert not late[None]['ok']
+
+    @staticmethod
+    def test_solve_server_put():
+        """ Test that large grids can be put, too long lines get an error, and a put while a
+        batch is open doesn't change the grid that batch solves """
+        before = np.ones((201, 201), dtype=np.int8)
+        before[1:-1, 1:-1] = 0
+        after = before.copy()
+        after[1:-2, 100] = 1
+
+        async def session(line_limit, jobs):
+            server = SolveServer(workers=1, batch_window=0.2, line_limit=line_limit)
+            listener = await server.start()
+            reader, writer = await asyncio.open_connection(*listener.sockets[0].getsockname()[:2], limit=2 ** 24)
+            for job in jobs:
+                writer.write(json.dumps(job).encode() + b'\n')
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in jobs]
+            writer.close()
+            await server.close()
+            return {r['id']: r for r in responses}, server
+
+        query = {'op': 'solve', 'maze': 'm', 'solver': 'BFS', 'start': [1, 1], 'end': [[1, 199]]}
+        jobs = [{'id': 0, 'op': 'put', 'maze': 'm', 'grid': before.tolist()}, dict(query, id=1),
+                {'id': 2, 'op': 'put', 'maze': 'm', 'grid': after.tolist()}, dict(query, id=3)]
+        responses, server = asyncio.run(session(2 ** 24, jobs))
+        assert responses[0]['ok'] and responses[2]['ok'] and server.batches == 2
+        assert len(responses[1]['solutions'][0]) == 199
+        sol = [tuple(cell) for cell in responses[3]['solutions'][0]]
+        assert len(sol) > 199 and all(not after[cell] for cell in sol) and TestSolver.solution_is_sane(sol)
+
+        # the server caches Paths under Maze.solve's keys, so a Maze can share its cache
+        m = Maze()
+        m.grid, m.start, m.end = after, (1, 1), [(1, 199)]
+        m.cache = server.cache
+        m.solver = BFSAlgo()
+        m.solve()
+        assert m.cache.hits == 1 and isinstance(m.solutions[0], Path) and m.solutions[0] == sol
+
+        # the connection goes on after a line that is too long
+        responses, _ = asyncio.run(session(2 ** 16, jobs[:2]))
+        assert not responses[None]['ok'] and 'longer than' in responses[None]['error']
+        assert not responses[1]['ok'] and 'Unknown maze' in responses[1]['error']
+
+    @staticmethod
+    def test_benchmark_suite():
+        """ Test that the scaling benchmark is reproducible, and flags regressions against a baseline """
+        report = Benchmark.sweep(sizes=(15, 21), densities=(0.0, 0.3), hunt_orders=('serpentine',), goals=(2,),
+                                 solvers=('BFS', 'AStar'), repeats=2, seed=4)
+        assert len(report['records']) == 4
+        for record in report['records']:
+            for name in ('generator', 'BFS', 'AStar'):
+                assert record[name]['time'] > 0 and record[name]['peak_kib'] > 0
+            assert record['BFS']['expansions'] > 0 and record['BFS']['length'] > 1
+            assert record['features']['goals'] == 2 and record['features']['cells'] == record['size'] ** 2
+
+        again = Benchmark.sweep(sizes=(15, 21), densities=(0.0, 0.3), hunt_orders=('serpentine',), goals=(2,),
+                                solvers=('BFS', 'AStar'), repeats=2, seed=4, memory=False)
+        assert [r['BFS']['expansions'] for r in again['records']] == [r['BFS']['expansions'] for r in report['records']]
+        assert Benchmark.compare(again, report) == []
+
+        baseline = json.loads(json.dumps(report))
+        baseline['records'][0]['AStar']['expansions'] /= 2
+        regressions = Benchmark.compare(report, baseline, threshold=0.5)
+        assert len(regressions) == 1 and 'AStar' in regressions[0] and 'expansions' in regressions[0]
+
+    @staticmethod
+    def test_parallel_benchmark():
+        """ Test that the process-pool benchmark table matches one built in this process """
+        mazes = []
+        for seed in range(6):
+            Maze.set_seed(seed)
+            mazes.append(TestSolver.create_maze_with_varied_goals(3))
+        serial = Benchmark.solve_table(mazes, workers=1)
+        assert Benchmark.solve_table(mazes, workers=2) == serial
+        assert len(serial) == 6 and all(len(row) == 4 and min(row) > 1 for row in serial)
+
+    @staticmethod
+    def test_auto_solver():
+        """ Test the grid statistics, the cost model and its refit, and solving with solver='auto' """
+        grid = np.array([[1, 1, 1, 1, 1],
+                         [1, 0, 0, 0, 1],
+                         [1, 0, 0, 0, 1],
+                         [1, 0, 1, 0, 1],
+                         [1, 1, 1, 1, 1]], dtype=np.int8)
+        assert SolverSelector.features(grid, [(3, 1), (3, 3)]) == \
+            {'free_ratio': 8 / 25, 'room_area': 6 / 8, 'junctions': 4 / 8, 'goals': 2, 'cells': 25}
+
+        selector = SolverSelector({'BFS': (0, 0, 0, 0, 0, 0), 'DFS': (-1, 0, 0, 0, 0, 0)})
+        name, predicted = selector.choose(SolverSelector.features(grid, [(3, 1)]))
+        assert name == 'DFS' and abs(predicted - np.exp(-1)) < 1e-12
+
+        # a refit recovers the coefficients the times were made with
+        rng = np.random.default_rng(0)
+        truth = (-12.0, 0.9, 0.5, -0.3, 1.2, 0.8)
+        records = []
+        for _ in range(40):
+            features = {'free_ratio': rng.random(), 'room_area': rng.random(), 'junctions': rng.random(),
+                        'goals': int(rng.integers(1, 8)), 'cells': int(rng.integers(100, 10 ** 6))}
+            records.append({'solver': 'BFS', 'features': features,
+                            'time': float(np.exp(np.dot(truth, SolverSelector.design(features))))})
+        fitted = SolverSelector.fit(records)
+        assert np.allclose(fitted['BFS'], truth, atol=1e-3) and fitted['AStar'] == SolverSelector().coefficients['AStar']
+
+        m = TestSolver.create_maze_with_varied_goals(3)
+        logged = []
+        m.solver = 'auto'
+        m.selector = SolverSelector(log=logged.append)
+        for _ in m.iter_solve(n_expansions=5):
+            pass
+        entry = m.selector.history[-1]
+        assert logged == m.selector.history and entry['solver'] == type(m.selected).__name__[:-4]
+        assert entry['time'] > 0 and entry['predicted'] > 0 and entry['features']['goals'] == 3
+        assert m.solutions == type(m.selected)().solve(m.grid, m.start, m.end)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            m.selector.save(os.path.join(tmp, 'auto.jsonl'))
+            assert SolverSelector.load(os.path.join(tmp, 'auto.jsonl')) == json.loads(json.dumps(logged))
+            # saving again only adds the records made since
+            m.solve()
+            m.selector.save(os.path.join(tmp, 'auto.jsonl'))
+            m.selector.save(os.path.join(tmp, 'auto.jsonl'))
+            assert len(logged) == 2
+            assert SolverSelector.load(os.path.join(tmp, 'auto.jsonl')) == json.loads(json.dumps(logged))
+
+    @staticmethod
+    def test_solve_stats():
+        """ Test the per-solve stats: exact expansion counts, one entry per leg, and nothing collected when off """
+        m = TestSolver.create_maze_with_varied_goals(3)
+        m.solver = BFSAlgo()
+        m.solve()
+        assert m.solver.stats is None
+
+        for solver in [BFSAlgo(stats=True), DFSAlgo(stats=True, multi_target=True), AStarAlgo(stats=True),
+                       DijkstraAlgo(stats=True), AnytimeAlgo(stats=True), BFSAlgo(stats=True, k=2)]:
+            m.solver = solver
+            for _ in range(2):
+                before = solver.cost
+                m.solve()
+                assert solver.stats.expanded == solver.cost - before
+                TestSolver.stats_are_sane(solver)
+            if solver.k == 1 and not isinstance(solver, AnytimeAlgo):
+                assert len(solver.stats.leg_times) == len(m.end)
+
+        m.solver = AStarAlgo(stats=True, trace_memory=True)
+        m.solve()
+        assert m.solver.stats.memory_peak > 0
+
+        # A* stops when it takes the end off the heap, so the end is both generated and expanded
+        corridor = np.ones((3, 5), dtype=np.int8)
+        corridor[1, 1:4] = 0
+        solver = AStarAlgo(stats=True)
+        solver.solve(corridor, (1, 1), [(1, 3)])
+        assert solver.stats.expanded == 3 and solver.stats.generated == 3
+
+        # stats don't change how often a solve pauses, nor depend on it
+        for solver in (AStarAlgo(stats=True), BFSAlgo(stats=True, multi_target=True)):
+            solver.solve(m.grid, m.start, m.end)
+            whole = solver.stats.as_dict()
+            solver.begin(m.grid, m.start, m.end)
+            steps = 1
+            while not solver.step(7):
+                steps += 1
+            stepped = solver.stats.as_dict()
+            assert steps <= stepped['expanded'] // 7 + 1
+            for name in ('expanded', 'generated', 'frontier_peak', 'visited_peak'):
+                assert stepped[name] == whole[name]
+
+    @staticmethod
+    def test_path():
+        """ Test that a Path reads like its list of cells, stitches legs, and packs losslessly """
+        cells = [(1, 1), (1, 2), (1, 3), (2, 3), (3, 3), (3, 2)]
+        p = Path.from_cells(cells, 7)
+        assert p == cells and list(p) == cells and len(p) == 6 and p.nbytes == 24
+        assert p[2] == (1, 3) and p[-1] == (3, 2) and p[1:3] == cells[1:3] and isinstance(p[1:3], Path)
+        assert (2, 3) in p and (2, 2) not in p and p.index((3, 3)) == 4
+        assert p.coords().tolist() == [list(c) for c in cells]
+
+        legs = Path(width=7)
+        legs += cells[:3]
+        legs.extend_flat([2 * 7 + 3])
+        legs += p[4:5]
+        legs.append((3, 2))
+        copy = legs.copy()
+        legs += [(4, 2)]
+        assert copy == p and legs == cells + [(4, 2)] and p + [(4, 2)] == legs
+
+        codes, lengths = p.runs()
+        assert codes.tolist() == [1, 2, 3] and lengths.tolist() == [2, 2, 1]
+        assert Path.from_directions(8, p.directions(), 5, 7) == p and Path.from_runs(8, codes, lengths, 7) == p
+
+        # a long corridor run-length encodes to a few bytes, a diagonal step falls back to raw indices
+        corridor = Path(np.arange(1001, 1001 + 10 ** 5), 10 ** 6)
+        for path in (p, corridor, Path([8, 16, 24], 7), Path([5], 7), Path([], 7)):
+            assert Path.decode(path.encode()) == path and pickle.loads(pickle.dumps(path)) == path
+        assert len(corridor.encode()) < 64
+
+        m = TestSolver.create_maze_with_varied_goals(3)
+        for solver in (BFSAlgo(), AStarAlgo(multi_target=True), DijkstraAlgo(), BatteryAlgo(capacity=10 ** 6)):
+            m.solver = solver
+            m.solve()
+            assert isinstance(m.solutions[0], Path) and TestSolver.solution_is_sane(m.solutions[0])
+
+    @staticmethod
+    def test_loop_erasure():
+        """ Test the linear loop erasure, the pruning built on it, and the vectorized validator """
+        wander = [(1, 1), (1, 2), (2, 2), (1, 2), (1, 3), (2, 3), (2, 2), (2, 1)]
+        erased = [(1, 1), (1, 2), (1, 3), (2, 3), (2, 2), (2, 1)]
+        assert Path.from_cells(wander, 5).erase_loops() == erased
+        solver = BFSAlgo()
+        solver.grid = np.zeros((4, 5), dtype=np.int8)
+        solver.start, solver.end = (1, 1), [(2, 1)]
+        assert solver.prune_solutions([wander, Path.from_cells(wander, 5)]) == [erased[1:-1], erased[1:-1]]
+        assert TestSolver.duplicates_in_solution(wander) and not TestSolver.duplicates_in_solution(erased)
+        assert not TestSolver.duplicates_in_solution([])
+
+        # a random walk of a million steps, on a grid too big for it to reach the walls
+        rng = np.random.default_rng(3)
+        W = 4001
+        steps = np.array([-W, 1, W, -1])[rng.integers(0, 4, 10 ** 6)]
+        walk = Path(2000 * W + 2000 + np.concatenate(([0], np.cumsum(steps))), W)
+        assert len(walk.validate(loopless=False)) == 0 and len(walk.repeats()) > 0
+        loopless = walk.erase_loops()
+        assert loopless.validate() == [] and loopless[0] == walk[0] and loopless[-1] == walk[-1]
+
+        grid = np.zeros((5, 5), dtype=np.int8)
+        grid[2, 2] = 1
+        assert Path.from_cells(erased, 5).validate(grid=grid) == ['Off the grid or in a wall: 1 cells, the first (2, 2).']
+        problems = Path.from_cells([(1, 1), (2, 2), (2, 3), (2, 2)], 5).validate()
+        assert problems == ['Not a move: 1 steps, the first from (1, 1) to (2, 2) at step 0.',
+                            'Visited again: 1 times, the first (2, 2).']
+        assert Path.from_cells([(1, 1), (2, 2)], 5).validate(connectivity=8) == []
+
+    @staticmethod
+    def test_expansion_trace():
+        """ Test that a trace holds every expansion in order, samples and wraps, and survives a save """
+        m = TestSolver.create_maze_with_varied_goals(3)
+        W = m.grid.shape[1]
+        for solver in [BFSAlgo, DFSAlgo, GreedyAlgo, AStarAlgo]:
+            trace = ExpansionTrace()
+            m.solver = solver(trace=trace)
+            m.solve()
+            steps, cells = trace.records()
+            assert trace.count == trace.expansions == m.solver.cost
+            assert steps.tolist() == list(range(m.solver.cost))
+            assert cells[0] == m.start[0] * W + m.start[1]
+            assert not m.grid.ravel()[cells].any()
+
+        # stepped, sampled and wrapped: the latest records of every third expansion
+        full = trace.records()[1]
+        trace = ExpansionTrace(capacity=20, every=3, chunk=8)
+        m.solver = AStarAlgo(trace=trace)
+        m.solver.begin(m.grid, m.start, m.end)
+        while not m.solver.step(20):
+            pass
+        steps, cells = trace.records()
+        assert trace.count == (len(full) + 2) // 3 > 20 == len(cells)
+        assert (steps % 3 == 0).all() and (cells == full[steps]).all()
+
+        saved = io.BytesIO()
+        trace.save(saved)
+        saved.seek(0)
+        loaded = ExpansionTrace.load(saved)
+        assert all((a == b).all() for a, b in zip(loaded.records(), trace.records()))
+        assert (loaded.grid() == (m.grid != 0)).all()
+        heat = heat_map(loaded)
+        assert heat.shape == m.grid.shape and np.nanmax(heat) == steps[-1]
+        assert heat_map(loaded, 'count').sum() == 20
+
+    @staticmethod
+    def test_visualization_cli():
+        """ Test the headless benchmark and maze commands write their files without any plotting import """
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_out, json_out, png_out = (os.path.join(tmp, name) for name in ('t.csv', 't.json', 'm.png'))
+            with contextlib.redirect_stdout(io.StringIO()) as printed:
+                assert Visualization.main(['bench', '--tests', '2', '--workers', '1', '--metric', 'expanded',
+                                           '--headless', '--csv', csv_out, '--json', json_out]) == 0
+                assert Visualization.main(['maze', '--size', '15', '--goals', '2', '--png', png_out]) == 0
+            assert 'Maze 2' in printed.getvalue()
+            with open(json_out) as f:
+                table = json.load(f)['table']
+            with open(csv_out) as f:
+                assert f.read().split() == ['maze,BFS,DFS,Greedy,AStar'] + \
+                    ['{},{}'.format(i + 1, ','.join(map(str, row))) for i, row in enumerate(table)]
+            assert len(table) == 2 and min(min(row) for row in table) > 0
+            with open(png_out, 'rb') as f:
+                assert f.read(8) == b'\x89PNG\r\n\x1a\n'
+        assert 'matplotlib' not in sys.modules
+
+    @staticmethod
+    def test_lazy_registry():
+        """ Test the package imports nothing heavy up front, and the registries load and build by name """
+        probe = ('import sys, roombasim; roombasim.Maze; assert "numpy" not in sys.modules; '
+                 'assert "roombasim.AStarAlgo" not in sys.modules; roombasim.SOLVERS["AStar"]; '
+                 'assert "roombasim.AStarAlgo" in sys.modules')
+        subprocess.run([sys.executable, '-c', probe], check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+
+        assert 'Dijkstra' in SOLVERS and 'Nowhere' not in SOLVERS
+        assert SOLVERS['BFS'] is BFSAlgo and SOLVERS.compiled('BFS') in (True, False)
+        assert isinstance(SOLVERS.create('AStar', k=2), AStarAlgo)
+        registry = Registry('solver', {'Mine': 'BFSAlgo:BFSAlgo'})
+        registry.register('Theirs', 'roombasim.DFSAlgo:DFSAlgo')
+        assert list(registry) == ['Mine', 'Theirs'] and registry['Theirs'] is DFSAlgo
+        try:
+            registry['Nowhere']
+            assert False, 'an unknown name should be rejected'
+        except AssertionError as e:
+            assert 'Unknown solver' in str(e)
+
     @staticmethod
     def test_a_maze_print():
         """ Test a maze throughout BFS, DFS, Greedy, and A*, and print result"""
@@ -188,20 +1119,25 @@ class TestSolver(unittest.TestCase):
         return cost
 
     @staticmethod
-    def test_benchmark(no_of_test=30):
+    def test_benchmark(no_of_test=30, workers=1, metric='length'):
         """ Test mazes throughout BFS, DFS, Greedy, and A*
-         for a given number of time
+         for a given number of time, optionally spread across a process pool
 
         Args:
             no_of_test (int): number of test to be done in benchmark
+            workers (int): worker processes, 1 to stay in this process (default), None for one per CPU
+            metric (str): 'length' of the solutions, or a SolveStats counter such as 'expanded'
         Returns:
             list: table of efficiency of each algorithm solution
         """
-        costTable = []
+        mazes = [TestSolver.create_maze_with_varied_goals(4) for _ in range(no_of_test)]
+
+        def check(i, name, solution):
+            maze = mazes[i]
+            maze.solutions = [solution]
+            TestSolver.validate(maze)
 
-        while no_of_test != 0:
-            costTable.append(TestSolver.test_a_maze())
-            no_of_test -= 1
+        costTable = Benchmark.solve_table(mazes, ('BFS', 'DFS', 'Greedy', 'AStar'), workers, check, metric)
 
         # print()
         # for row in costTable:
@@ -0,0 +1,195 @@
+import sys
+from heapq import heappop, heappush, heapify
+from .MazeSolver import MazeSolver
+from .Path import Path
+
+
+class AStarAlgo(MazeSolver):
+    """ Search the node that has the lowest combined cost and heuristic first
+
+    Solutions is a list: this solver's route, then up to k - 1 loopless alternatives (MazeSolver.k).
+
+    Optional Parameters
+
+    landmarks: Landmarks
+        ALT preprocessing of the grid being solved. When set, the heuristic is the
+        triangle-inequality lower bound instead of plain manhattan distance.
+    """
+
+    def __init__(self, landmarks=None, **kwargs):
+        super(AStarAlgo, self).__init__(**kwargs)
+        self.landmarks = landmarks
+        # heuristic of the current leg: cell -> lower bound on its distance to the end
+        self._h = None
+
+    def cache_options(self):
+        """ Solver settings that change the solutions, folded into SolutionCache keys
+
+        Returns:
+            tuple: hashable, repr-stable solver settings
+        """
+        return super(AStarAlgo, self).cache_options() + (self.landmarks is not None,)
+
+    def _solve(self):
+        """ A* search solutions to the maze
+
+        Returns:
+            list: valid maze solutions
+        """
+        if self.landmarks is not None:
+            assert self.landmarks.matches(self.grid), 'Landmarks were built for a different grid.'
+            assert self.landmarks.connectivity == self.connectivity, \
+                'Landmarks were built for a different connectivity.'
+
+        sol = Path(width=self.grid.shape[1])
+
+        tmp = self.start
+        heap = AStarAlgo.UpdateHeap(tmp, self.end, self.landmarks)
+
+        while len(heap) != 0:
+            end = heappop(heap)[1]
+            cost, tmpSol = yield from self._AStar(tmp, end)
+            assert tmpSol is not None, 'Remaining ends are unreachable.'
+            # store current end, use it as start for the next route
+            tmp = end
+            # increment current cost to total cost
+            self.cost += cost
+            # remove the end, to avoid duplicate add it again
+            tmpSol.pop()
+            # append current path to final solution
+            sol += tmpSol
+
+            heap = AStarAlgo.UpdateHeap(tmp, [row[1] for row in heap], self.landmarks)
+
+        sol.append(tmp)
+
+        return [sol]
+
+    @staticmethod
+    def UpdateHeap(start, ends, landmarks=None):
+        """
+        Args:
+            start (tuple): start cell to calculate distance
+            ends (list): list of ends
+            landmarks (Landmarks): optional ALT preprocessing, for tighter distance estimates
+        Return:
+            heap: heapified list
+        """
+        heap = []
+        heapify(heap)
+        for end in ends:
+            if landmarks is None:
+                node = (AStarAlgo._get_distance(start, end), end)
+            else:
+                node = (landmarks.lower_bound(start, end), end)
+            heappush(heap, node)
+
+        return heap
+
+    def _AStar(self, start, end):
+        """ A* search solutions to the maze
+
+        Cells are reopened whenever a cheaper path to them turns up, and the search
+        only stops when the end is taken off the heap, so the route is a shortest one.
+
+        Args:
+            start (tuple): origin start or the last end
+            end (tuple): one of self.end to reach
+        Returns:
+            int, list: the number of explored cells, valid maze solutions, None if the end is unreachable
+        """
+        counter = 0
+        log = self._log
+        stats = self.stats
+
+        if self.landmarks is None and self.connectivity == 8:
+            self._h = lambda cell: AStarAlgo._get_chebyshev(cell, end)
+        elif self.landmarks is None:
+            self._h = lambda cell: AStarAlgo._get_distance(cell, end)
+        else:
+            h = self.landmarks.heuristic(end)
+            W = self.grid.shape[1]
+            self._h = lambda cell: h(cell[0] * W + cell[1])
+
+        # dict: {cell, moves of the cheapest path found to it}
+        g = {start: 0}
+        # dict: {cell, previous cell on that path}
+        parent = {start: None}
+        # min heap of f, deeper first among equal f
+        heap = [(self._h(start), 0, start)]
+
+        while len(heap) != 0:
+            _, depth, cell = heappop(heap)
+            # stale entry, this cell was reached more cheaply later on
+            if -depth != g[cell]:
+                continue
+            counter += 1
+            if stats is not None:
+                stats.expand(len(heap) + 1)
+            if not counter % self._pause:
+                yield
+
+            if log is not None:
+                log(cell)
+            if cell == end:
+                path = []
+                while cell is not None:
+                    path.append(cell)
+                    cell = parent[cell]
+                path.reverse()
+                if stats is not None:
+                    stats.finish(len(g))
+                return counter, path
+
+            for step in self._steps(cell):
+                self._validate_next(step, cell, g, parent, heap)
+
+        if stats is not None:
+            stats.finish(len(g))
+        return counter, None
+
+    def _validate_next(self, cell, prev, g, parent, heap):
+        """ Verify if a given cell is valid in maze, and queue it
+        if this is the cheapest path to it found so far
+
+        Args:
+            cell (tuple): cell to be verified
+            prev (tuple): expanded cell it is reached from
+            g (dict): moves of the cheapest path found to each cell
+            parent (dict): previous cell on that path
+            heap (list): the open cells
+        Returns:
+            None
+        """
+        r, c = cell
+        if 0 < r < self.grid.shape[0] and 0 < c < self.grid.shape[1] and not self.grid[r][c]:
+            ng = g[prev] + 1
+            if ng < g.get(cell, sys.maxsize):
+                g[cell] = ng
+                parent[cell] = prev
+                heappush(heap, (ng + self._h(cell), -ng, cell))
+
+    @staticmethod
+    def _get_distance(cell1, cell2):
+        """ Calculate manhattan distance distance between given two cells
+
+        Args:
+            cell1 (tuple): a cell
+            cell2 (tuple): a cell
+        Returns:
+            int: manhattan distance
+        """
+        return abs(cell1[0] - cell2[0]) + abs(cell1[1] - cell2[1])
+
+    @staticmethod
+    def _get_chebyshev(cell1, cell2):
+        """ Calculate chebyshev distance between given two cells, the number of
+        moves between them when diagonal moves are allowed
+
+        Args:
+            cell1 (tuple): a cell
+            cell2 (tuple): a cell
+        Returns:
+            int: chebyshev distance
+        """
+        return max(abs(cell1[0] - cell2[0]), abs(cell1[1] - cell2[1]))
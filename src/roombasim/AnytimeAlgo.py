@@ -0,0 +1,280 @@
+from heapq import heappop, heappush, heapify
+from time import perf_counter
+from .MazeSolver import MazeSolver
+from .AStarAlgo import AStarAlgo
+from .Path import Path
+
+INFINITY = float('inf')
+
+
+class AnytimeLeg:
+    """
+    Search state of one leg of an anytime route, kept between inflation rounds:
+    g values, back pointers, the OPEN heap and the INCONS states that improved
+    after they were expanded in the current round.
+    """
+
+    def __init__(self, start, goal, h):
+        self.start = start
+        self.goal = goal
+        # function: flat index -> lower bound on its distance to the goal
+        self.h = h
+        self.g = {start: 0}
+        self.parent = {start: -1}
+        self.open = {start}
+        self.incons = set()
+        self.closed = set()
+        self.heap = []
+
+    def reweight(self, w):
+        """ Start a new round at inflation w: OPEN takes in INCONS and is rekeyed
+
+        Args:
+            w (float): heuristic inflation of the round
+        Returns: None
+        """
+        self.open |= self.incons
+        self.incons = set()
+        self.closed = set()
+        g, h = self.g, self.h
+        self.heap = [(g[s] + w * h(s), g[s], s) for s in self.open]
+        heapify(self.heap)
+
+    def lower_bound(self):
+        """ Lower bound on the cost of this leg's optimal path, the ARA* bound
+
+        Returns:
+            int: min of g(goal) and g + h over OPEN and INCONS
+        """
+        g, h = self.g, self.h
+        bound = g.get(self.goal, INFINITY)
+        for s in self.open | self.incons:
+            bound = min(bound, g[s] + h(s))
+        return bound
+
+    def path(self):
+        """ Follow the back pointers from the goal
+
+        Returns:
+            list: flat indices from start to goal
+        """
+        path = []
+        cell = self.goal
+        while cell != -1:
+            path.append(cell)
+            cell = self.parent[cell]
+        path.reverse()
+        return path
+
+
+class AnytimeAlgo(AStarAlgo):
+    """ Anytime repairing A* (ARA*): a fast w-suboptimal route first, then better ones
+    while the budget lasts.
+
+    Every leg is first searched with the heuristic inflated by the largest weight of
+    the schedule. Each later round lowers the weight and resumes the same search
+    state, re-expanding only the states whose cost improved (INCONS) rather than
+    starting over. A round interrupted by the budget is discarded, so every result
+    keeps a proven suboptimality bound: route cost / (sum over legs of min g + h over
+    OPEN and INCONS), never more than the round's weight. The first route is always
+    completed, whatever the budget. The visiting order of the ends is picked once,
+    as in AStarAlgo, and the bounds are relative to it.
+
+    Optional Parameters
+
+    weights: tuple
+        Decreasing inflation schedule, each at least 1. (default (3.0, 2.0, 1.5, 1.0))
+    time_budget: float
+        Seconds allowed per solve. (default None, unbounded)
+    max_expansions: int
+        Expansions allowed per solve. (default None, unbounded)
+    """
+
+    def __init__(self, weights=(3.0, 2.0, 1.5, 1.0), time_budget=None, max_expansions=None, **kwargs):
+        super(AnytimeAlgo, self).__init__(**kwargs)
+        assert len(weights) > 0 and all(w >= 1 for w in weights), 'Inflation weights must be at least 1.'
+        assert list(weights) == sorted(weights, reverse=True), 'Inflation weights must not increase.'
+        self.weights = tuple(weights)
+        self.time_budget = time_budget
+        self.max_expansions = max_expansions
+        # list: (suboptimality bound, solution) of every route found, best last
+        self.results = []
+        # suboptimality bound of the returned solution
+        self.bound = None
+        self._deadline = None
+        # self.cost when the current solve began, the budget counts from here
+        self._base = 0
+        # flattened grid of the current solve
+        self._flat = None
+
+    def cache_options(self):
+        """ Solver settings that change the solutions, folded into SolutionCache keys
+
+        Returns:
+            tuple: hashable, repr-stable solver settings
+        """
+        return super(AnytimeAlgo, self).cache_options() + \
+            (self.weights, self.time_budget, self.max_expansions)
+
+    def _solve(self):
+        """ anytime A* search solutions to the maze
+
+        Returns:
+            list: valid maze solutions, the best route found within the budget
+        """
+        if self.landmarks is not None:
+            assert self.landmarks.matches(self.grid), 'Landmarks were built for a different grid.'
+            assert self.landmarks.connectivity == self.connectivity, \
+                'Landmarks were built for a different connectivity.'
+
+        self._deadline = None if self.time_budget is None else perf_counter() + self.time_budget
+        self._base = self.cost
+        self._flat = self.grid.ravel().tolist()
+        self.results = []
+        W = self.grid.shape[1]
+        w = self.weights[0]
+
+        # first route: choose the visiting order as AStarAlgo does, and always finish it
+        legs = []
+        tmp = self.start
+        heap = AStarAlgo.UpdateHeap(tmp, self.end, self.landmarks)
+        while len(heap) != 0:
+            end = heappop(heap)[1]
+            leg = AnytimeLeg(tmp[0] * W + tmp[1], end[0] * W + end[1], self._heuristic(end))
+            leg.reweight(w)
+            yield from self._improve(leg, w, budgeted=False)
+            assert leg.goal in leg.g, 'Remaining ends are unreachable.'
+            legs.append(leg)
+            tmp = end
+            heap = AStarAlgo.UpdateHeap(tmp, [row[1] for row in heap], self.landmarks)
+        self._record(legs, w)
+
+        for w in self.weights[1:]:
+            if self.results[-1][0] <= 1 or self._out_of_budget():
+                break
+            finished = True
+            for leg in legs:
+                leg.reweight(w)
+            for leg in legs:
+                finished = yield from self._improve(leg, w)
+                if not finished:
+                    break
+            if not finished:
+                break
+            self._record(legs, w)
+
+        self.bound = self.results[-1][0]
+        self._flat = None
+        return [self.results[-1][1]]
+
+    def _heuristic(self, end):
+        """ Lower bound on the distance from a cell to an end, computed per cell
+        as the search reaches it rather than for the whole grid up front
+
+        Args:
+            end (tuple): cell the leg heads to
+        Returns:
+            function: flat index -> distance lower bound
+        """
+        if self.landmarks is not None:
+            return self.landmarks.heuristic(end)
+        W = self.grid.shape[1]
+        er, ec = end
+
+        if self.connectivity == 8:
+            def h(s):
+                r, c = divmod(s, W)
+                return max(abs(r - er), abs(c - ec))
+        else:
+            def h(s):
+                r, c = divmod(s, W)
+                return abs(r - er) + abs(c - ec)
+        return h
+
+    def _out_of_budget(self):
+        """ Has this solve used up its expansions or its time?
+
+        Returns:
+            bool: True once either budget is spent
+        """
+        if self.max_expansions is not None and self.cost - self._base >= self.max_expansions:
+            return True
+        return self._deadline is not None and perf_counter() >= self._deadline
+
+    def _improve(self, leg, w, budgeted=True):
+        """ ARA* ImprovePath: expand until no OPEN state can beat the goal at inflation w
+
+        Args:
+            leg (AnytimeLeg): search state of the leg, rekeyed for w
+            w (float): heuristic inflation of the round
+            budgeted (bool): stop early when the budget runs out
+        Returns:
+            bool: False if the budget ran out before the round finished
+        """
+        H, W = self.grid.shape
+        flat = self._flat
+        g, h, parent, heap = leg.g, leg.h, leg.parent, leg.heap
+
+        counter = 0
+        log = self._log
+        stats = self.stats
+        while heap:
+            f, gs, s = heap[0]
+            # stale entry: expanded already, or reached more cheaply since
+            if s in leg.closed or gs != g[s]:
+                heappop(heap)
+                continue
+            if f >= g.get(leg.goal, INFINITY):
+                break
+            if budgeted and self._out_of_budget():
+                if stats is not None:
+                    stats.finish(len(g))
+                return False
+
+            heappop(heap)
+            leg.open.discard(s)
+            leg.closed.add(s)
+            if log is not None:
+                log(s)
+            self.cost += 1
+            counter += 1
+            if stats is not None:
+                stats.expand(len(heap))
+            if not counter % self._pause:
+                yield
+
+            for n in MazeSolver._flat_neighbors(s, H, W, flat, self.connectivity):
+                if gs + 1 < g.get(n, INFINITY):
+                    g[n] = gs + 1
+                    parent[n] = s
+                    if n in leg.closed:
+                        leg.incons.add(n)
+                    else:
+                        leg.open.add(n)
+                        heappush(heap, (gs + 1 + w * h(n), gs + 1, n))
+
+        if stats is not None:
+            stats.finish(len(g))
+        return True
+
+    def _record(self, legs, w):
+        """ Keep the route the legs currently give, with its suboptimality bound
+
+        Args:
+            legs (list): AnytimeLeg per leg, in visiting order
+            w (float): inflation of the round that just finished
+        Returns: None
+        """
+        W = self.grid.shape[1]
+        sol = Path(width=W)
+        for leg in legs:
+            sol.extend_flat(leg.path()[:-1])
+        sol.extend_flat([legs[-1].goal])
+
+        cost = len(sol) - 1
+        lower = sum(leg.lower_bound() for leg in legs)
+        bound = min(w, cost / lower) if lower else 1.0
+        # a round that neither shortened the route nor tightened the bound adds nothing
+        if self.results and self.results[-1] == (bound, sol):
+            return
+        self.results.append((bound, sol))
@@ -0,0 +1,186 @@
+from collections import OrderedDict
+from heapq import heappop, heappush
+import numpy as np
+from .MazeSolver import MazeSolver
+from .Path import Path
+from .SolutionCache import SolutionCache
+
+
+class BatteryAlgo(MazeSolver):
+    """ Visit every end on one battery charge budget, recharging at charger cells.
+
+    Every move drains one unit of charge, and stepping onto a charger refills the
+    battery to capacity. Distances between the start, the ends and the chargers come
+    from breadth-first distance fields, computed once per grid and key cell. The tour
+    itself is found by label setting over (cell, ends visited, charge left), cheapest
+    label first, discarding any label another one beats on both cost and charge. A
+    label is only extended to an end if a charger is still within reach from there,
+    so the robot is never stranded.
+
+    Caveat: Solutions is a list but currently have only one solution;
+    alternatives (MazeSolver.k) would ignore the battery.
+
+    Optional Parameters
+
+    capacity: int
+        Moves a full battery lasts. The robot starts full. (default 100)
+    chargers: list
+        Charger (dock) cells. (default [], the start is always treated as a dock)
+    return_to_dock: bool
+        The tour must finish on a charger. (default True)
+    max_fields: int
+        Number of distance fields to keep, keyed by grid and cell. (default 64)
+    """
+
+    def __init__(self, capacity=100, chargers=None, return_to_dock=True, max_fields=64, **kwargs):
+        super(BatteryAlgo, self).__init__(**kwargs)
+        assert self.k == 1, 'Alternative routes would ignore the battery capacity.'
+        self.capacity = capacity
+        self.chargers = list(chargers or [])
+        self.return_to_dock = return_to_dock
+        self.max_fields = max_fields
+        # number of recharges in the last solution
+        self.charges = 0
+        # LRU dict: {(grid digest, connectivity, flat index), distance field}
+        self._fields = OrderedDict()
+        # (grid, digest) of the last solve; the grid is this solver's own copy, so an equal
+        # grid next time is solved without hashing it again
+        self._digest = (None, None)
+
+    def cache_options(self):
+        """ Solver settings that change the solutions, folded into SolutionCache keys
+
+        Returns:
+            tuple: hashable, repr-stable solver settings
+        """
+        return super(BatteryAlgo, self).cache_options() + \
+            (self.capacity, tuple(sorted(self.chargers)), self.return_to_dock)
+
+    def _solve(self):
+        """ battery-constrained tour of the ends
+
+        Returns:
+            list: valid maze solutions
+        """
+        H, W = self.grid.shape
+        flat = self.grid.ravel().tolist()
+        if self._digest[0] is None or not np.array_equal(self._digest[0], self.grid):
+            self._digest = (self.grid, SolutionCache.hash_grid(self.grid))
+        digest = self._digest[1]
+
+        start = self.start[0] * W + self.start[1]
+        goals = []
+        for r, c in self.end:
+            if r * W + c not in goals:
+                goals.append(r * W + c)
+        docks = [start] + [r * W + c for r, c in self.chargers if r * W + c != start]
+        nodes = goals + [d for d in docks if d not in goals]
+
+        fields = []
+        for n in nodes:
+            key = (digest, self.connectivity, n)
+            field = self._fields.get(key)
+            if field is None:
+                # computed once per grid and key cell, pausing like a search
+                field = yield from self._field_steps(n, H, W, flat)
+                self._fields[key] = field
+                while len(self._fields) > self.max_fields:
+                    self._fields.popitem(last=False)
+            else:
+                self._fields.move_to_end(key)
+            fields.append(field)
+
+        tour = yield from self._label_setting(nodes.index(start), nodes, fields, len(goals), set(docks))
+        assert tour is not None, 'No tour of the ends fits the battery capacity.'
+
+        # stitch shortest paths between consecutive stops
+        sol = Path([start], W)
+        self.charges = 0
+        for i, j in zip(tour, tour[1:]):
+            leg = MazeSolver._descend(nodes[i], fields[j], H, W, flat, self.connectivity)
+            sol.extend_flat(leg[1:])
+            if nodes[j] in docks:
+                self.charges += 1
+
+        return [sol]
+
+    def _label_setting(self, start, nodes, fields, n_goals, docks):
+        """ Cheapest tour over the key cells that never runs the battery flat
+
+        Args:
+            start (int): index of the start node
+            nodes (list): flat indices of the goals, then of the docks; the start is a dock
+            fields (list): distance field of every node
+            n_goals (int): the first n_goals nodes are the ends to visit
+            docks (set): flat indices of the cells that recharge the battery
+        Returns:
+            list: node indices of the tour, starting at the start node, or None if infeasible
+        """
+        capacity = self.capacity
+        n = len(nodes)
+        dist = [[fields[j][nodes[i]] for j in range(n)] for i in range(n)]
+        is_dock = [nodes[i] in docks for i in range(n)]
+        # charge needed to get from each node to its nearest dock
+        to_dock = [min((dist[i][j] for j in range(n) if is_dock[j] and dist[i][j] >= 0), default=-1)
+                   for i in range(n)]
+        full = (1 << n_goals) - 1
+
+        # dict: {(node, visited mask), [(cost, charge)] non-dominated labels}
+        front = {}
+        parent = {}
+        heap = []
+
+        def push(cost, node, mask, charge, prev):
+            labels = front.setdefault((node, mask), [])
+            for c, q in labels:
+                if c <= cost and q >= charge:
+                    return
+            labels[:] = [(c, q) for c, q in labels if not (cost <= c and charge >= q)]
+            labels.append((cost, charge))
+            parent[(cost, node, mask, charge)] = prev
+            heappush(heap, (cost, -charge, node, mask))
+
+        push(0, start, 0, capacity, None)
+        counter = 0
+        stats = self.stats
+        while heap:
+            cost, charge, node, mask = heappop(heap)
+            charge = -charge
+            if (cost, charge) not in front.get((node, mask), ()):
+                continue
+            self.cost += 1
+            counter += 1
+            if stats is not None:
+                stats.expand(len(heap))
+            if not counter % self._pause:
+                yield
+
+            if mask == full and (not self.return_to_dock or is_dock[node]):
+                tour = []
+                label = (cost, node, mask, charge)
+                while label is not None:
+                    tour.append(label[1])
+                    label = parent[label]
+                tour.reverse()
+                if stats is not None:
+                    stats.finish(len(parent))
+                return tour
+
+            for j in range(n):
+                d = dist[node][j]
+                if j == node or d < 0 or d > charge:
+                    continue
+                if j < n_goals:
+                    if mask >> j & 1:
+                        continue
+                    left = capacity if is_dock[j] else charge - d
+                    # never strand the robot at an end it cannot leave
+                    if to_dock[j] < 0 or left < to_dock[j]:
+                        continue
+                    push(cost + d, j, mask | 1 << j, left, (cost, node, mask, charge))
+                else:
+                    push(cost + d, j, mask, capacity, (cost, node, mask, charge))
+
+        if stats is not None:
+            stats.finish(len(parent))
+        return None
@@ -0,0 +1,347 @@
+""" Scaling benchmark: sweeps maze size, room density, hunt order and goal count,
+times the generator and every solver over seeded repetitions, writes JSON and
+compares it against a stored baseline. solve_table spreads (maze, solver) cells of
+a benchmark over a process pool, sharing the grids through shared memory.
+
+    python -m roombasim.Benchmark --sizes 15 101 501 --repeats 5 --out bench.json
+    python -m roombasim.Benchmark --baseline bench.json --threshold 0.25
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tracemalloc
+import numpy as np
+from statistics import median
+from time import perf_counter
+from .Maze import Maze
+from .MazeRoomGen import DungeonRooms
+from .SolverSelector import SolverSelector
+from . import SOLVERS
+
+DEFAULT_SIZES = (15, 51, 101, 201)
+DEFAULT_DENSITIES = (0.0, 0.2)
+DEFAULT_HUNT_ORDERS = ('random', 'serpentine')
+DEFAULT_GOALS = (1, 3)
+DEFAULT_SOLVERS = ('BFS', 'DFS', 'Greedy', 'AStar', 'Dijkstra')
+# metrics compared against a baseline, lower is better
+COMPARED = ('time', 'peak_kib', 'expansions', 'generated', 'frontier_peak')
+
+
+def random_rooms(size, density, seed):
+    """ Rooms with odd corners covering about `density` of a size x size grid
+
+    Args:
+        size (int): cells per side of the grid, odd
+        density (float): fraction of the grid to open up as rooms
+        seed (int): random seed of the room layout
+    Returns:
+        list: [top-left, bottom-right] corner pairs, for DungeonRooms
+    """
+    rng = random.Random(seed)
+    rooms = []
+    area = 0
+    target = density * (size - 2) ** 2
+    largest = max(3, size // 4)
+    while area < target and len(rooms) < 1000:
+        h = rng.randrange(3, largest + 1, 2)
+        w = rng.randrange(3, largest + 1, 2)
+        if h > size - 2 or w > size - 2:
+            break
+        r = rng.randrange(1, size - h, 2)
+        c = rng.randrange(1, size - w, 2)
+        rooms.append([(r, c), (r + h - 1, c + w - 1)])
+        area += h * w
+    return rooms
+
+
+def measure(run, memory=True):
+    """ Time one call, and optionally its peak traced memory in a second call
+
+    Args:
+        run (function): work to measure, called once or twice
+        memory (bool): also measure peak memory, under tracemalloc
+    Returns:
+        float, float, object: seconds, peak KiB (None if not measured), result of the timed call
+    """
+    t = perf_counter()
+    result = run()
+    elapsed = perf_counter() - t
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            run()
+            peak = tracemalloc.get_traced_memory()[1] / 1024
+        finally:
+            tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def run_case(size, density, hunt_order, goals, solvers=DEFAULT_SOLVERS, repeats=3, seed=0, memory=True):
+    """ Benchmark one point of the sweep, over seeded repetitions
+
+    Args:
+        size (int): cells per side of the grid, odd
+        density (float): fraction of the grid covered by rooms
+        hunt_order (str): 'random' or 'serpentine'
+        goals (int): number of ends
+        solvers (tuple): names of SOLVERS to run
+        repeats (int): seeded repetitions, maze seed is seed + repetition
+        seed (int): first seed
+        memory (bool): also measure peak memory
+    Returns:
+        dict: case parameters, medians of the SolverSelector statistics of the mazes,
+            then medians per generator and solver
+    """
+    features = []
+    samples = {'generator': []}
+    samples.update((name, []) for name in solvers)
+
+    for rep in range(repeats):
+        m = Maze(seed + rep)
+        m.generator = DungeonRooms((size - 1) // 2, (size - 1) // 2,
+                                   rooms=random_rooms(size, density, seed + rep), hunt_order=hunt_order)
+
+        def generate():
+            Maze.set_seed(seed + rep)
+            m.generate()
+            return m.grid
+        elapsed, peak, _ = measure(generate, memory)
+        samples['generator'].append({'time': elapsed, 'peak_kib': peak})
+
+        Maze.set_seed(seed + rep)
+        m.generate_entrances(goals)
+        features.append(SolverSelector.features(m.grid, m.end))
+        for name in solvers:
+            # time a plain solve, then count with a second, instrumented one
+            m.solver = SOLVERS[name]()
+            t = perf_counter()
+            m.solve()
+            elapsed = perf_counter() - t
+            m.solver = SOLVERS[name](stats=True, trace_memory=memory)
+            m.solve()
+            stats = m.solver.stats
+            samples[name].append({'time': elapsed, 'peak_kib': stats.memory_peak, 'expansions': stats.expanded,
+                                  'generated': stats.generated, 'frontier_peak': stats.frontier_peak,
+                                  'visited_peak': stats.visited_peak, 'preprocess_time': stats.preprocess_time,
+                                  'length': len(m.solutions[0])})
+
+    record = {'size': size, 'density': density, 'hunt_order': hunt_order, 'goals': goals,
+              'features': {key: median(f[key] for f in features) for key in features[0]}}
+    for name, runs in samples.items():
+        record[name] = {metric: median(run[metric] for run in runs) if runs[0][metric] is not None else None
+                        for metric in runs[0]}
+    return record
+
+
+def sweep(sizes=DEFAULT_SIZES, densities=DEFAULT_DENSITIES, hunt_orders=DEFAULT_HUNT_ORDERS, goals=DEFAULT_GOALS,
+          solvers=DEFAULT_SOLVERS, repeats=3, seed=0, memory=True, log=None):
+    """ Benchmark every combination of the sweep parameters
+
+    Args:
+        log (function): optional callback taking each finished record
+        see run_case for the others
+    Returns:
+        dict: JSON-ready report, settings and one record per case
+    """
+    records = []
+    for size in sizes:
+        for density in densities:
+            for hunt_order in hunt_orders:
+                for n in goals:
+                    record = run_case(size, density, hunt_order, n, solvers, repeats, seed, memory)
+                    records.append(record)
+                    if log is not None:
+                        log(record)
+    return {'seed': seed, 'repeats': repeats, 'solvers': list(solvers), 'records': records}
+
+
+def case_key(record):
+    return record['size'], record['density'], record['hunt_order'], record['goals']
+
+
+def compare(report, baseline, threshold=0.25, min_seconds=0.01):
+    """ Find the metrics that got worse than the baseline by more than the threshold.
+    Cases or solvers missing from either report are skipped.
+
+    Args:
+        report (dict): current sweep
+        baseline (dict): stored sweep
+        threshold (float): allowed relative increase, 0.25 is 25% worse
+        min_seconds (float): times below this are timer noise, and never regress
+    Returns:
+        list: human-readable regressions, empty if none
+    """
+    base = {case_key(r): r for r in baseline['records']}
+    regressions = []
+    for record in report['records']:
+        old = base.get(case_key(record))
+        if old is None:
+            continue
+        for name in ['generator'] + report['solvers']:
+            if name not in old or name not in record:
+                continue
+            for metric in COMPARED:
+                now, then = record[name].get(metric), old[name].get(metric)
+                if now is None or then is None or then <= 0:
+                    continue
+                if metric == 'time' and now < min_seconds:
+                    continue
+                if now > then * (1 + threshold):
+                    regressions.append('{} size={} density={} hunt={} goals={}: {} {:.4g} -> {:.4g} (+{:.0%})'.format(
+                        name, *case_key(record), metric, then, now, now / then - 1))
+    return regressions
+
+
+# shared grid block, attached once per worker process
+_shared = None
+
+
+def _attach(name):
+    """ Worker initializer: map the shared grid block
+
+    Args:
+        name (str): shared memory block name
+    Returns: None
+    """
+    from multiprocessing import shared_memory
+    global _shared
+    _shared = shared_memory.SharedMemory(name=name)
+
+
+def _solve_cell(task):
+    """ Worker: solve one (maze, solver) cell on a grid read from shared memory
+
+    Args:
+        task (tuple): maze index, solver name, offset and shape of the grid in the block, start, ends, metric
+    Returns:
+        int, str, list, object: maze index, solver name, first solution, value of the metric
+    """
+    i, name, offset, shape, start, end, metric = task
+    grid = np.ndarray(shape, dtype=np.int8, buffer=_shared.buf, offset=offset)
+    return _solve_one(i, name, grid, start, end, metric)
+
+
+def _solve_one(i, name, grid, start, end, metric):
+    """ Solve one (maze, solver) cell of a table
+
+    Args:
+        i (int): maze index
+        name (str): solver name
+        grid (np.array): maze array
+        start (tuple): start cell
+        end (list): end cells
+        metric (str): see solve_table
+    Returns:
+        int, str, list, object: maze index, solver name, first solution, value of the metric
+    """
+    m = Maze()
+    m.grid = grid
+    m.start = start
+    m.end = end
+    m.solver = SOLVERS[name](stats=metric != 'length')
+    m.solve()
+    value = len(m.solutions[0]) if metric == 'length' else getattr(m.solver.stats, metric)
+    return i, name, m.solutions[0], value
+
+
+def solve_table(mazes, algorithms=('BFS', 'DFS', 'Greedy', 'AStar'), workers=None, on_result=None,
+                metric='length'):
+    """ Solve every maze with every solver across a process pool, in the table
+    format of TestSolver.test_benchmark: one row per maze, the solution length (or
+    another metric) of each solver in order. The grids are copied once into one
+    shared memory block that every worker maps, so only indices and entrances
+    travel per task.
+
+    Args:
+        mazes (list): generated Maze objects, with entrances
+        algorithms (tuple): names of SOLVERS, one column each
+        workers (int): size of the process pool, None for one per CPU, 1 to run in this process
+        on_result (function): optional callback (maze index, solver name, solution), run here
+        metric (str): 'length', or a SolveStats counter such as 'expanded'
+    Returns:
+        list: table of the metric
+    """
+    table = [[0] * len(algorithms) for _ in mazes]
+    column = {name: j for j, name in enumerate(algorithms)}
+
+    def collect(result):
+        i, name, solution, value = result
+        table[i][column[name]] = value
+        if on_result is not None:
+            on_result(i, name, solution)
+
+    if workers == 1:
+        # no pool, so nothing to share
+        for i, m in enumerate(mazes):
+            for name in algorithms:
+                collect(_solve_one(i, name, m.grid, m.start, list(m.end), metric))
+        return table
+
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+    grids = [np.ascontiguousarray(m.grid, dtype=np.int8) for m in mazes]
+    block = shared_memory.SharedMemory(create=True, size=max(1, sum(g.nbytes for g in grids)))
+    try:
+        tasks = []
+        offset = 0
+        for i, (m, g) in enumerate(zip(mazes, grids)):
+            np.ndarray(g.shape, dtype=np.int8, buffer=block.buf, offset=offset)[:] = g
+            tasks += [(i, name, offset, g.shape, m.start, list(m.end), metric) for name in algorithms]
+            offset += g.nbytes
+
+        with ProcessPoolExecutor(workers, initializer=_attach, initargs=(block.name,)) as pool:
+            chunk = max(1, len(tasks) // (4 * (workers or os.cpu_count() or 1)))
+            for result in pool.map(_solve_cell, tasks, chunksize=chunk):
+                collect(result)
+    finally:
+        block.close()
+        block.unlink()
+
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Maze generator and solver scaling benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='odd cells per side')
+    parser.add_argument('--densities', type=float, nargs='+', default=DEFAULT_DENSITIES)
+    parser.add_argument('--hunt-orders', nargs='+', default=DEFAULT_HUNT_ORDERS)
+    parser.add_argument('--goals', type=int, nargs='+', default=DEFAULT_GOALS)
+    parser.add_argument('--solvers', nargs='+', default=DEFAULT_SOLVERS, choices=sorted(SOLVERS))
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass')
+    parser.add_argument('--out', help='write the JSON report here')
+    parser.add_argument('--baseline', help='JSON report to compare against')
+    parser.add_argument('--threshold', type=float, default=0.25)
+    parser.add_argument('--min-seconds', type=float, default=0.01, help='noise floor of time comparisons')
+    parser.add_argument('--fit', action='store_true', help='print SolverSelector coefficients fitted to the sweep')
+    args = parser.parse_args(argv)
+
+    def log(record):
+        print('size={size} density={density} hunt={hunt_order} goals={goals}'.format(**record), ' '.join(
+            '{}={:.4f}s'.format(name, record[name]['time']) for name in ['generator'] + list(args.solvers)))
+
+    report = sweep(args.sizes, args.densities, args.hunt_orders, args.goals, args.solvers,
+                   args.repeats, args.seed, not args.no_memory, log)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=1)
+    if args.fit:
+        for name, coefficients in SolverSelector.fit(SolverSelector.samples(report)).items():
+            print('{!r}: {},'.format(name, coefficients))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.threshold, args.min_seconds)
+        for line in regressions:
+            print('REGRESSION', line)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,322 @@
+from collections import deque
+from heapq import heappop, heappush
+from time import perf_counter
+from .MazeSolver import MazeSolver
+
+INFINITY = float('inf')
+
+
+class TrueDistance:
+    """
+    Reverse-resumable BFS from a goal: maze distances to the goal, expanded lazily
+    only as far as the queries need, and resumed where it stopped on the next query.
+    One instance per goal is shared by every agent and window that heads there.
+    """
+
+    def __init__(self, goal, H, W, flat, connectivity=4):
+        self.H = H
+        self.W = W
+        self.flat = flat
+        self.connectivity = connectivity
+        # dict: {flat index, distance to goal}
+        self.dist = {goal: 0}
+        self._q = deque([goal])
+
+    def get(self, cell):
+        """ Maze distance from a cell to the goal
+
+        Args:
+            cell (int): flat index
+        Returns:
+            int: number of moves to the goal, INFINITY if unreachable
+        """
+        d = self.dist.get(cell)
+        if d is not None:
+            return d
+
+        # BFS settles cells in distance order, so resume until this one is reached
+        dist, q = self.dist, self._q
+        while q:
+            current = q.popleft()
+            nd = dist[current] + 1
+            for n in MazeSolver._flat_neighbors(current, self.H, self.W, self.flat, self.connectivity):
+                if n not in dist:
+                    dist[n] = nd
+                    q.append(n)
+            if cell in dist:
+                return dist[cell]
+
+        return INFINITY
+
+
+class CooperativePlanner:
+    """
+    Cooperative A* / windowed hierarchical cooperative A* (WHCA*) for many robots on one floor.
+
+    Agents are planned one at a time in priority order, each by a space-time A* that
+    avoids the cells, and head-on swaps, already reserved by the agents before it.
+    Reservations are compact integer keys t * H * W + cell. The heuristic is the true
+    maze distance to each goal from a reverse-resumable BFS, kept across replans.
+
+    An agent with no plan (out of time, out of expansions, its goal in another region
+    or taken by an agent parked there) is listed in `unplanned` and stays at its start.
+    Its start is only reserved from then on, so the agents planned before it may still
+    pass through that cell: the paths of unplanned agents are not collision-free
+    against higher-priority ones, and those agents should wait for a replan.
+
+    Optional Parameters
+
+    connectivity: int
+        4 or 8, see Maze.connectivity. (default 4)
+    window: int
+        Only the first `window` moves of each plan are coordinated; the rest follows
+        the true-distance heuristic and should be replanned in the next window.
+        (default None, coordinate whole paths)
+    time_budget: float
+        Seconds allowed per call to plan(). The agent being searched when it runs out,
+        and every agent after it, keep their position and are listed in `unplanned`.
+        (default None, unbounded)
+    max_expansions: int
+        Space-time states one agent may expand before it gives up and waits. (default 100000)
+    """
+
+    def __init__(self, grid, connectivity=4, window=None, time_budget=None, max_expansions=100000):
+        assert connectivity in (4, 8), 'Connectivity must be 4 or 8.'
+        self.H, self.W = grid.shape
+        self.N = self.H * self.W
+        self.flat = grid.ravel().tolist()
+        self.connectivity = connectivity
+        self.window = window
+        self.time_budget = time_budget
+        self.max_expansions = max_expansions
+        # total space-time states expanded by the last plan()
+        self.cost = 0
+        # indices of the agents the last plan() found no path for, left at their start
+        self.unplanned = []
+        # dict: {goal, TrueDistance}
+        self._heuristics = {}
+        # connected component of every cell, labelled here so plan() budgets only the search
+        self._components = self._label_components()
+        self._reset_reservations()
+
+    def plan(self, agents):
+        """ Plan collision-free paths for many agents, in priority order
+
+        Args:
+            agents (list): (start, goal) cell pairs, highest priority first
+        Returns:
+            list: per agent, the cell occupied at each time step, from t = 0
+        """
+        self._reset_reservations()
+        self.cost = 0
+        self.unplanned = []
+        deadline = None if self.time_budget is None else perf_counter() + self.time_budget
+
+        paths = []
+        for i, (start, goal) in enumerate(agents):
+            s = self._index(start)
+            path = None
+            if deadline is None or perf_counter() < deadline:
+                path = self._space_time_astar(s, self._index(goal), deadline)
+            if path is None:
+                self.unplanned.append(i)
+                path = [s]
+            self._reserve(path)
+            paths.append([divmod(c, self.W) for c in path])
+
+        return paths
+
+    def true_distance(self, goal):
+        """ Shared reverse-BFS distance field towards a goal
+
+        Args:
+            goal (tuple): target cell
+        Returns:
+            TrueDistance: lazily expanded distances to the goal
+        """
+        g = self._index(goal)
+        h = self._heuristics.get(g)
+        if h is None:
+            h = TrueDistance(g, self.H, self.W, self.flat, self.connectivity)
+            self._heuristics[g] = h
+        return h
+
+    def _index(self, cell):
+        return cell[0] * self.W + cell[1]
+
+    def _reset_reservations(self):
+        """ Forget every reservation; the true-distance heuristics are kept
+
+        Returns: None
+        """
+        # set: t * N + cell, cells taken at each time step
+        self._cells = set()
+        # set: (t * N + from) * N + to, moves made between t and t + 1
+        self._moves = set()
+        # dict: {cell, time from which an agent stays there for good}
+        self._parked = {}
+        # dict: {cell, last time step it is reserved}
+        self._last = {}
+        # first time step with no reservations left, only parked agents
+        self._horizon = 0
+
+    def _free(self, cell, t):
+        """ Can an agent be in this cell at time t?
+
+        Args:
+            cell (int): flat index
+            t (int): time step
+        Returns:
+            bool: True if no reservation or parked agent takes the cell
+        """
+        if t * self.N + cell in self._cells:
+            return False
+        parked = self._parked.get(cell)
+        return parked is None or t < parked
+
+    def _space_time_astar(self, start, goal, deadline=None):
+        """ A* over (cell, time) states, avoiding reservations
+
+        Args:
+            start (int): flat index at t = 0
+            goal (int): flat index to reach and stay at
+            deadline (float): perf_counter() time to give up at, None for no limit
+        Returns:
+            list: flat index at each time step, or None if no plan was found
+        """
+        # another agent already stays at the goal for good
+        if goal in self._parked:
+            return None
+        # don't let the lazy BFS exhaust a whole component to prove a goal unreachable
+        components = self._components
+        if components[start] != components[goal] or components[start] < 0:
+            return None
+
+        h = self.true_distance(divmod(goal, self.W))
+        h0 = h.get(start)
+        if h0 == INFINITY:
+            return None
+
+        N = self.N
+        window = self.window
+        # past the horizon only parked agents remain and waiting gains nothing,
+        # so every later time step shares one layer of state keys
+        horizon = self._horizon
+        # state key t * N + cell -> parent state key
+        parent = {start: -1}
+        heap = [(h0, h0, 0, start)]
+        counter = 0
+
+        while heap and counter < self.max_expansions:
+            f, hc, t, cell = heappop(heap)
+            counter += 1
+            # the clock is read every 256 expansions, so checking it costs next to nothing
+            if deadline is not None and not counter & 255 and perf_counter() >= deadline:
+                break
+
+            # done: at the goal with nobody passing through it later,
+            # or at the end of the coordinated window
+            if (cell == goal and self._last.get(goal, -1) < t) or (window is not None and t >= window):
+                self.cost += counter
+                path = self._unwind(parent, min(t, horizon) * N + cell)
+                if cell != goal:
+                    path += self._descend(cell, h)[1:]
+                return path
+
+            nt = t + 1
+            moves = MazeSolver._flat_neighbors(cell, self.H, self.W, self.flat, self.connectivity)
+            if t < horizon:
+                moves.append(cell)
+            for n in moves:
+                key = min(nt, horizon) * N + n
+                if key in parent or not self._free(n, nt):
+                    continue
+                # no head-on swap with an agent moving the other way
+                if n != cell and (t * N + n) * N + cell in self._moves:
+                    continue
+                hn = h.get(n)
+                if hn == INFINITY:
+                    continue
+                parent[key] = min(t, horizon) * N + cell
+                heappush(heap, (nt + hn, hn, nt, n))
+
+        self.cost += counter
+        return None
+
+    def _label_components(self):
+        """ Label the connected open regions of the grid
+
+        Returns:
+            list: component number of every flat index, -1 for walls
+        """
+        flat = self.flat
+        labels = [-1] * self.N
+        label = 0
+        for seed in range(self.N):
+            if flat[seed] or labels[seed] >= 0:
+                continue
+            labels[seed] = label
+            q = deque([seed])
+            while q:
+                cell = q.popleft()
+                for n in MazeSolver._flat_neighbors(cell, self.H, self.W, flat, self.connectivity):
+                    if labels[n] < 0:
+                        labels[n] = label
+                        q.append(n)
+            label += 1
+
+        return labels
+
+    def _unwind(self, parent, key):
+        """ Rebuild the cell sequence ending at a space-time state
+
+        Args:
+            parent (dict): state key -> parent state key
+            key (int): final state key
+        Returns:
+            list: flat index at each time step
+        """
+        path = []
+        while key != -1:
+            path.append(key % self.N)
+            key = parent[key]
+        path.reverse()
+        return path
+
+    def _descend(self, cell, h):
+        """ Uncoordinated rest of a path beyond the window: follow the distance gradient
+
+        Args:
+            cell (int): flat index to start from
+            h (TrueDistance): distances to the goal
+        Returns:
+            list: flat indices from cell to the goal
+        """
+        path = [cell]
+        d = h.get(cell)
+        while d > 0:
+            cell = min(MazeSolver._flat_neighbors(cell, self.H, self.W, self.flat, self.connectivity), key=h.get)
+            d = h.get(cell)
+            path.append(cell)
+        return path
+
+    def _reserve(self, path):
+        """ Reserve the coordinated part of a planned path, and park the agent at its end
+
+        Args:
+            path (list): flat index at each time step
+        Returns: None
+        """
+        N = self.N
+        horizon = len(path) if self.window is None else min(len(path), self.window + 1)
+
+        self._horizon = max(self._horizon, horizon)
+        for t in range(horizon):
+            cell = path[t]
+            self._cells.add(t * N + cell)
+            self._last[cell] = max(self._last.get(cell, -1), t)
+            if t > 0:
+                self._moves.add(((t - 1) * N + path[t - 1]) * N + cell)
+
+        if horizon == len(path):
+            self._parked[path[-1]] = len(path) - 1
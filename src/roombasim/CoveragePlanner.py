@@ -0,0 +1,256 @@
+import numpy as np
+from .MazeSolver import MazeSolver
+
+
+class CoveragePlanner:
+    """
+    Full-coverage route over every free cell reachable from a start cell, for cleaning.
+
+    Rooms (the open areas carved by DungeonRooms, found as cells of fully open 2x2
+    blocks) are split into boustrophedon cells: runs of columns with one open segment
+    each, that neither split nor merge. Each boustrophedon cell is swept lane by lane,
+    alternating up and down. Corridors, and the links between swept cells, are covered
+    by a depth-first walk of a spanning tree, backtracking along it (spanning-tree
+    coverage). Every cell joins the walk once, so the plan is linear in the number of
+    free cells plus the short in-room travel between a swept cell's exits.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.H, self.W = grid.shape
+        self._flat = grid.ravel().tolist()
+        # list of boustrophedon cells, each a list of (column, top row, bottom row) lanes
+        self.cells = []
+        # group id of every flat index, -1 for corridor (and wall) cells
+        self._group = None
+        # coverage ratio and revisit overhead of the last plan
+        self.coverage = 0.0
+        self.revisits = 0.0
+        self._decompose()
+
+    def plan(self, start):
+        """ Build a route from the start cell that visits every reachable free cell
+
+        Args:
+            start (tuple): free cell to start from
+        Returns:
+            list: cells in visiting order, each one move from the previous
+        """
+        assert not self.grid[start[0], start[1]], 'Coverage must start on a free cell.'
+        W = self.W
+        visited = [False] * len(self._flat)
+
+        s = start[0] * W + start[1]
+        route = [s]
+        # frames of [node entry cell, exits still to try, index of next exit]
+        stack = [self._enter(s, route, visited)]
+
+        while stack:
+            frame = stack[-1]
+            entry, exits, i = frame
+            if i < len(exits):
+                frame[2] += 1
+                inside, outside = exits[i]
+                if visited[outside]:
+                    continue
+                self._travel(route, inside)
+                route.append(outside)
+                stack.append(self._enter(outside, route, visited))
+                continue
+
+            # this node is done: walk back to where it was entered and out to the parent
+            stack.pop()
+            if stack:
+                self._travel(route, entry)
+                parent = stack[-1]
+                route.append(parent[1][parent[2] - 1][0])
+
+        # the trailing backtrack after the last new cell covers nothing
+        seen = set()
+        last_new = 0
+        for i, c in enumerate(route):
+            if c not in seen:
+                seen.add(c)
+                last_new = i
+        route = route[:last_new + 1]
+
+        covered = len(seen)
+        free = int((self.grid == 0).sum())
+        self.coverage = covered / free if free else 1.0
+        self.revisits = (len(route) - covered) / covered
+        return [divmod(c, W) for c in route]
+
+    def _enter(self, cell, route, visited):
+        """ Visit the node a route has just stepped into: sweep a room cell, or take a corridor cell
+
+        Args:
+            cell (int): flat index the route entered at, already on the route
+            route (list): route so far
+            visited (list): covered flags per flat index
+        Returns:
+            list: a new DFS frame [entry cell, exits, 0]
+        """
+        g = self._group[cell]
+        if g < 0:
+            visited[cell] = True
+            exits = [(cell, n) for n in self._neighbors(cell)]
+            return [cell, exits, 0]
+
+        sweep = self._sweep(g, cell)
+        for c in sweep:
+            visited[c] = True
+        # sweep[0] is the entry cell, already on the route
+        route.extend(sweep[1:])
+
+        # try the exits nearest the end of the sweep first
+        exits = []
+        seen = set()
+        for c in reversed(sweep):
+            if c in seen:
+                continue
+            seen.add(c)
+            for n in self._neighbors(c):
+                if self._group[n] != g:
+                    exits.append((c, n))
+        return [cell, exits, 0]
+
+    def _neighbors(self, cell):
+        return MazeSolver._flat_neighbors(cell, self.H, self.W, self._flat)
+
+    def _decompose(self):
+        """ Boustrophedon decomposition of the room areas, column by column
+
+        Returns: None
+        """
+        free = self.grid == 0
+        # rooms are the cells of fully open 2x2 blocks; corridors are one cell wide
+        block = free[:-1, :-1] & free[1:, :-1] & free[:-1, 1:] & free[1:, 1:]
+        room = np.zeros_like(free)
+        room[:-1, :-1] |= block
+        room[1:, :-1] |= block
+        room[:-1, 1:] |= block
+        room[1:, 1:] |= block
+        # keep within the bounds solvers move in
+        room[0, :] = False
+        room[:, 0] = False
+
+        group = np.full(self.grid.shape, -1, dtype=np.int64)
+        prev = []
+        for c in range(1, self.W):
+            col = room[:, c]
+            edges = np.flatnonzero(np.diff(np.concatenate(([False], col, [False])).astype(np.int8)))
+            segments = list(zip(edges[::2], edges[1::2] - 1))
+
+            # overlaps between this column's segments and the previous column's
+            links = [[] for _ in segments]
+            back = [0] * len(prev)
+            j = 0
+            for i, (t, b) in enumerate(segments):
+                while j < len(prev) and prev[j][1] < t:
+                    j += 1
+                k = j
+                while k < len(prev) and prev[k][0] <= b:
+                    links[i].append(k)
+                    back[k] += 1
+                    k += 1
+
+            current = []
+            for i, (t, b) in enumerate(segments):
+                if len(links[i]) == 1 and back[links[i][0]] == 1:
+                    g = prev[links[i][0]][2]
+                else:
+                    g = len(self.cells)
+                    self.cells.append([])
+                self.cells[g].append((c, int(t), int(b)))
+                group[t:b + 1, c] = g
+                current.append((t, b, g))
+            prev = current
+
+        self._group = group.ravel().tolist()
+
+    def _sweep(self, g, entry):
+        """ Boustrophedon sweep of one room cell, from the corner lane nearest the entry
+
+        Args:
+            g (int): boustrophedon cell id
+            entry (int): flat index the route entered the cell at
+        Returns:
+            list: flat indices, starting at the entry, each one move from the previous
+        """
+        W = self.W
+        lanes = self.cells[g]
+        er, ec = divmod(entry, W)
+        if abs(ec - lanes[-1][0]) < abs(ec - lanes[0][0]):
+            lanes = lanes[::-1]
+
+        c, t, b = lanes[0]
+        row = t if er - t <= b - er else b
+        path = [entry]
+        self._walk_to(path, g, row * W + c)
+
+        for i, (c, t, b) in enumerate(lanes):
+            if i > 0:
+                pc, pt, pb = lanes[i - 1]
+                x = min(max(row, t, pt), b, pb)
+                self._column(path, pc, row, x)
+                path.append(x * W + c)
+                row = x
+            # cover the lane: nearer end first, then the far end
+            if row - t <= b - row:
+                self._column(path, c, row, t)
+                self._column(path, c, t, b)
+                row = b
+            else:
+                self._column(path, c, row, b)
+                self._column(path, c, b, t)
+                row = t
+        return path
+
+    def _column(self, path, c, r1, r2):
+        """ Append a straight vertical walk, excluding its first cell
+
+        Args:
+            path (list): flat indices walked so far, ending at (r1, c)
+            c (int): column
+            r1 (int): row to walk from
+            r2 (int): row to walk to
+        Returns: None
+        """
+        step = 1 if r2 >= r1 else -1
+        path.extend(r * self.W + c for r in range(r1 + step, r2 + step, step))
+
+    def _walk_to(self, path, g, target):
+        """ Walk inside one room cell from the end of a path to a target cell
+
+        Args:
+            path (list): flat indices walked so far
+            g (int): boustrophedon cell id both cells belong to
+            target (int): flat index to reach
+        Returns: None
+        """
+        W = self.W
+        lanes = self.cells[g]
+        first = lanes[0][0]
+        r, c = divmod(path[-1], W)
+        tr, tc = divmod(target, W)
+        while c != tc:
+            nc = c + (1 if tc > c else -1)
+            _, t, b = lanes[nc - first]
+            _, pt, pb = lanes[c - first]
+            x = min(max(r, t, pt), b, pb)
+            self._column(path, c, r, x)
+            path.append(x * W + nc)
+            r, c = x, nc
+        self._column(path, c, r, tr)
+
+    def _travel(self, route, cell):
+        """ Extend the route, within the node it is in, to a cell of the same node
+
+        Args:
+            route (list): route so far
+            cell (int): flat index to reach
+        Returns: None
+        """
+        if route[-1] == cell:
+            return
+        self._walk_to(route, self._group[cell], cell)
@@ -0,0 +1,100 @@
+from collections import OrderedDict
+import numpy as np
+from .SolutionCache import SolutionCache
+
+
+class DeadEndFiller:
+    """
+    Pre-solve reduction pass: repeatedly wall off open cells with at most one open
+    neighbour, until only the corridors and rooms that connect the protected cells
+    (start and ends) remain. No simple path between protected cells goes through a
+    filled cell, so solvers searching the reduced grid can't wander into dead ends.
+
+    The first pass counts neighbours of the whole grid with shifted-array sums; later
+    passes only recount the cells next to the ones just filled, so total work stays
+    linear in the grid size however long the dead-end branches are.
+
+    Optional Parameters
+
+    max_entries: int
+        Number of reductions to keep, keyed by grid and protected cells. (default 32)
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        # number of cells the last call to reduce() eliminated
+        self.filled = 0
+        # dict: {(grid digest, protected cells), (reduced grid, filled)}
+        self._cache = OrderedDict()
+
+    def reduce(self, grid, protected, grid_digest=None):
+        """ Fill the dead ends of a maze grid, keeping the protected cells open
+
+        Args:
+            grid (np.array): maze array
+            protected (list): cells that must stay open, usually the start and ends
+            grid_digest (str): precomputed SolutionCache.hash_grid of the grid, if known
+        Returns:
+            np.array: reduced copy of the grid, must not be modified
+        """
+        if grid_digest is None:
+            grid_digest = SolutionCache.hash_grid(grid)
+        key = (grid_digest, tuple(sorted(set(tuple(p) for p in protected))))
+
+        entry = self._cache.get(key)
+        if entry is None:
+            entry = DeadEndFiller.fill(grid, key[1])
+            entry[0].setflags(write=False)
+            self._cache[key] = entry
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+
+        self.filled = entry[1]
+        return entry[0]
+
+    @staticmethod
+    def fill(grid, protected):
+        """ Uncached dead-end filling
+
+        Args:
+            grid (np.array): maze array
+            protected (iterable): cells that must stay open
+        Returns:
+            np.array, int: reduced copy of the grid, number of cells filled
+        """
+        H, W = grid.shape
+        W2 = W + 2
+
+        # pad with walls, so every open cell has four in-bounds neighbours
+        is_open = np.zeros((H + 2, W2), dtype=bool)
+        is_open[1:-1, 1:-1] = grid == 0
+        keep = np.zeros((H + 2, W2), dtype=bool)
+        for r, c in protected:
+            keep[r + 1, c + 1] = True
+
+        counts = np.zeros((H + 2, W2), dtype=np.int8)
+        counts[1:-1, 1:-1] = (is_open[:-2, 1:-1].astype(np.int8) + is_open[2:, 1:-1] +
+                              is_open[1:-1, :-2] + is_open[1:-1, 2:])
+
+        is_open = is_open.ravel()
+        keep = keep.ravel()
+        offsets = np.array([-W2, W2, -1, 1])
+        dead = np.flatnonzero(is_open & (counts.ravel() <= 1) & ~keep)
+
+        filled = 0
+        while len(dead):
+            is_open[dead] = False
+            filled += len(dead)
+
+            # only the open neighbours of freshly filled cells can have become dead ends
+            around = np.unique((dead[:, None] + offsets).ravel())
+            around = around[is_open[around] & ~keep[around]]
+            n = is_open[around - W2].astype(np.int8) + is_open[around + W2] + \
+                is_open[around - 1] + is_open[around + 1]
+            dead = around[n <= 1]
+
+        reduced = grid.copy()
+        reduced[(grid == 0) & ~is_open.reshape(H + 2, W2)[1:-1, 1:-1]] = 1
+        return reduced, filled
@@ -0,0 +1,168 @@
+from .MazeSolver import MazeSolver
+from .Path import Path
+
+
+class DijkstraAlgo(MazeSolver):
+    """ Search the node with the lowest total traversal cost first, over a grid of
+    small integer floor weights (cost of entering each cell).
+
+    Uses Dial's algorithm: a circular array of buckets, one per possible cost value,
+    instead of a binary heap. Every push and pop is O(1), so weighted solves run at
+    near-BFS speed. Without a cost grid every cell costs 1 and this is plain BFS.
+
+    Solutions is a list: this solver's route, then up to k - 1 loopless alternatives (MazeSolver.k).
+
+    Optional Parameters
+
+    heuristic: bool
+        Weighted A*: order the buckets by cost + manhattan (chebyshev, when 8-connected)
+        distance scaled by the cheapest floor weight, which stays admissible and
+        consistent. (default False)
+    """
+
+    def __init__(self, heuristic=False, **kwargs):
+        super(DijkstraAlgo, self).__init__(**kwargs)
+        self.heuristic = heuristic
+        # total traversal cost of the last solution
+        self.distance = 0
+        self._dist = None
+
+    def cache_options(self):
+        """ Solver settings that change the solutions, folded into SolutionCache keys
+
+        Returns:
+            tuple: hashable, repr-stable solver settings
+        """
+        return super(DijkstraAlgo, self).cache_options() + (self.heuristic,)
+
+    def _solve(self):
+        """ lowest-cost-first search solutions to the maze
+
+        Returns:
+            list: valid maze solutions
+        """
+        H, W = self.grid.shape
+        flat = self.grid.ravel().tolist()
+        if self.costs is None:
+            weights = [1] * len(flat)
+            min_w = max_w = 1
+        else:
+            weights = self.costs.ravel().tolist()
+            open_weights = self.costs[self.grid == 0]
+            min_w = int(open_weights.min()) if len(open_weights) else 1
+            max_w = int(open_weights.max()) if len(open_weights) else 1
+            assert min_w >= 1, 'Floor costs must be positive integers.'
+        self._reserve_buffers()
+        if self._dist is None or len(self._dist) != len(flat):
+            self._dist = [0] * len(flat)
+
+        # nearest-first visits ends in order of true cost, which a single-goal heuristic can't do
+        nearest_first = self.multi_target and not self.heuristic
+        remaining = [r * W + c for r, c in self.end]
+
+        sol = Path(width=W)
+        self.distance = 0
+        tmp = self.start[0] * W + self.start[1]
+        while remaining:
+            goals = set(remaining) if nearest_first else {remaining[0]}
+            cost, dist, tmpSol = yield from self._dial(tmp, goals, flat, weights, min_w, max_w)
+            assert tmpSol is not None, 'Remaining ends are unreachable.'
+            self.cost += cost
+            self.distance += dist
+            # store the end reached, use it as start for the next route
+            tmp = tmpSol.pop()
+            remaining.remove(tmp)
+            sol.extend_flat(tmpSol)
+
+        sol.extend_flat([tmp])
+        return [sol]
+
+    def _dial(self, start, goals, flat, weights, min_w, max_w):
+        """ Dial's bucket-queue search from start until any of the goals is settled
+
+        Args:
+            start (int): flat index to search from
+            goals (set): flat indices of the ends that may finish this leg
+            flat (list): flattened maze grid
+            weights (list): flattened cost of entering each cell
+            min_w (int): cheapest floor weight of an open cell
+            max_w (int): dearest floor weight of an open cell
+        Returns:
+            int, int, list: the number of settled cells, cost of the path, flat-index path to the goal reached
+        """
+        H, W = self.grid.shape
+        self._leg += 1
+        leg = self._leg
+        stamp = self._stamp
+        parent = self._parent
+        dist = self._dist
+
+        if self.heuristic and self.connectivity == 8:
+            gr, gc = divmod(next(iter(goals)), W)
+
+            def h(i):
+                r = i // W
+                return min_w * max(abs(r - gr), abs(i - r * W - gc))
+        elif self.heuristic:
+            gr, gc = divmod(next(iter(goals)), W)
+
+            def h(i):
+                r = i // W
+                return min_w * (abs(r - gr) + abs(i - r * W - gc))
+        else:
+            def h(i):
+                return 0
+
+        # a relaxation raises a key by at most max_w (+ min_w, as h may grow by one step),
+        # so queued keys always fit in one lap of this many circular buckets
+        B = max_w + (min_w if self.heuristic else 0) + 1
+        buckets = [[] for _ in range(B)]
+
+        counter = 0
+        stats = self.stats
+        stamp[start] = leg
+        parent[start] = -1
+        dist[start] = 0
+        cur = h(start)
+        buckets[cur % B].append(start)
+        queued = 1
+
+        while queued:
+            bucket = buckets[cur % B]
+            if not bucket:
+                cur += 1
+                continue
+            cell = bucket.pop()
+            queued -= 1
+            g = dist[cell]
+            # stale entry, this cell was reached more cheaply later on
+            if g + h(cell) != cur:
+                continue
+
+            counter += 1
+            if stats is not None:
+                stats.expand(queued)
+            if not counter % self._pause:
+                yield
+            if cell in goals:
+                path = []
+                while cell != -1:
+                    path.append(cell)
+                    cell = parent[cell]
+                path.reverse()
+                if stats is not None:
+                    stats.finish(counter - 1 + queued)
+                return counter, g, path
+
+            for n in MazeSolver._flat_neighbors(cell, H, W, flat, self.connectivity):
+                ng = g + weights[n]
+                if stamp[n] != leg or ng < dist[n]:
+                    stamp[n] = leg
+                    dist[n] = ng
+                    parent[n] = cell
+                    buckets[(ng + h(n)) % B].append(n)
+                    queued += 1
+
+        if stats is not None:
+            stats.finish(counter)
+        return counter, 0, None
@@ -0,0 +1,232 @@
+""" Expansion traces: the order in which a solver expanded cells, recorded into a
+preallocated ring buffer, saved as a compressed .npz and replayed as a heat map
+or an animation.
+
+    python -m roombasim.ExpansionTrace trace.npz heat.png
+    python -m roombasim.ExpansionTrace trace.npz replay.gif --frames 60
+"""
+import argparse
+import numpy as np
+
+
+class ExpansionTrace:
+    """
+    Ring buffer of (step, flat index) records, one per sampled expansion. Pass one
+    to a solver as MazeSolver(trace=...): the BFS, DFS, Greedy and A* searches
+    append every cell they expand to a plain list, and the solve moves that list
+    into the NumPy buffers at each pause and at its end, keeping every `every`-th
+    expansion. Step numbers count the expansions of the whole solve from 0, so a
+    multi-leg route is one continuous trace. Alternative-route searches are not
+    traced. Once full, the buffer keeps the latest `capacity` records.
+
+    Optional Parameters
+
+    capacity: int
+        Records kept. (default 1 << 20)
+    every: int
+        Keep one expansion in this many. (default 1, all of them)
+    chunk: int
+        Most expansions held in the pending list; a traced solve pauses at least
+        this often, so a step() never runs past it either. (default 1 << 16)
+    """
+
+    def __init__(self, capacity=1 << 20, every=1, chunk=1 << 16):
+        assert capacity >= 1 and every >= 1 and chunk >= 1, 'Trace sizes must be positive.'
+        self.capacity = capacity
+        self.every = every
+        self.chunk = chunk
+        self._cells = np.empty(capacity, dtype=np.int32)
+        self._steps = np.empty(capacity, dtype=np.int64)
+        # records written since the solve began, kept or overwritten
+        self.count = 0
+        # expansions seen since the solve began, sampled or not
+        self.expansions = 0
+        # shape of the traced grid, and its walls packed 8 cells a byte
+        self.shape = None
+        self.walls = None
+        # expansions since the last drain: flat indices or (row, column) tuples
+        self._pending = []
+
+    def start(self, grid):
+        """ Forget the last solve and get ready for one on this grid
+
+        Args:
+            grid (np.array): maze array of the solve
+        Returns:
+            function: appends one expanded cell, for the search loops
+        """
+        self.count = 0
+        self.expansions = 0
+        self.shape = grid.shape
+        self.walls = np.packbits(grid.ravel() != 0)
+        self._pending = []
+        return self._pending.append
+
+    def drain(self):
+        """ Move the pending expansions into the ring buffer, keeping the sampled ones
+
+        Returns: None
+        """
+        pending = self._pending
+        if not pending:
+            return
+        every = self.every
+        first = -self.expansions % every
+        kept = pending if every == 1 else pending[first::every]
+        base = self.expansions + first
+        self.expansions += len(pending)
+        if not kept:
+            pending.clear()
+            return
+
+        if isinstance(kept[0], tuple):
+            cells = np.array(kept, dtype=np.int32)
+            cells = cells[:, 0] * self.shape[1] + cells[:, 1]
+        else:
+            cells = np.fromiter(kept, dtype=np.int32, count=len(kept))
+        pending.clear()
+        n = len(cells)
+        if n > self.capacity:
+            base += every * (n - self.capacity)
+            cells = cells[n - self.capacity:]
+            n = self.capacity
+
+        # write in at most two slices, wrapping around the end of the buffer
+        at = self.count % self.capacity
+        head = min(n, self.capacity - at)
+        self._cells[at:at + head] = cells[:head]
+        self._cells[:n - head] = cells[head:]
+        steps = np.arange(base, base + every * n, every, dtype=np.int64)
+        self._steps[at:at + head] = steps[:head]
+        self._steps[:n - head] = steps[head:]
+        self.count += n
+
+    def records(self):
+        """ The kept records, oldest first
+
+        Returns:
+            np.array, np.array: step numbers, flat indices
+        """
+        n = min(self.count, self.capacity)
+        order = (self.count - n + np.arange(n)) % self.capacity
+        return self._steps[order], self._cells[order]
+
+    def grid(self):
+        """ The traced grid, unpacked
+
+        Returns:
+            np.array: maze array, 1 for walls
+        """
+        size = self.shape[0] * self.shape[1]
+        return np.unpackbits(self.walls, count=size).reshape(self.shape).astype(np.int8)
+
+    def save(self, file):
+        """ Write the records, the grid shape and its walls to a compressed .npz
+
+        Args:
+            file (str): path or writable binary file
+        Returns: None
+        """
+        steps, cells = self.records()
+        np.savez_compressed(file, steps=steps, cells=cells, shape=np.array(self.shape),
+                            walls=self.walls, every=self.every, expansions=self.expansions)
+
+    @staticmethod
+    def load(file):
+        """ Read a trace written by save
+
+        Args:
+            file (str): path or readable binary file
+        Returns:
+            ExpansionTrace: the trace, sized to its records
+        """
+        with np.load(file) as data:
+            trace = ExpansionTrace(max(1, len(data['cells'])), int(data['every']))
+            trace.count = len(data['cells'])
+            trace._cells[:trace.count] = data['cells']
+            trace._steps[:trace.count] = data['steps']
+            trace.shape = tuple(int(v) for v in data['shape'])
+            trace.walls = data['walls']
+            trace.expansions = int(data['expansions'])
+        return trace
+
+
+def heat_map(trace, value='order', upto=None):
+    """ Per-cell summary of a trace
+
+    Args:
+        trace (ExpansionTrace): recorded trace
+        value (str): 'order' for the step each cell was last expanded at, NaN if never;
+            'count' for how many times it was expanded (once per search leg at most)
+        upto (int): only use records before this step
+    Returns:
+        np.array: float array of the grid's shape
+    """
+    assert value in ('order', 'count'), 'Heat map value must be order or count.'
+    steps, cells = trace.records()
+    if upto is not None:
+        keep = steps < upto
+        steps, cells = steps[keep], cells[keep]
+    size = trace.shape[0] * trace.shape[1]
+    if value == 'count':
+        return np.bincount(cells, minlength=size).reshape(trace.shape).astype(float)
+    heat = np.full(size, np.nan)
+    # the last record of every cell: the first one in reverse step order
+    last, at = np.unique(cells[::-1], return_index=True)
+    heat[last] = steps[::-1][at]
+    return heat.reshape(trace.shape)
+
+
+def render(trace, out, frames=1, fps=20, value='order'):
+    """ Draw a trace over its maze: one heat map image, or an animation of the
+    expansions if more than one frame is asked for. Needs matplotlib, and Pillow
+    or ffmpeg for animations, depending on the file type.
+
+    Args:
+        trace (ExpansionTrace): recorded trace
+        out (str): image or animation file, the type taken from its extension
+        frames (int): 1 for a still heat map, more for an animation
+        fps (int): animation frames per second
+        value (str): see heat_map
+    Returns: None
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from matplotlib import animation
+
+    walls = np.ma.masked_equal(trace.grid(), 0)
+    fig, ax = plt.subplots()
+    ax.set_axis_off()
+    ax.imshow(walls, cmap='Greys', vmin=0, vmax=1, interpolation='nearest')
+    heat = ax.imshow(heat_map(trace, value), cmap='inferno', interpolation='nearest')
+    fig.colorbar(heat, ax=ax, label='expansion step' if value == 'order' else 'expansions')
+
+    if frames <= 1:
+        fig.savefig(out, dpi=150, bbox_inches='tight')
+        plt.close(fig)
+        return
+
+    last = max(1, trace.expansions)
+
+    def draw(frame):
+        heat.set_data(heat_map(trace, value, upto=last * (frame + 1) // frames))
+        return heat,
+
+    animation.FuncAnimation(fig, draw, frames=frames, blit=True).save(out, fps=fps)
+    plt.close(fig)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay a saved expansion trace')
+    parser.add_argument('trace', help='.npz written by ExpansionTrace.save')
+    parser.add_argument('out', help='image (.png) or animation (.gif, .mp4) to write')
+    parser.add_argument('--frames', type=int, default=1, help='animation frames, 1 for a still heat map')
+    parser.add_argument('--fps', type=int, default=20)
+    parser.add_argument('--value', choices=('order', 'count'), default='order')
+    args = parser.parse_args(argv)
+    render(ExpansionTrace.load(args.trace), args.out, args.frames, args.fps, args.value)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+from collections import deque
+import numpy as np
+from .MazeSolver import MazeSolver
+
+UNKNOWN = -1
+
+
+class FrontierExplorer:
+    """
+    Exploration of an unknown floor: the robot starts knowing nothing of `grid` and
+    reveals it through a limited-range sensor, repeatedly driving to the nearest
+    frontier (a known free cell next to an unknown one) until nothing is left to see.
+
+    Map and frontier updates only touch the cells each sensor sweep newly reveals,
+    and the search for the nearest frontier stops as soon as it meets one, so a step
+    never rescans the whole grid.
+
+    Optional Parameters
+
+    sensor_range: int
+        The sensor sees every cell within this many moves through free space, and the
+        walls bordering them. (default 3)
+    connectivity: int
+        4 or 8, see Maze.connectivity. (default 4)
+    """
+
+    def __init__(self, grid, start, sensor_range=3, connectivity=4):
+        assert not grid[start[0], start[1]], 'The robot must start on a free cell.'
+        assert connectivity in (4, 8), 'Connectivity must be 4 or 8.'
+        self.H, self.W = grid.shape
+        self._truth = grid.ravel().tolist()
+        self.sensor_range = sensor_range
+        self.connectivity = connectivity
+        # what the robot knows: UNKNOWN, 0 for free, 1 for wall
+        self.known = [UNKNOWN] * len(self._truth)
+        self.frontier = set()
+        self.position = start[0] * self.W + start[1]
+        # cells the robot has been in, in order
+        self.trajectory = [self.position]
+        # number of cells revealed so far, and cells searched while planning
+        self.revealed = 0
+        self.cost = 0
+        self._free = sum(1 for v in self._truth if not v)
+        self._free_seen = 0
+        self._target = None
+        # moves still to make towards the target, last move first
+        self._plan = []
+        self._sense()
+
+    def known_grid(self):
+        """ The map as currently known
+
+        Returns:
+            np.array: UNKNOWN, 0 for free or 1 for wall, per cell
+        """
+        return np.array(self.known, dtype=np.int8).reshape(self.H, self.W)
+
+    def explored(self):
+        """ Fraction of the free cells of the true grid the robot has revealed
+
+        Returns:
+            float: explored ratio
+        """
+        return self._free_seen / self._free if self._free else 1.0
+
+    def step(self):
+        """ Move one cell towards the nearest frontier, then sense
+
+        Returns:
+            bool: False once no reachable frontier is left
+        """
+        # replan when the frontier we were heading for has been seen past
+        if not self._plan or self._target not in self.frontier:
+            self._plan = self._nearest_frontier()
+            if self._plan is None:
+                self._plan = []
+                return False
+            self._target = self._plan[-1]
+            self._plan.reverse()
+
+        if self.position == self._target:
+            # standing on a frontier the sensor cannot resolve, e.g. the grid edge
+            self.frontier.discard(self.position)
+            self._plan = []
+            return bool(self.frontier)
+
+        self.position = self._plan.pop()
+        self.trajectory.append(self.position)
+        self._sense()
+        return True
+
+    def run(self, max_steps=None):
+        """ Explore until the map is complete, or the step limit is reached
+
+        Args:
+            max_steps (int): optional limit on the number of moves
+        Returns:
+            list: trajectory of the robot, as cells
+        """
+        steps = 0
+        while (max_steps is None or steps < max_steps) and self.step():
+            steps += 1
+        return [divmod(c, self.W) for c in self.trajectory]
+
+    def _neighbors4(self, cell):
+        """ In-bounds orthogonal neighbours, free or not
+
+        Args:
+            cell (int): flat index
+        Returns:
+            list: flat indices
+        """
+        W = self.W
+        r = cell // W
+        c = cell - r * W
+        ns = []
+        if r > 0:
+            ns.append(cell - W)
+        if r < self.H - 1:
+            ns.append(cell + W)
+        if c > 0:
+            ns.append(cell - 1)
+        if c < W - 1:
+            ns.append(cell + 1)
+        return ns
+
+    def _sense(self):
+        """ Reveal everything within sensor range of the robot, and update the frontier
+        around just the newly revealed cells
+
+        Returns: None
+        """
+        known, truth = self.known, self._truth
+        new = []
+
+        depth = {self.position: 0}
+        q = deque([self.position])
+        while q:
+            cell = q.popleft()
+            if known[cell] == UNKNOWN:
+                known[cell] = truth[cell]
+                new.append(cell)
+            for n in self._neighbors4(cell):
+                if known[n] == UNKNOWN:
+                    known[n] = truth[n]
+                    new.append(n)
+            if depth[cell] < self.sensor_range:
+                for n in MazeSolver._flat_neighbors(cell, self.H, self.W, truth, self.connectivity):
+                    if n not in depth:
+                        depth[n] = depth[cell] + 1
+                        q.append(n)
+
+        self.revealed += len(new)
+        self._free_seen += sum(1 for cell in new if not truth[cell])
+
+        # only these cells can have gained or lost frontier status
+        touched = set(new)
+        for cell in new:
+            touched.update(self._neighbors4(cell))
+        for cell in touched:
+            if known[cell] == 0 and any(known[n] == UNKNOWN for n in self._neighbors4(cell)):
+                self.frontier.add(cell)
+            else:
+                self.frontier.discard(cell)
+
+    def _nearest_frontier(self):
+        """ BFS over the known free cells, stopping at the first frontier cell met
+
+        Returns:
+            list: flat indices of the moves to the frontier, just the current cell if
+            standing on one, None if no frontier is reachable
+        """
+        start = self.position
+        if start in self.frontier:
+            return [start]
+
+        parent = {start: -1}
+        q = deque([start])
+        while q:
+            cell = q.popleft()
+            self.cost += 1
+            for n in MazeSolver._flat_neighbors(cell, self.H, self.W, self.known, self.connectivity):
+                if n in parent:
+                    continue
+                parent[n] = cell
+                if n in self.frontier:
+                    path = []
+                    while n != start:
+                        path.append(n)
+                        n = parent[n]
+                    path.reverse()
+                    return path
+                q.append(n)
+
+        return None
@@ -1,16 +1,13 @@
-# If the code is not Cython-compiled, we need to add some imports.
-from cython import compiled
 from collections import deque
 from heapq import heappop, heappush, heapify
-
-if not compiled:
-    from MazeSolver import MazeSolver
+from .MazeSolver import MazeSolver
+from .Path import Path
 
 
 class GreedyAlgo(MazeSolver):
     """ Search the shallowest nodes in the search tree first.
 
-    Caveat: Solutions is a list but currently have only one solution.
+    Solutions is a list: this solver's route, then up to k - 1 loopless alternatives (MazeSolver.k).
     """
 
     def _solve(self):
@@ -19,14 +16,17 @@ class GreedyAlgo(MazeSolver):
         Returns:
             list: valid maze solutions
         """
-        sol = []
+        if self.multi_target:
+            return (yield from self._solve_nearest_first(fifo=True))
+
+        sol = Path(width=self.grid.shape[1])
 
         tmp = self.start
         heap = GreedyAlgo.UpdateHeap(tmp, self.end)
 
         while len(heap) != 0:
             end = heappop(heap)[1]
-            cost, tmpSol = self._bfs_uninformed(tmp, end)
+            cost, tmpSol = yield from self._bfs_uninformed(tmp, end)
             # store current end, use it as start for the next route
             tmp = end
             # increment current cost to total cost
@@ -80,6 +80,8 @@ class GreedyAlgo(MazeSolver):
             int, list: the number of explored cells, valid maze solutions
         """
         counter = 0
+        log = self._log
+        stats = self.stats
 
         # maintain a queue of paths
         q = deque()
@@ -91,20 +93,25 @@ class GreedyAlgo(MazeSolver):
 
         while len(q) != 0:
             counter += 1
+            if stats is not None:
+                stats.expand(len(q))
+            if not counter % self._pause:
+                yield
             # get first path from queue
             path = q.popleft()
             # get last node from path
             cell = path[-1]
+            if log is not None:
+                log(cell)
             # path found
             if cell == end:
+                if stats is not None:
+                    stats.finish(len(visited))
                 return counter, path
             # enumerate all adjacent nodes, construct a
             # new path and push it into the queue
-            r, c = cell
-            self._validate_next((r - 1, c), visited, q, path)
-            self._validate_next((r + 1, c), visited, q, path)
-            self._validate_next((r, c - 1), visited, q, path)
-            self._validate_next((r, c + 1), visited, q, path)
+            for step in self._steps(cell):
+                self._validate_next(step, visited, q, path)
 
     def _validate_next(self, cell, visited, q, path):
         """ Verify if a given cell is valid in maze
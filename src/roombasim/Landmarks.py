@@ -0,0 +1,150 @@
+from collections import deque
+import numpy as np
+from .MazeSolver import MazeSolver
+
+# distance to a cell the landmark cannot reach
+UNREACHABLE = np.iinfo(np.uint32).max
+
+
+class Landmarks:
+    """
+    ALT (A*, Landmarks, Triangle inequality) preprocessing of a maze grid.
+
+    K landmarks are picked by farthest-point selection and the BFS distance from each
+    to every cell is stored as a compact uint32 field. For any landmark L, the triangle
+    inequality gives |d(L, goal) - d(L, cell)| <= d(cell, goal), a lower bound far
+    tighter than manhattan distance in twisty mazes. Build once per grid, then share
+    it across every A* query on that grid, or on copies of it with cells walled off.
+    Queries read the bounds per cell as the search reaches it, so one costs nothing
+    in proportion to the grid.
+
+    Optional Parameters
+
+    k: int
+        Number of landmarks to place. (default 8)
+    connectivity: int
+        4 or 8, must match the connectivity of the solves using these landmarks. (default 4)
+    """
+
+    def __init__(self, grid, k=8, connectivity=4):
+        assert k >= 1, 'At least one landmark is required.'
+        assert connectivity in (4, 8), 'Connectivity must be 4 or 8.'
+        self.connectivity = connectivity
+        self.shape = grid.shape
+        self._walls = grid != 0
+        self._flat = grid.ravel().tolist()
+        self.landmarks = []
+        self.fields = np.empty((0, grid.size), dtype=np.uint32)
+        self._select(k)
+        self._flat = None
+        # per-landmark views of the fields, indexed by flat cell without NumPy call overhead
+        self._rows = [memoryview(field) for field in self.fields]
+
+    def matches(self, grid):
+        """ Can these landmarks guide a search on the given grid? They can on the grid
+        they were built on, and on any copy of it with more walls, such as one reduced by
+        DeadEndFiller or by a clearance limit: walls only lengthen maze distances, so the
+        bounds stay admissible. The check is one vectorized pass over the grid.
+
+        Args:
+            grid (np.array): maze array
+        Returns:
+            bool: True if the grid has the same shape, and no open cell that was a wall
+        """
+        if grid.shape != self.shape:
+            return False
+        return not np.any(self._walls & (grid == 0))
+
+    def heuristic(self, goal):
+        """ Admissible heuristic towards a goal: the best of the landmark bounds and
+        manhattan (chebyshev, when 8-connected) distance, evaluated per cell
+
+        Args:
+            goal (tuple): cell to estimate distances to
+        Returns:
+            function: flat index -> lower bound on its maze distance to the goal
+        """
+        W = self.shape[1]
+        gr, gc = goal
+        g = gr * W + gc
+        rows = [(row, row[g]) for row in self._rows if row[g] != UNREACHABLE]
+        eight = self.connectivity == 8
+
+        def h(cell):
+            r, c = divmod(cell, W)
+            best = max(abs(r - gr), abs(c - gc)) if eight else abs(r - gr) + abs(c - gc)
+            for row, d in rows:
+                x = row[cell]
+                if x != UNREACHABLE and abs(x - d) > best:
+                    best = abs(x - d)
+            return best
+        return h
+
+    def lower_bound(self, cell, goal):
+        """ Admissible estimate of the maze distance between two cells
+
+        Args:
+            cell (tuple): a cell
+            goal (tuple): a cell
+        Returns:
+            int: lower bound on the maze distance
+        """
+        return self.heuristic(goal)(cell[0] * self.shape[1] + cell[1])
+
+    def _select(self, k):
+        """ Farthest-point selection: each new landmark is the cell furthest from all previous ones
+
+        Args:
+            k (int): number of landmarks to place
+        Returns: None
+        """
+        free = [i for i, v in enumerate(self._flat) if not v]
+        if not free:
+            return
+
+        # seed from the free cell farthest from an arbitrary one, a cheap periphery pick
+        seed = self._bfs(free[0])
+        reached = seed != UNREACHABLE
+        candidate = int(np.argmax(np.where(reached, seed, 0)))
+
+        fields = []
+        chosen = set()
+        closest = np.full(len(self._flat), UNREACHABLE, dtype=np.uint32)
+        for _ in range(k):
+            if candidate in chosen:
+                break
+            chosen.add(candidate)
+            field = self._bfs(candidate)
+            self.landmarks.append(divmod(candidate, self.shape[1]))
+            fields.append(field)
+            np.minimum(closest, field, out=closest)
+            # pick the reachable free cell with the largest distance to its closest landmark
+            candidate = int(np.argmax(np.where(closest != UNREACHABLE, closest, 0)))
+
+        self.fields = np.array(fields, dtype=np.uint32)
+
+    def _bfs(self, source):
+        """ Unit-cost distance field from one cell over the open cells of the grid
+
+        Args:
+            source (int): flat index to measure from
+        Returns:
+            np.array: uint32 distances, UNREACHABLE for cells not connected to the source
+        """
+        H, W = self.shape
+        flat = self._flat
+        dist = [-1] * len(flat)
+        dist[source] = 0
+        q = deque([source])
+
+        while q:
+            cell = q.popleft()
+            d = dist[cell] + 1
+            for n in MazeSolver._flat_neighbors(cell, H, W, flat, self.connectivity):
+                if dist[n] < 0:
+                    dist[n] = d
+                    q.append(n)
+
+        field = np.array(dist, dtype=np.int64)
+        field[field < 0] = UNREACHABLE
+        return field.astype(np.uint32)
@@ -0,0 +1,466 @@
+from random import randrange
+
+
+class Maze:
+    """
+    This is a master object meant to hold a rectangular, 2D maze.
+    This object includes the methods used to generate and solve the maze,
+    as well as the start and end points.
+    """
+
+    def __init__(self, seed=None):
+        self.generator = None
+        self.grid = None
+        self.start = None
+        self.end = []
+        # self.transmuters = []
+        # a MazeSolver, or 'auto' to let a SolverSelector pick one for every solve
+        self.solver = None
+        # SolverSelector used when solver is 'auto', a default one if None
+        self.selector = None
+        # solver instance the selector picked for the last solve
+        self.selected = None
+        self.solutions = None
+        self.prune = True
+        # optional SolutionCache consulted by solve()
+        self.cache = None
+        # optional DeadEndFiller, solvers then search its reduced grid
+        self.reducer = None
+        # optional small integer cost of entering each cell (floor type), unit cost if None
+        self.costs = None
+        # 4: orthogonal moves only, 8: diagonal moves too, without cutting corners
+        self.connectivity = 4
+        # robot footprint: solvers avoid cells closer than this to a wall, see clearance()
+        self.min_clearance = 0
+        # (grid digest, clearance) of the last clearance() computed
+        self._clearance = None
+        Maze.set_seed(seed)
+
+    @staticmethod
+    def set_seed(seed):
+        """ helper method to set the random seeds for all the random seed for all the random libraries we are using
+
+        Args:
+            seed (int): random seed number
+        Returns:
+            None
+        """
+        if seed is not None:
+            import random
+            random.seed(seed)
+            import numpy as np
+            np.random.seed(seed)
+
+    @staticmethod
+    def get_distance(cell1, cell2):
+        """ Returns manhattan distances between two given cells
+
+        Args:
+            cell1 (tuple): one of two cells
+            cell2 (tuple): the other cell
+        Returns:
+            int: manhattan distances between two cells
+        """
+        return abs(cell1[0] - cell2[0]) + abs(cell1[1] - cell2[1])
+
+    def generate(self):
+        """ public method to generate a new maze, and handle some clean-up
+
+        Returns:
+            None
+        """
+        assert not (self.generator is None), 'No maze-generation algorithm has been set.'
+
+        self.grid = self.generator.generate()
+        self.costs = None
+        self.start = None
+        self.end = []
+        self.solutions = None
+
+    def generate_floors(self, floors=(1, 2, 3), patch=4):
+        """ Lay random floor types (e.g. tile, carpet, rug) over the maze, as square
+        patches of uniform traversal cost.
+
+        Args:
+            floors (tuple): traversal cost of each floor type, positive integers
+            patch (int): side length of a patch of uniform floor, in cells
+        Returns:
+            None
+        """
+        import numpy as np
+        assert self.grid is not None, 'No maze grid yet exists to lay floors on.'
+        assert min(floors) >= 1, 'Floor costs must be positive integers.'
+
+        H, W = self.grid.shape
+        coarse = np.random.choice(np.asarray(floors, dtype=np.uint8), (-(-H // patch), -(-W // patch)))
+        self.costs = np.kron(coarse, np.ones((patch, patch), dtype=np.uint8))[:H, :W]
+
+    def generate_entrances(self, no_end=3, at_least_distance=2):
+        """ Generate maze entrances. Entrances can be on the walls, or inside the maze.
+
+        Args:
+            no_end (int): How many end of the maze?
+            at_least_distance (int): start and end doesn't allow within this distance
+        Returns:
+            None
+        """
+
+        H, W = self.grid.shape
+
+        # Generate a Start
+        if not self.start:
+            self.start = (randrange(1, H, at_least_distance), randrange(1, W, at_least_distance))
+
+        # cells already used
+        usedCells = set()
+        usedCells.add(self.start)
+        usedCells.update(self.GetNeighbours(self.start, at_least_distance))
+
+        for i in range(no_end):
+            timeout = 20
+            while True:
+                # Generate a end
+                end = (randrange(1, H, at_least_distance), randrange(1, W, at_least_distance))
+                # verify end
+                if end not in usedCells:
+                    # valid end, then add it and
+                    # its neighbours into usedCells
+                    usedCells.add(end)
+                    usedCells.update(self.GetNeighbours(end, at_least_distance))
+                    # add valid end to maze, break timeout loop
+                    self.end.append(end)
+                    break
+                # timed out
+                assert timeout > 0, "_generate_inner_entrances timeout"
+
+    def solve(self):
+        """ public method to solve a new maze, if possible
+
+        Returns:
+            None
+        """
+        for _ in self.iter_solve():
+            pass
+
+    def iter_solve(self, n_expansions=None):
+        """ Resumable version of solve(): a generator that pauses after every
+        n_expansions cells the solver expands, see MazeSolver.iter_solve.
+        The solutions are in self.solutions once it is exhausted.
+
+        Args:
+            n_expansions (int): expansions per pause, None to run to the end without pausing
+        Yields:
+            None: at every pause
+        Returns:
+            None
+        """
+        assert not (self.solver is None), 'No maze-solving algorithm has been set.'
+        assert not (self.start is None) and not (self.end is None), \
+            'Start and end times must be set first.'
+
+        grid = self.grid
+        # hashed on every solve, so editing the grid in place never serves a stale entry
+        base = None
+        if self.reducer is not None or self.cache is not None or self.min_clearance > 1:
+            base = self.grid_digest()
+        digest = None
+        if self.reducer is not None:
+            grid = self.reducer.reduce(grid, [self.start] + list(self.end), base)
+            digest = base + ':dead-ends-filled'
+
+        clearance = None
+        if self.min_clearance > 1:
+            clearance = self.clearance(base)
+            for cell in [self.start] + list(self.end):
+                assert clearance[cell[0], cell[1]] >= self.min_clearance, \
+                    'Entrance {} is too close to a wall for the robot footprint.'.format(cell)
+
+        args = (grid, self.start, self.end, self.costs, self.connectivity, clearance, self.min_clearance)
+        solver = self.solver
+        auto = isinstance(solver, str)
+        if auto:
+            assert solver == 'auto', "Maze.solver must be a MazeSolver or 'auto'."
+            if self.selector is None:
+                from .SolverSelector import SolverSelector
+                self.selector = SolverSelector()
+            name, solver, features, predicted = self.selector.pick(grid, self.end)
+            self.selected = solver
+
+        def search():
+            run = solver.iter_solve(*args, n_expansions=n_expansions)
+            if auto:
+                run = self.selector.timed(run, name, features, predicted)
+            return run
+
+        if self.cache is None:
+            self.solutions = yield from search()
+            return
+
+        digest = digest or base
+        if self.costs is not None:
+            from .SolutionCache import SolutionCache
+            digest += ':' + SolutionCache.hash_grid(self.costs)
+        if self.connectivity != 4:
+            digest += ':{}-connected'.format(self.connectivity)
+        if clearance is not None:
+            digest += ':clearance-{}'.format(self.min_clearance)
+        key = self.cache.make_key(digest, self.start, self.end, solver)
+        solutions = self.cache.get(key)
+        if solutions is None:
+            solutions = yield from search()
+            self.cache.put(key, solutions)
+
+        # hand out copies, so callers can't corrupt the cached entry
+        self.solutions = [s.copy() for s in solutions]
+
+    def clearance(self, digest=None):
+        """ Distance-to-wall transform of the grid, computed again only when the
+        grid's contents change
+
+        Args:
+            digest (str): grid_digest() of the current grid, if already known
+        Returns:
+            np.array: chebyshev distance of every cell to the nearest wall, 0 for walls
+        """
+        if self.grid is None:
+            return None
+        digest = digest or self.grid_digest()
+        if self._clearance is None or self._clearance[0] != digest:
+            self._clearance = (digest, Maze.chebyshev_clearance(self.grid))
+        return self._clearance[1]
+
+    @staticmethod
+    def chebyshev_clearance(grid):
+        """ Exact chebyshev distance transform, by the two raster passes of Rosenfeld and Pfaltz.
+
+        Each pass walks the rows in order, but handles a whole row at once: first the
+        three neighbours in the row before, then the neighbour in the same row, via
+        d[c] = min(d[c], d[c - 1] + 1) = c + running minimum of (d - c).
+        A free cell next to a wall has clearance 1; beyond the grid counts as wall.
+
+        Args:
+            grid (np.array): maze array
+        Returns:
+            np.array: uint32 clearance of every cell, 0 for walls
+        """
+        import numpy as np
+        H, W = grid.shape
+        big = H + W
+        # pad with walls, so the borders need no special cases
+        d = np.full((H + 2, W + 2), 0, dtype=np.int64)
+        d[1:-1, 1:-1] = np.where(grid == 0, big, 0)
+        cols = np.arange(W + 2)
+
+        for rows in (range(1, H + 1), range(H, 0, -1)):
+            step = 1 if rows.step > 0 else -1
+            for r in rows:
+                prev = d[r - step]
+                row = d[r]
+                np.minimum(row[1:-1], np.minimum(np.minimum(prev[:-2], prev[1:-1]), prev[2:]) + 1, out=row[1:-1])
+                if step > 0:
+                    row[:] = cols + np.minimum.accumulate(row - cols)
+                else:
+                    row[:] = (np.minimum.accumulate((row + cols)[::-1]) - cols[::-1])[::-1]
+
+        return d[1:-1, 1:-1].astype(np.uint32)
+
+    def grid_digest(self):
+        """ Content hash of the current grid. It is not memoized: the grid may be
+        edited in place, and hashing is cheap next to a solve.
+
+        Returns:
+            str: hex digest of the grid, or None if there is no grid
+        """
+        if self.grid is None:
+            return None
+        from .SolutionCache import SolutionCache
+        return SolutionCache.hash_grid(self.grid)
+
+    def tostring(self, entrances=False, solutions=False, index=0):
+        """ Display the maze entrances/solutions IF they already exist.
+        Return a string representation of the maze.
+
+        Args:
+            entrances (bool): Do you want to show the entrances of the maze?
+            solutions (bool): Do you want to show the solution to the maze?
+            index (int): which of the solutions to show, see MazeSolver.k
+        Returns:
+            str: string representation of the maze
+        """
+        if self.grid is None:
+            return ''
+
+        from .MazeRenderer import MazeRenderer
+        return MazeRenderer().text(self.render_codes(entrances, solutions, index))
+
+    def render_codes(self, entrances=False, solutions=False, index=0):
+        """ The maze painted into MazeRenderer cell codes, see tostring for the arguments
+
+        Returns:
+            np.array: uint8 code of every cell
+        """
+        from .MazeRenderer import MazeRenderer
+        path = self.solutions[index] if solutions and self.solutions else None
+        if entrances and self.start and self.end:
+            return MazeRenderer.codes(self.grid, path, self.start, self.end)
+        return MazeRenderer.codes(self.grid, path)
+
+    def write_text(self, out, entrances=True, solutions=True, index=0, renderer=None):
+        """ Stream the text drawing of the maze to a file, one line per row
+
+        Args:
+            out (file): text or binary file-like object
+            renderer (MazeRenderer): optional drawing settings
+            see tostring for the others
+        Returns:
+            None
+        """
+        assert self.grid is not None, 'Maze grid is not set.'
+        from .MazeRenderer import MazeRenderer
+        (renderer or MazeRenderer()).write_text(out, self.render_codes(entrances, solutions, index))
+
+    def write_png(self, out, entrances=True, solutions=True, index=0, renderer=None):
+        """ Save the maze as a PNG image
+
+        Args:
+            out (file): path, or binary file-like object
+            renderer (MazeRenderer): optional drawing settings, such as colours and scale
+            see tostring for the others
+        Returns:
+            None
+        """
+        assert self.grid is not None, 'Maze grid is not set.'
+        from .MazeRenderer import MazeRenderer
+        (renderer or MazeRenderer()).write_png(out, self.render_codes(entrances, solutions, index))
+
+    def __str__(self):
+        """ Display maze walls, entrances, and solutions, if available
+
+        Returns:
+            str: string representation of the maze
+        """
+        return self.tostring(True, True)
+
+    def __repr__(self):
+        """ Display maze walls, entrances, and solutions, if available
+
+        Returns:
+            str: string representation of the maze
+        """
+        return self.__str__()
+
+    def GetNeighbours(self, cell, distance=1):
+        """ Generate a list of valid steps in range
+        of distance around the given cell, along the diagonals too when 8-connected
+
+        Args:
+            cell (tuple): given cell
+            distance (int): distance of the given cell to the furthest cell
+        Returns:
+            list: valid nearby cells in range
+        """
+        r, c = cell
+        neighbours = []
+        for i in range(1, distance + 1):
+            nearby = (r + i, c)
+            if self.validate_step(nearby):
+                neighbours.append(nearby)
+            nearby = (r - i, c)
+            if self.validate_step(nearby):
+                neighbours.append(nearby)
+            nearby = (r, c + i)
+            if self.validate_step(nearby):
+                neighbours.append(nearby)
+            nearby = (r, c - i)
+            if self.validate_step(nearby):
+                neighbours.append(nearby)
+
+            if self.connectivity == 8:
+                for nearby in ((r - i, c - i), (r - i, c + i), (r + i, c - i), (r + i, c + i)):
+                    if self.validate_step(nearby):
+                        neighbours.append(nearby)
+
+        return neighbours
+
+    def validate_cell(self, cell):
+        """ Validate a given cell is inside maze
+        Args:
+            cell (tuple): cell
+        Returns:
+             bool: returns true if cell is inside maze
+        """
+        return 0 < cell[0] < self.grid.shape[0] and 0 < cell[1] < self.grid.shape[1]
+
+    def validate_step(self, cell):
+        """ Validate a given cell is walkable
+        Args:
+            cell (tuple):
+        Returns:
+             bool: returns true if cell is not obstacle inside maze
+        """
+        return self.validate_cell(cell) and not self.grid[cell[0]][cell[1]]
+
+    # def transmute(self):
+    #     """ Transmute an existing maze grid
+    #
+    #     Returns:
+    #       None
+    #     """
+    #     assert not (self.grid is None), 'No maze grid yet exists to transmute.'
+    #
+    #     for transmuter in self.transmuters:
+    #         transmuter.transmute(self.grid, self.start, self.end)
+
+    # def generate_monte_carlo(self, repeat, entrances=3, difficulty=1.0, reducer=len):
+    #     """ Use the Monte Carlo method to generate a maze of defined difficulty.
+    #
+    #     This method assumes the generator and solver algorithms are already set.
+    #
+    #     1. Generate a maze.
+    #     2. For each maze, generate a series of entrances.
+    #     3. To eliminate boring entrance choices, select only the entrances
+    #         that yield the longest solution to a given maze.
+    #     4. Repeat steps 1 through 3 for several mazes.
+    #     5. Order the mazes based on a reduction function applied to their maximal
+    #         solutions. By default, this reducer will return the solution length.
+    #     6. Based on the 'difficulty' parameter, select one of the mazes.
+    #
+    #     Args:
+    #         repeat (int): How many mazes do you want to generate?
+    #         entrances (int): How many different entrance combinations do you want to try?
+    #         difficulty (float): How difficult do you want the final maze to be (zero to one).
+    #         reducer (function): How do you want to determine solution difficulty (default is length).
+    #     Returns:
+    #       None
+    #     """
+    #     assert (difficulty >= 0.0 and difficulty <= 1.0), 'Maze difficulty must be between 0 to 1.'
+    #
+    #     # generate different mazes
+    #     mazes = []
+    #     for _ in range(repeat):
+    #         self.generate()
+    #         this_maze = []
+    #
+    #         # for each maze, generate different entrances, and solve
+    #         for _ in range(entrances):
+    #             self.generate_entrances()
+    #             self.solve()
+    #             this_maze.append({'grid': self.grid,
+    #                               'start': self.start,
+    #                               'end': self.end,
+    #                               'solutions': self.solutions})
+    #
+    #         # for each maze, find the longest solution
+    #         mazes.append(max(this_maze, key=lambda k: len(k['solutions'])))
+    #
+    #     # sort the mazes by the length of their solution
+    #     mazes = sorted(mazes, key=lambda k: reducer(k['solutions'][0]))
+    #
+    #     # based on optional parameter, choose the maze of the correct difficulty
+    #     pos = int((len(mazes) - 1) * difficulty)
+    #
+    #     # save final results of Monte Carlo Simulations to this object
+    #     self.grid = mazes[pos]['grid']
+    #     self.start = mazes[pos]['start']
+    #     self.end = mazes[pos]['end']
+    #     self.solutions = mazes[pos]['solutions']
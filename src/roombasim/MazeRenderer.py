@@ -0,0 +1,170 @@
+import io
+import struct
+import zlib
+from itertools import chain
+import numpy as np
+from .Path import Path
+
+# cell codes of a rendered maze, indices into the characters and colours
+OPEN, WALL, PATH, START, END = range(5)
+
+
+class MazeRenderer:
+    """
+    Vectorized drawing of a maze: the grid, one solution path and the entrances
+    are painted into a uint8 array of cell codes with a handful of NumPy
+    operations, and the codes are looked up in a character or colour table.
+    Text and PNG output are written a block of rows at a time, so the full
+    character or pixel image of a huge maze never has to exist at once.
+
+    Optional Parameters
+
+    chars: str
+        Character of every cell code: open, wall, path, start, end. (default ' #+SE')
+    colors: tuple
+        RGB colour of every cell code, for PNG output.
+    scale: int
+        PNG pixels per cell side. (default 1)
+    block: int
+        Grid rows converted and written per block. (default 1024)
+    level: int
+        zlib compression level of PNG output, 1 (fast) to 9 (small). (default 1)
+    """
+
+    def __init__(self, chars=' #+SE', colors=((255, 255, 255), (0, 0, 0), (220, 50, 50), (40, 170, 70), (40, 90, 220)),
+                 scale=1, block=1024, level=1):
+        assert len(chars) == 5 and len(colors) == 5, 'One character and one colour per cell code.'
+        assert scale >= 1 and block >= 1, 'Scale and block must be positive.'
+        self.chars = np.frombuffer(chars.encode('ascii'), dtype=np.uint8)
+        self.colors = np.array(colors, dtype=np.uint8)
+        self.scale = scale
+        self.block = block
+        self.level = level
+
+    @staticmethod
+    def codes(grid, path=None, start=None, ends=()):
+        """ Paint a maze into cell codes; entrances are drawn over the path
+
+        Args:
+            grid (np.array): maze array, non-zero for walls
+            path (list): optional solution, as (row, column) cells or flat indices
+            start (tuple): optional start cell
+            ends (list): end cells
+        Returns:
+            np.array: uint8 code of every cell
+        """
+        codes = (np.asarray(grid) != 0).view(np.uint8)
+        if path is not None and len(path):
+            codes.ravel()[MazeRenderer.flat_indices(path, grid.shape[1])] = PATH
+        if start is not None:
+            codes[start[0], start[1]] = START
+        if len(ends):
+            ends = np.asarray(ends).reshape(-1, 2)
+            codes[ends[:, 0], ends[:, 1]] = END
+        return codes
+
+    @staticmethod
+    def flat_indices(path, W):
+        """ A path as flat indices
+
+        Args:
+            path (list): (row, column) cells, a Path, or flat indices already
+            W (int): grid width
+        Returns:
+            np.array: flat index of every cell of the path
+        """
+        if isinstance(path, Path):
+            return path.flat if path.width == W else path.coords()[:, 0] * W + path.coords()[:, 1]
+        if isinstance(path, np.ndarray) and path.ndim == 1:
+            return path
+        n = len(path)
+        if not isinstance(path, np.ndarray) and isinstance(path[0], tuple):
+            # much faster than np.asarray on a list of tuples
+            path = np.fromiter(chain.from_iterable(path), dtype=np.int64, count=2 * n)
+        cells = np.asarray(path).reshape(n, -1)
+        if cells.shape[1] == 2:
+            return cells[:, 0] * W + cells[:, 1]
+        return cells.ravel()
+
+    def text(self, codes):
+        """ The codes as one string, rows joined by newlines
+
+        Args:
+            codes (np.array): see codes()
+        Returns:
+            str: text drawing of the maze
+        """
+        out = io.BytesIO()
+        self.write_text(out, codes)
+        return out.getvalue()[:-1].decode('ascii')
+
+    def write_text(self, out, codes):
+        """ Stream the codes as text, one line per row
+
+        Args:
+            out (file): text or binary file-like object
+            codes (np.array): see codes()
+        Returns: None
+        """
+        binary = not isinstance(out, io.TextIOBase)
+        H, W = codes.shape
+        lines = np.empty((min(H, self.block), W + 1), dtype=np.uint8)
+        lines[:, -1] = ord('\n')
+        for r in range(0, H, self.block):
+            rows = codes[r:r + self.block]
+            chunk = lines[:len(rows)]
+            np.take(self.chars, rows, out=chunk[:, :-1])
+            data = chunk.tobytes()
+            out.write(data if binary else data.decode('ascii'))
+
+    def rgb(self, codes):
+        """ The codes as an image, self.scale pixels per cell side
+
+        Args:
+            codes (np.array): see codes()
+        Returns:
+            np.array: uint8 array of shape (rows, columns, 3)
+        """
+        image = self.colors[codes]
+        if self.scale > 1:
+            image = image.repeat(self.scale, axis=0).repeat(self.scale, axis=1)
+        return image
+
+    def write_png(self, out, codes):
+        """ Write the codes as an indexed-colour PNG, compressing a block of rows
+        at a time into its own IDAT chunk
+
+        Args:
+            out (file): path, or binary file-like object
+            codes (np.array): see codes()
+        Returns: None
+        """
+        if isinstance(out, str):
+            with open(out, 'wb') as f:
+                return self.write_png(f, codes)
+
+        def chunk(kind, data):
+            out.write(struct.pack('>I', len(data)) + kind + data)
+            out.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(kind))))
+
+        H, W = codes.shape
+        s = self.scale
+        out.write(b'\x89PNG\r\n\x1a\n')
+        # 8-bit palette indices, no interlacing
+        chunk(b'IHDR', struct.pack('>IIBBBBB', W * s, H * s, 8, 3, 0, 0, 0))
+        chunk(b'PLTE', self.colors.tobytes())
+
+        z = zlib.compressobj(self.level)
+        # every scanline starts with filter type 0
+        lines = np.zeros((min(H, self.block) * s, W * s + 1), dtype=np.uint8)
+        for r in range(0, H, self.block):
+            rows = codes[r:r + self.block]
+            if s > 1:
+                rows = rows.repeat(s, axis=0).repeat(s, axis=1)
+            scan = lines[:len(rows)]
+            scan[:, 1:] = rows
+            data = z.compress(scan.tobytes())
+            if data:
+                chunk(b'IDAT', data)
+        chunk(b'IDAT', z.flush())
+        chunk(b'IEND', b'')
@@ -0,0 +1,798 @@
+import abc
+import tracemalloc
+from collections import deque
+from heapq import heappop, heappush
+from time import perf_counter
+from .Path import Path
+from .SolveStats import SolveStats
+
+# (row, column) offsets of the moves added by 8-connectivity
+DIAGONALS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+# pause interval of a solve that runs to the end in one call
+NEVER = 1 << 62
+
+
+class MazeSolver:
+    __metaclass__ = abc.ABCMeta
+
+    def __init__(self, multi_target=False, k=1, stats=False, trace_memory=False, trace=None):
+        # cost of the algorithm, summed over every solve
+        self.cost = 0
+        # SolveStats of the last solve when collecting them, None otherwise
+        self.stats = None
+        self._collect = stats
+        # also record the tracemalloc peak of each solve, in SolveStats.memory_peak
+        self.trace_memory = trace_memory
+        # optional ExpansionTrace recording the cells each solve expands
+        self.trace = trace
+        # appends an expanded cell to the trace while tracing, None otherwise
+        self._log = None
+        # visit the ends in the order they are actually reached, not the given order
+        self.multi_target = multi_target
+        # number of routes to return: the solver's own, then up to k - 1 alternatives
+        self.k = k
+        # visited-state buffers, reused across legs and solves of the same shape
+        self._stamp = None
+        self._parent = None
+        self._leg = 0
+        # final solutions of the last solve, None while one is in progress
+        self.solutions = None
+        # solve started by begin(), advanced by step()
+        self._pending = None
+        # every search leg pauses after each this many expansions
+        self._pause = NEVER
+
+    def solve(self, grid, start, end, costs=None, connectivity=4, clearance=None, min_clearance=0):
+        """ helper method to solve a init the solver before solving the maze
+
+        Args:
+            grid (np.array): maze array
+            start (tuple): position in maze to start from
+            end (list): position in maze to finish at
+            costs (np.array): optional cost of entering each cell, unit cost if not given
+            connectivity (int): 4 for orthogonal moves only, 8 to allow diagonal moves too
+            clearance (np.array): optional distance of every cell to the nearest wall, see Maze.clearance
+            min_clearance (int): cells with less clearance than this are treated as walls
+        Returns:
+            list: final solutions
+        """
+        for _ in self.iter_solve(grid, start, end, costs, connectivity, clearance, min_clearance):
+            pass
+        return self.solutions
+
+    def iter_solve(self, grid, start, end, costs=None, connectivity=4, clearance=None, min_clearance=0,
+                   n_expansions=None):
+        """ Resumable solve: a generator that pauses after every n_expansions cells
+        each search leg expands, so a scheduler can interleave many solves with its
+        own work. The solutions are its return value, and are kept in self.solutions.
+
+        Args:
+            grid (np.array): maze array
+            start (tuple): position in maze to start from
+            end (list): position in maze to finish at
+            costs (np.array): optional cost of entering each cell, unit cost if not given
+            connectivity (int): 4 for orthogonal moves only, 8 to allow diagonal moves too
+            clearance (np.array): optional distance of every cell to the nearest wall, see Maze.clearance
+            min_clearance (int): cells with less clearance than this are treated as walls
+            n_expansions (int): expansions per pause, None to run to the end without pausing
+        Yields:
+            None: at every pause
+        Returns:
+            list: final solutions
+        """
+        assert n_expansions is None or n_expansions >= 1, 'A step must expand at least one cell.'
+        self.begin(grid, start, end, costs, connectivity, clearance, min_clearance)
+        self._set_pause(n_expansions or NEVER)
+        run, self._pending = self._pending, None
+        yield from run
+        return self.solutions
+
+    def begin(self, grid, start, end, costs=None, connectivity=4, clearance=None, min_clearance=0):
+        """ Start a solve to be advanced by step(), see iter_solve for the arguments
+
+        Returns: None
+        """
+        if not self._collect:
+            self._solve_preprocessor(grid, start, end, costs, connectivity, clearance, min_clearance)
+        else:
+            self.stats = SolveStats()
+            t = perf_counter()
+            self._solve_preprocessor(grid, start, end, costs, connectivity, clearance, min_clearance)
+            self.stats.preprocess_time = perf_counter() - t
+        self._log = None if self.trace is None else self.trace.start(self.grid)
+        self.solutions = None
+        self._pending = self._run()
+
+    def step(self, n_expansions=1):
+        """ Advance the solve started by begin() to its next pause. Search legs pause
+        after every n_expansions cells they expand, so a step expands at most that
+        many cells, or fewer than twice that when it runs across the end of a leg.
+
+        Args:
+            n_expansions (int): expansion budget of this step
+        Returns:
+            bool: True once the solve is finished, the solutions are then in self.solutions
+        """
+        assert self._pending is not None or self.solutions is not None, 'No solve has been begun.'
+        if self._pending is not None:
+            self._set_pause(n_expansions)
+            next(self._pending, None)
+            if self.solutions is not None:
+                self._pending = None
+                self._set_pause(NEVER)
+        return self.solutions is not None
+
+    def _set_pause(self, n_expansions):
+        """ Pause the solve for its caller after every n_expansions expansions
+
+        Args:
+            n_expansions (int): expansions per pause, NEVER to run to the end
+        Returns: None
+        """
+        if self.trace is not None:
+            # the trace's pending list is drained at every pause, so it stays bounded
+            n_expansions = min(n_expansions, self.trace.chunk)
+        self._pause = n_expansions
+
+    def _run(self):
+        """ The whole search, as a generator that yields at every pause
+
+        Returns:
+            list: final solutions, also kept in self.solutions
+        """
+        run = self._searches()
+        if self._collect:
+            run = self._observe(run)
+        if self.trace is None:
+            solutions = yield from run
+        else:
+            solutions = yield from self._traced(run)
+        self.solutions = solutions
+        return solutions
+
+    def _searches(self):
+        """ The solver's search, then the alternative routes
+
+        Returns:
+            list: final solutions
+        """
+        solutions = yield from self._solve()
+        if self.k > 1:
+            solutions = yield from self._add_alternatives(solutions)
+        return solutions
+
+    def _traced(self, run):
+        """ Pass a run's pauses on, moving the expansions logged since the last
+        one into the trace's ring buffer
+
+        Args:
+            run (generator): the search, see _run
+        Returns:
+            list: final solutions
+        """
+        try:
+            while True:
+                try:
+                    next(run)
+                except StopIteration as done:
+                    return done.value
+                self.trace.drain()
+                yield
+        finally:
+            self.trace.drain()
+            self._log = None
+
+    def _observe(self, run):
+        """ Time a run, and trace its memory if asked for; the searches count their
+        own expansions and reached cells into self.stats as they go
+
+        Args:
+            run (generator): the search, see _run
+        Returns:
+            list: final solutions
+        """
+        stats = self.stats
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        t = perf_counter()
+        stats.start()
+        try:
+            solutions = yield from run
+        finally:
+            if tracing:
+                stats.memory_peak = tracemalloc.get_traced_memory()[1] / 1024
+                tracemalloc.stop()
+
+        stats.search_time = perf_counter() - t
+        return solutions
+
+    def _solve_preprocessor(self, grid, start, end, costs=None, connectivity=4, clearance=None, min_clearance=0):
+        """ ensure the maze mazes any sense before you solve it
+        work as __init__
+
+        Args:
+            grid (np.array): maze array
+            start (tuple): position in maze to start from
+            end (list): position in maze to finish at
+            costs (np.array): optional cost of entering each cell
+            connectivity (int): 4 for orthogonal moves only, 8 to allow diagonal moves too
+            clearance (np.array): optional distance of every cell to the nearest wall
+            min_clearance (int): cells with less clearance than this are treated as walls
+        Returns: None
+        """
+        self.grid = grid.copy()
+        if clearance is not None and min_clearance > 1:
+            # the footprint check is folded into the grid once, so expansions stay a single lookup
+            self.grid[clearance < min_clearance] = 1
+        self.start = start
+        self.end = end
+        self.costs = costs
+        self.connectivity = connectivity
+
+        # validating checks
+        assert grid is not None, 'Maze grid is not set.'
+        assert start is not None and end is not None, 'Entrances are not set.'
+        assert 0 <= start[0] < grid.shape[0], 'Entrance is outside the grid.'
+        assert 0 <= start[1] < grid.shape[1], 'Entrance is outside the grid.'
+        for e in end:
+            assert 0 <= e[0] < grid.shape[0], 'Entrance is outside the grid.'
+            assert 0 <= e[1] < grid.shape[1], 'Entrance is outside the grid.'
+        assert costs is None or costs.shape == grid.shape, 'Floor costs do not match the grid.'
+        assert connectivity in (4, 8), 'Connectivity must be 4 or 8.'
+        assert clearance is None or clearance.shape == grid.shape, 'Clearance map does not match the grid.'
+        assert self.k >= 1, 'At least one route must be asked for.'
+        assert self.k == 1 or costs is None, 'Alternative routes assume unit-cost floors.'
+
+    @abc.abstractmethod
+    def _solve(self):
+        """ The search itself, a generator: yield after every self._pause expansions, return the solutions """
+        return None
+
+    def cache_options(self):
+        """ Solver settings that change the solutions, folded into SolutionCache keys
+
+        Returns:
+            tuple: hashable, repr-stable solver settings
+        """
+        return self.multi_target, self.k
+
+    """
+    All of the methods below this are helper methods,
+    common to many maze-solving algorithms.
+    """
+
+    @staticmethod
+    def _midpoint(c1, c2):
+        """ Find the wall cell between to passage cells
+
+        Args:
+            c1 (tuple): first cell
+            c2 (tuple): second cell
+        Returns:
+            tuple: cell half way between the first two
+        """
+        return c1[0] + (c2[0] - c1[0]) // 2, c1[1] + (c2[1] - c1[1]) // 2
+
+    @staticmethod
+    def _move(start, direction):
+        """ Convolve a position tuple with a direction tuple to generate a new position.
+
+        Args:
+            start (tuple): position cell to start at
+            direction (tuple): vector cell of direction to travel to
+        Returns:
+            tuple: end result of movement
+        """
+        return tuple(map(sum, zip(start, direction)))
+
+    @staticmethod
+    def _within_one(cell, desire):
+        """ Is the current cell within one move of the desired cell?
+        Note, this might be one full move, or one half move. Diagonal move isn't considered.
+
+        Args:
+            cell (tuple): position to start at
+            desire (tuple): position you want to be at
+        Returns:
+            bool: Are you within one movement of your desired cell (maybe goal)?
+        """
+        if not cell or not desire:
+            return False
+
+        if cell[0] == desire[0]:
+            if abs(cell[1] - desire[1]) < 2:
+                return True
+        elif cell[1] == desire[1]:
+            if abs(cell[0] - desire[0]) < 2:
+                return True
+
+        return False
+
+    def _find_unblocked_neighbors(self, pos):
+        """ Find all the grid neighbors of the current position; visited, or not.
+
+        Args:
+            pos (tuple): cell of interest
+        Returns:
+            list: all the unblocked neighbors to this cell
+        """
+        from numpy.random import shuffle
+        r, c = pos
+        ns = []
+
+        if r > 1 and not self.grid[r - 1, c] and not self.grid[r - 2, c]:
+            ns.append((r - 2, c))
+        if r < self.grid.shape[0] - 2 and not self.grid[r + 1, c] and not self.grid[r + 2, c]:
+            ns.append((r + 2, c))
+        if c > 1 and not self.grid[r, c - 1] and not self.grid[r, c - 2]:
+            ns.append((r, c - 2))
+        if c < self.grid.shape[1] - 2 and not self.grid[r, c + 1] and not self.grid[r, c + 2]:
+            ns.append((r, c + 2))
+
+        shuffle(ns)
+        return ns
+
+    def _on_edge(self, cell):
+        """ Does the cell lay on the edge, rather inside of the maze grid?
+
+        Args:
+            cell (tuple): some place in the grid
+        Returns:
+            bool: Is the cell on the edge of the maze?
+        """
+        r, c = cell
+
+        if r == 0 or r == self.grid.shape[0] - 1:
+            return True
+        if c == 0 or c == self.grid.shape[1] - 1:
+            return True
+
+        return False
+
+    def _push_edge(self, cell):
+        """ You may need to find the cell directly inside of a start or end cell.
+
+        Args:
+            cell (tuple): some place in the grid
+        Returns:
+            tuple: the new cell location, pushed from the edge
+        """
+        r, c = cell
+
+        if r == 0:
+            return 1, c
+        elif r == (self.grid.shape[0] - 1):
+            return r - 1, c
+        elif c == 0:
+            return r, 1
+        else:
+            return r, c - 1
+
+    def _steps(self, cell):
+        """ Candidate next cells from a position: up, down, left, right and, when
+        8-connected, the diagonals. A diagonal move may not cut a corner, so both
+        orthogonal cells beside it must be open. Bounds and walls of the target cell
+        are left to the caller.
+
+        Args:
+            cell (tuple): position to move from
+        Returns:
+            list: cells one move away
+        """
+        r, c = cell
+        steps = [(r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)]
+
+        if self.connectivity == 8:
+            H, W = self.grid.shape
+            for dr, dc in DIAGONALS:
+                if 0 < r + dr < H and 0 < c + dc < W and not self.grid[r + dr, c] and not self.grid[r, c + dc]:
+                    steps.append((r + dr, c + dc))
+
+        return steps
+
+    @staticmethod
+    def _flat_neighbors(cell, H, W, flat, connectivity=4):
+        """ Open cells one move away from a position, on a flattened grid
+
+        Args:
+            cell (int): flat index to move from
+            H (int): grid height
+            W (int): grid width
+            flat (list): flattened maze grid
+            connectivity (int): 4 or 8, see _steps for the corner-cutting rule
+        Returns:
+            list: flat indices of open neighbours
+        """
+        r = cell // W
+        c = cell - r * W
+        # same bounds as the tuple-based solvers: 0 < r < H and 0 < c < W
+        up = r > 1 and not flat[cell - W]
+        down = r < H - 1 and not flat[cell + W]
+        left = c > 1 and not flat[cell - 1]
+        right = c < W - 1 and not flat[cell + 1]
+
+        ns = []
+        if up:
+            ns.append(cell - W)
+        if down:
+            ns.append(cell + W)
+        if left:
+            ns.append(cell - 1)
+        if right:
+            ns.append(cell + 1)
+
+        if connectivity == 8:
+            if up and left and not flat[cell - W - 1]:
+                ns.append(cell - W - 1)
+            if up and right and not flat[cell - W + 1]:
+                ns.append(cell - W + 1)
+            if down and left and not flat[cell + W - 1]:
+                ns.append(cell + W - 1)
+            if down and right and not flat[cell + W + 1]:
+                ns.append(cell + W + 1)
+
+        return ns
+
+    @staticmethod
+    def _distance_field(source, H, W, flat, connectivity=4):
+        """ Number of moves from one cell to every cell, by a full breadth-first search
+
+        Args:
+            source (int): flat index to measure from
+            H (int): grid height
+            W (int): grid width
+            flat (list): flattened maze grid
+            connectivity (int): 4 or 8
+        Returns:
+            list: distance per flat index, -1 for cells not connected to the source
+        """
+        dist = [-1] * len(flat)
+        dist[source] = 0
+        q = deque([source])
+        while q:
+            cell = q.popleft()
+            d = dist[cell] + 1
+            for n in MazeSolver._flat_neighbors(cell, H, W, flat, connectivity):
+                if dist[n] < 0:
+                    dist[n] = d
+                    q.append(n)
+        return dist
+
+    def _field_steps(self, source, H, W, flat):
+        """ _distance_field as part of a resumable solve: pauses after every
+        self._pause cells it settles, so a whole-grid field never runs in one step
+
+        Args:
+            source (int): flat index to measure from
+            H (int): grid height
+            W (int): grid width
+            flat (list): flattened maze grid
+        Returns:
+            list: distance per flat index, -1 for cells not connected to the source
+        """
+        dist = [-1] * len(flat)
+        dist[source] = 0
+        q = deque([source])
+        counter = 0
+        while q:
+            counter += 1
+            if not counter % self._pause:
+                yield
+            cell = q.popleft()
+            d = dist[cell] + 1
+            for n in MazeSolver._flat_neighbors(cell, H, W, flat, self.connectivity):
+                if dist[n] < 0:
+                    dist[n] = d
+                    q.append(n)
+        return dist
+
+    @staticmethod
+    def _descend(cell, field, H, W, flat, connectivity=4):
+        """ Shortest path from a cell down a distance field to its source
+
+        Args:
+            cell (int): flat index to start from, connected to the source
+            field (list): distance field, see _distance_field
+            H (int): grid height
+            W (int): grid width
+            flat (list): flattened maze grid
+            connectivity (int): 4 or 8
+        Returns:
+            list: flat indices from cell to the source
+        """
+        path = [cell]
+        while field[cell]:
+            d = field[cell] - 1
+            for n in MazeSolver._flat_neighbors(cell, H, W, flat, connectivity):
+                if field[n] == d:
+                    cell = n
+                    break
+            path.append(cell)
+        return path
+
+    def _solve_nearest_first(self, fifo=True):
+        """ Multi-target solve: one expanding search from the current position stops
+        at the first end actually reached, then continues from there with the rest.
+
+        Args:
+            fifo (bool): expand breadth-first (queue) if true, depth-first (stack) otherwise
+        Returns:
+            list: valid maze solutions
+        """
+        self._reserve_buffers()
+        flat = self.grid.ravel().tolist()
+        W = self.grid.shape[1]
+        remaining = {r * W + c for r, c in self.end}
+
+        sol = Path(width=W)
+        tmp = self.start[0] * W + self.start[1]
+        while remaining:
+            cost, tmpSol = yield from self._search_nearest(tmp, remaining, flat, fifo)
+            assert tmpSol is not None, 'Remaining ends are unreachable.'
+            self.cost += cost
+            # store the end reached, use it as start for the next route
+            tmp = tmpSol.pop()
+            remaining.discard(tmp)
+            sol.extend_flat(tmpSol)
+
+        sol.extend_flat([tmp])
+        return [sol]
+
+    def _reserve_buffers(self):
+        """ Allocate the visited/parent buffers once per grid shape
+
+        Returns: None
+        """
+        size = self.grid.shape[0] * self.grid.shape[1]
+        if self._stamp is None or len(self._stamp) != size:
+            self._stamp = [0] * size
+            self._parent = [0] * size
+            self._leg = 0
+
+    def _search_nearest(self, start, goals, flat, fifo=True):
+        """ Expand from start until any of the goals is reached.
+        A cell counts as visited when its stamp equals the current leg number,
+        so the buffers never need clearing between legs.
+
+        Args:
+            start (int): flat index to search from
+            goals (set): flat indices of the ends still to reach
+            flat (list): flattened maze grid
+            fifo (bool): expand breadth-first (queue) if true, depth-first (stack) otherwise
+        Returns:
+            int, list: the number of explored cells, flat-index path to the goal reached
+        """
+        H, W = self.grid.shape
+        self._leg += 1
+        leg = self._leg
+        stamp = self._stamp
+        parent = self._parent
+
+        counter = 0
+        log = self._log
+        stats = self.stats
+        q = deque([start])
+        pop = q.popleft if fifo else q.pop
+        stamp[start] = leg
+        parent[start] = -1
+
+        while q:
+            counter += 1
+            if stats is not None:
+                stats.expand(len(q))
+            if not counter % self._pause:
+                yield
+            cell = pop()
+            if log is not None:
+                log(cell)
+            if cell in goals:
+                path = []
+                while cell != -1:
+                    path.append(cell)
+                    cell = parent[cell]
+                path.reverse()
+                if stats is not None:
+                    stats.finish(counter - 1 + len(q))
+                return counter, path
+
+            for n in MazeSolver._flat_neighbors(cell, H, W, flat, self.connectivity):
+                if stamp[n] != leg:
+                    stamp[n] = leg
+                    parent[n] = cell
+                    q.append(n)
+
+        if stats is not None:
+            stats.finish(counter)
+        return counter, None
+
+    def _add_alternatives(self, solutions):
+        """ Extend the solver's route with up to k - 1 loopless alternatives, by Yen's algorithm.
+
+        Every route visits the ends in the order the solver's route first reaches them,
+        so a route is a path over (ends reached so far, cell) states: loopless within a
+        leg, free to cross itself between legs. Each spur search is an A* guided by the
+        exact distance still to go, read off one reverse distance field per end, so it
+        runs straight down the shortest-path tree unless a removed cell or move forces a
+        detour. As in Lawler's refinement, a route only spurs from where it deviated on.
+
+        Args:
+            solutions (list): the solver's own solutions
+        Returns:
+            list: the solver's route, then the shortest distinct alternatives
+        """
+        H, W = self.grid.shape
+        N = H * W
+        flat = self.grid.ravel().tolist()
+        route = [r * W + c for r, c in solutions[0]]
+        ends = {r * W + c for r, c in self.end}
+
+        # ends in the order the solver's route first reaches them
+        order = []
+        for cell in route:
+            if cell in ends and cell not in order:
+                order.append(cell)
+        n = len(order)
+        fields = []
+        for e in order:
+            fields.append((yield from self._field_steps(e, H, W, flat)))
+        # rest[i]: moves from order[i] on through the later ends
+        rest = [0] * n
+        for i in range(n - 2, -1, -1):
+            rest[i] = rest[i + 1] + fields[i + 1][order[i]]
+        layers = (order, fields, rest, flat)
+
+        first = yield from self._layered_search(self._advance(route[0], 0, order) * N + route[0], set(), set(), layers)
+        shortest = [first]
+        deviation = [0]
+        seen = {tuple(first)}
+        candidates = []
+        alternatives = []
+
+        def emit(path):
+            cells = Path([x % N for x in path], W)
+            if cells != solutions[0]:
+                alternatives.append(cells)
+
+        emit(first)
+        while len(alternatives) < self.k - 1:
+            prev = shortest[-1]
+            for i in range(deviation[-1], len(prev) - 1):
+                root = prev[:i + 1]
+                # moves out of the spur state already taken by a route with this root
+                removed_moves = {(p[i], p[i + 1]) for p in shortest if p[:i + 1] == root}
+                spur = yield from self._layered_search(prev[i], set(root[:-1]), removed_moves, layers)
+                if spur is None:
+                    continue
+                path = root[:-1] + spur
+                if tuple(path) not in seen:
+                    seen.add(tuple(path))
+                    heappush(candidates, (len(path), i, path))
+
+            if not candidates:
+                break
+            _, i, path = heappop(candidates)
+            shortest.append(path)
+            deviation.append(i)
+            emit(path)
+
+        return [solutions[0]] + alternatives[:self.k - 1]
+
+    @staticmethod
+    def _advance(cell, i, order):
+        """ Number of ends reached once a route at stage i steps onto a cell
+
+        Args:
+            cell (int): flat index
+            i (int): ends reached before the step
+            order (list): flat indices of the ends, in visiting order
+        Returns:
+            int: ends reached after the step
+        """
+        while i < len(order) and cell == order[i]:
+            i += 1
+        return i
+
+    def _layered_search(self, source, removed, removed_moves, layers):
+        """ A* over (ends reached, cell) states, state key i * H * W + cell, from a
+        state to the last end, avoiding removed states and moves
+
+        Args:
+            source (int): state key to search from
+            removed (set): state keys that may not be entered
+            removed_moves (set): (from, to) state key pairs that may not be taken
+            layers (tuple): ends in visiting order, their distance fields, the
+                distance from each end on through the later ones, flattened maze grid
+        Returns:
+            list: state keys from source to the last end, or None if cut off
+        """
+        order, fields, rest, flat = layers
+        H, W = self.grid.shape
+        N = H * W
+        n = len(order)
+
+        def h(key):
+            i, cell = divmod(key, N)
+            if i == n:
+                return 0
+            d = fields[i][cell]
+            return -1 if d < 0 else d + rest[i]
+
+        counter = 0
+        stats = self.stats
+        g = {source: 0}
+        parent = {source: -1}
+        closed = set()
+        heap = [(h(source), 0, source)]
+        while heap:
+            _, depth, key = heappop(heap)
+            depth = -depth
+            if key in closed:
+                continue
+            closed.add(key)
+            counter += 1
+            if stats is not None:
+                stats.expand(len(heap))
+            if not counter % self._pause:
+                yield
+            i, cell = divmod(key, N)
+            if i == n:
+                if stats is not None:
+                    stats.finish(len(g))
+                self.cost += counter
+                path = []
+                while key != -1:
+                    path.append(key)
+                    key = parent[key]
+                path.reverse()
+                return path
+
+            for m in MazeSolver._flat_neighbors(cell, H, W, flat, self.connectivity):
+                nk = self._advance(m, i, order) * N + m
+                if nk in removed or nk in closed or (key, nk) in removed_moves:
+                    continue
+                hn = h(nk)
+                if hn < 0 or g.get(nk, depth + 2) <= depth + 1:
+                    continue
+                g[nk] = depth + 1
+                parent[nk] = key
+                # deeper first among equal f, so ties run down the tree
+                heappush(heap, (depth + 1 + hn, -(depth + 1), nk))
+
+        if stats is not None:
+            stats.finish(len(g))
+        self.cost += counter
+        return None
+
+    def _prune_solution(self, solution):
+        """ In the process of solving a maze, the algorithm might go down
+        the wrong corridor then backtrack. These extraneous steps need to be removed,
+        in linear time by Path.erase_loops. Also, clean up the end points.
+
+        Args:
+            solution (list): raw maze solution, (row, column) cells or a Path
+        Returns:
+            list: cleaner, tightened up solution to the maze, a Path if given one
+        """
+        path = solution if isinstance(solution, Path) else Path.from_cells(solution, self.grid.shape[1])
+        path = path.erase_loops()
+
+        # Todo: tmp start or more to correct the start-end connection
+        # solution does not include entrances
+        if len(path) > 1:
+            if path[0] == self.start or path[0] in self.end:
+                path = path[1:]
+            if path[-1] in self.end:
+                path = path[:-1]
+
+        return path if isinstance(solution, Path) else path.tolist()
+
+    def prune_solutions(self, solutions):
+        """ prune all the duplicate cells from all solutions, and fix end points
+
+        Args:
+            solutions (list): multiple raw solutions
+        Returns:
+            list: the above solutions, cleaned up
+        """
+        return [self._prune_solution(s) for s in solutions]
@@ -0,0 +1,376 @@
+import struct
+from itertools import chain
+import numpy as np
+
+# encode() forms
+RAW, PACKED, RUNS = range(3)
+# encode() header: form, width, number of cells, first cell
+HEADER = struct.Struct('<Bqqq')
+
+
+class Path:
+    """
+    A route through a maze, kept as an int32 array of flat cell indices
+    r * width + c: 4 bytes a step, where a list of (row, column) tuples takes
+    over 100. It reads like that list: len, iteration, indexing and `in` give
+    (row, column) tuples, slices are Paths sharing the array, and a Path equals
+    the list of the same cells.
+
+    Legs are stitched with +=, extend_flat and append, which only queue the new
+    cells; they are joined into one array the next time the path is read, so
+    stitching many legs stays linear. The array is never written in place.
+
+    Orthogonal routes also pack to 2 bits a step (directions), or to runs of one
+    direction for long corridors (runs); encode() and pickling use whichever of
+    the three forms is smallest.
+
+    erase_loops() and validate() work on the whole array at once, so they stay
+    fast on raw wander paths millions of steps long.
+    """
+    __slots__ = ('width', '_flat', '_queued')
+    __hash__ = None
+
+    def __init__(self, flat=(), width=1):
+        # grid width, to turn flat indices back into cells
+        self.width = width
+        self._flat = np.array(flat, dtype=np.int32).ravel()
+        self._flat.flags.writeable = False
+        # arrays added since the last read, see flat
+        self._queued = []
+
+    @classmethod
+    def _wrap(cls, flat, width):
+        """ A Path over a read-only int32 array, without copying it """
+        path = cls.__new__(cls)
+        path.width = width
+        path._flat = flat
+        path._queued = []
+        return path
+
+    @classmethod
+    def from_cells(cls, cells, width):
+        """ A Path through (row, column) cells
+
+        Args:
+            cells (list): (row, column) tuples
+            width (int): grid width
+        Returns:
+            Path: the cells
+        """
+        n = len(cells)
+        if not n:
+            return cls((), width)
+        rc = np.fromiter(chain.from_iterable(cells), dtype=np.int64, count=2 * n).reshape(n, 2)
+        return cls(rc[:, 0] * width + rc[:, 1], width)
+
+    @property
+    def flat(self):
+        """ Flat cell indices, read-only
+
+        Returns:
+            np.array: int32 index of every cell
+        """
+        if self._queued:
+            self._flat = np.concatenate([self._flat] + self._queued)
+            self._flat.flags.writeable = False
+            self._queued = []
+        return self._flat
+
+    @property
+    def nbytes(self):
+        return self.flat.nbytes
+
+    def coords(self):
+        """ Rows and columns of the cells
+
+        Returns:
+            np.array: (len, 2) array of (row, column)
+        """
+        r, c = np.divmod(self.flat, self.width)
+        return np.stack((r, c), axis=1)
+
+    def tolist(self):
+        """ The cells as a list of (row, column) tuples
+
+        Returns:
+            list: the cells
+        """
+        return list(self)
+
+    def copy(self):
+        """ A Path with the same cells, which += on this one won't change
+
+        Returns:
+            Path: the copy
+        """
+        return Path._wrap(self.flat, self.width)
+
+    def append(self, cell):
+        """ Add a cell at the end
+
+        Args:
+            cell (tuple): (row, column)
+        Returns: None
+        """
+        self._queued.append(np.array([cell[0] * self.width + cell[1]], dtype=np.int32))
+
+    def extend_flat(self, indices):
+        """ Add cells at the end, given as flat indices
+
+        Args:
+            indices (list): flat indices, or an int array of them
+        Returns: None
+        """
+        self._queued.append(np.array(indices, dtype=np.int32).ravel())
+
+    def __iadd__(self, other):
+        if isinstance(other, Path):
+            assert other.width == self.width, 'Paths on grids of different widths.'
+            self._queued.append(other.flat)
+        else:
+            self._queued.append(Path.from_cells(other, self.width).flat)
+        return self
+
+    def __add__(self, other):
+        path = self.copy()
+        path += other
+        return path
+
+    def __len__(self):
+        return len(self.flat)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return Path._wrap(self.flat[i], self.width)
+        return divmod(int(self.flat[i]), self.width)
+
+    def __iter__(self):
+        r, c = np.divmod(self.flat, self.width)
+        return zip(r.tolist(), c.tolist())
+
+    def __reversed__(self):
+        return iter(self[::-1])
+
+    def __contains__(self, cell):
+        r, c = cell
+        return 0 <= c < self.width and bool((self.flat == r * self.width + c).any())
+
+    def index(self, cell):
+        """ Position of the first visit of a cell, as list.index
+
+        Args:
+            cell (tuple): (row, column)
+        Returns:
+            int: position in the path
+        """
+        hits = np.flatnonzero(self.flat == cell[0] * self.width + cell[1]) if 0 <= cell[1] < self.width else ()
+        if not len(hits):
+            raise ValueError('{} is not in path'.format(cell))
+        return int(hits[0])
+
+    def __eq__(self, other):
+        if isinstance(other, Path):
+            return self.width == other.width and np.array_equal(self.flat, other.flat)
+        if isinstance(other, (list, tuple)):
+            return len(other) == len(self) and self.tolist() == [tuple(cell) for cell in other]
+        return NotImplemented
+
+    def __repr__(self):
+        return 'Path({})'.format(self.tolist())
+
+    def __reduce__(self):
+        return Path.decode, (self.encode(),)
+
+    def erase_loops(self):
+        """ Cut out every detour that comes back to a cell already on the path:
+        from each kept cell jump to just after its last visit. One vectorized pass
+        fills a last-seen index per cell, and the walk only touches kept cells, so
+        the erasure is linear in the length of the path.
+
+        Returns:
+            Path: the loop-free path, from the same first to the same last cell
+        """
+        flat = self.flat
+        n = len(flat)
+        if n < 2:
+            return self.copy()
+        # last visit of every cell, then where the path goes on from each position's cell
+        seen = np.full(int(flat.max()) + 1, -1, dtype=np.int64)
+        np.maximum.at(seen, flat, np.arange(n))
+        after = (seen[flat] + 1).tolist()
+
+        keep = []
+        i = 0
+        while i < n:
+            keep.append(i)
+            i = after[i]
+        kept = flat[keep]
+        kept.flags.writeable = False
+        return Path._wrap(kept, self.width)
+
+    def repeats(self):
+        """ Cells visited more than once, vectorized
+
+        Returns:
+            np.array: flat index of every visit after a cell's first, in index order
+        """
+        ranked = np.sort(self.flat)
+        return ranked[1:][ranked[1:] == ranked[:-1]]
+
+    def validate(self, connectivity=4, grid=None, loopless=True):
+        """ Vectorized sanity check of the whole path
+
+        Args:
+            connectivity (int): 4, or 8 if diagonal moves are allowed
+            grid (np.array): optional maze array, every cell must then be open
+            loopless (bool): also report cells visited more than once
+        Returns:
+            list: human-readable problems, empty if none
+        """
+        problems = []
+        rc = self.coords()
+        if not len(rc):
+            return ['The path is empty.']
+
+        d = np.abs(np.diff(rc, axis=0))
+        bad = np.flatnonzero((d.max(axis=1) != 1) if connectivity == 8 else (d.sum(axis=1) != 1))
+        if len(bad):
+            i = int(bad[0])
+            problems.append('Not a move: {} steps, the first from {} to {} at step {}.'.format(
+                len(bad), tuple(rc[i].tolist()), tuple(rc[i + 1].tolist()), i))
+
+        if loopless:
+            repeats = self.repeats()
+            if len(repeats):
+                problems.append('Visited again: {} times, the first {}.'.format(
+                    len(repeats), divmod(int(repeats[0]), self.width)))
+
+        if grid is not None:
+            H, W = grid.shape
+            inside = (rc[:, 0] >= 0) & (rc[:, 0] < H) & (rc[:, 1] >= 0) & (rc[:, 1] < W)
+            blocked = np.flatnonzero(~inside)
+            if not len(blocked):
+                blocked = np.flatnonzero(grid[rc[:, 0], rc[:, 1]])
+            if len(blocked):
+                problems.append('Off the grid or in a wall: {} cells, the first {}.'.format(
+                    len(blocked), tuple(rc[blocked[0]].tolist())))
+        return problems
+
+    def _codes(self):
+        """ 2-bit direction code of every step: 0 up, 1 right, 2 down, 3 left
+
+        Returns:
+            np.array: uint8 codes, or None if some step is not one orthogonal move
+        """
+        W = self.width
+        steps = np.diff(self.flat.astype(np.int64))
+        codes = np.full(len(steps), 4, dtype=np.uint8)
+        for code, offset in enumerate((-W, 1, W, -1)):
+            codes[steps == offset] = code
+        return None if (codes == 4).any() else codes
+
+    def directions(self):
+        """ Steps packed 4 to a byte, first step in the high bits
+
+        Returns:
+            np.array: uint8 packed direction codes, or None if the path has non-orthogonal steps
+        """
+        codes = self._codes()
+        if codes is None:
+            return None
+        codes = np.concatenate((codes, np.zeros(-len(codes) % 4, dtype=np.uint8))).reshape(-1, 4)
+        return (codes[:, 0] << 6) | (codes[:, 1] << 4) | (codes[:, 2] << 2) | codes[:, 3]
+
+    def runs(self):
+        """ Steps as runs of one direction, short for routes of long corridors
+
+        Returns:
+            np.array, np.array: uint8 direction and uint32 length of every run,
+                or None, None if the path has non-orthogonal steps
+        """
+        codes = self._codes()
+        if codes is None:
+            return None, None
+        starts = np.flatnonzero(np.concatenate(([True], codes[1:] != codes[:-1]))) if len(codes) else \
+            np.zeros(0, dtype=np.int64)
+        lengths = np.diff(np.append(starts, len(codes))).astype(np.uint32)
+        return codes[starts], lengths
+
+    @classmethod
+    def _from_codes(cls, first, codes, width):
+        offsets = np.array((-width, 1, width, -1), dtype=np.int64)
+        flat = np.empty(len(codes) + 1, dtype=np.int64)
+        flat[0] = first
+        np.cumsum(offsets[codes], out=flat[1:])
+        flat[1:] += first
+        return cls(flat, width)
+
+    @classmethod
+    def from_directions(cls, first, packed, steps, width):
+        """ Undo directions()
+
+        Args:
+            first (int): flat index of the first cell
+            packed (np.array): see directions()
+            steps (int): number of steps, len(path) - 1
+            width (int): grid width
+        Returns:
+            Path: the path
+        """
+        packed = np.asarray(packed, dtype=np.uint8)
+        codes = np.stack((packed >> 6, (packed >> 4) & 3, (packed >> 2) & 3, packed & 3), axis=1).ravel()[:steps]
+        return cls._from_codes(first, codes, width)
+
+    @classmethod
+    def from_runs(cls, first, codes, lengths, width):
+        """ Undo runs()
+
+        Args:
+            first (int): flat index of the first cell
+            codes (np.array): direction of every run
+            lengths (np.array): length of every run
+            width (int): grid width
+        Returns:
+            Path: the path
+        """
+        return cls._from_codes(first, np.repeat(np.asarray(codes, dtype=np.uint8), lengths), width)
+
+    def encode(self):
+        """ The path as bytes, in the smallest of the raw, packed and run-length forms
+
+        Returns:
+            bytes: see decode()
+        """
+        flat = self.flat
+        n = len(flat)
+        first = int(flat[0]) if n else 0
+        best = RAW, flat.astype('<i4').tobytes()
+        if n > 1:
+            codes, lengths = self.runs()
+            if codes is not None:
+                packed = self.directions().tobytes()
+                if len(packed) < len(best[1]):
+                    best = PACKED, packed
+                if 5 * len(codes) < len(best[1]):
+                    best = RUNS, codes.tobytes() + lengths.astype('<u4').tobytes()
+        form, payload = best
+        return HEADER.pack(form, self.width, n, first) + payload
+
+    @staticmethod
+    def decode(data):
+        """ Undo encode()
+
+        Args:
+            data (bytes): see encode()
+        Returns:
+            Path: the path
+        """
+        form, width, n, first = HEADER.unpack_from(data)
+        payload = memoryview(data)[HEADER.size:]
+        if form == RAW:
+            return Path(np.frombuffer(payload, dtype='<i4'), width)
+        if form == PACKED:
+            return Path.from_directions(first, np.frombuffer(payload, dtype=np.uint8), n - 1, width)
+        k = len(payload) // 5
+        return Path.from_runs(first, np.frombuffer(payload[:k], dtype=np.uint8),
+                              np.frombuffer(payload[k:], dtype='<u4'), width)
@@ -0,0 +1,77 @@
+from collections.abc import Mapping
+from importlib import import_module
+from importlib.machinery import EXTENSION_SUFFIXES
+
+
+class Registry(Mapping):
+    """
+    Algorithms by name, imported on first lookup. Entries are 'Module:Class'
+    strings relative to this package, or any importable 'package.module:Class';
+    nothing is imported until a name is looked up, and a looked-up class is kept.
+
+    A module built with Cython (see setup.py) sits next to its .py source and
+    Python's import system prefers it, so lookups get the compiled variant
+    whenever one has been built; compiled() tells which one was loaded.
+
+        SOLVERS['AStar'](k=2)
+        SOLVERS.register('Mine', 'mypackage.solvers:MySolver')
+    """
+
+    def __init__(self, kind, entries=None):
+        # what the registry holds, for error messages
+        self.kind = kind
+        self._entries = dict(entries or {})
+        self._loaded = {}
+
+    def register(self, name, target):
+        """ Add or replace an algorithm
+
+        Args:
+            name (str): lookup name
+            target (str or class): 'module:Class' to import lazily, or the class itself
+        Returns: None
+        """
+        self._entries[name] = target
+        self._loaded.pop(name, None)
+
+    def __getitem__(self, name):
+        if name in self._loaded:
+            return self._loaded[name]
+        assert name in self._entries, 'Unknown {} {}.'.format(self.kind, name)
+        target = self._entries[name]
+        if isinstance(target, str):
+            module, attr = target.split(':')
+            target = getattr(import_module(module if '.' in module else __package__ + '.' + module), attr)
+        self._loaded[name] = target
+        return target
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def create(self, name, **kwargs):
+        """ Look an algorithm up and build it
+
+        Args:
+            name (str): lookup name
+            kwargs: constructor arguments
+        Returns:
+            object: a new instance
+        """
+        return self[name](**kwargs)
+
+    def compiled(self, name):
+        """ Was the algorithm loaded from a Cython-compiled module?
+
+        Args:
+            name (str): lookup name
+        Returns:
+            bool: True if its module is an extension module
+        """
+        module = import_module(self[name].__module__)
+        return any((getattr(module, '__file__', None) or '').endswith(suffix) for suffix in EXTENSION_SUFFIXES)
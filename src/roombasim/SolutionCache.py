@@ -0,0 +1,171 @@
+import os
+import pickle
+from collections import OrderedDict
+from hashlib import blake2b
+
+
+class SolutionCache:
+    """
+    Content-addressed store of maze solutions.
+
+    Entries are keyed by a hash of the maze grid bytes, the start, the ends and
+    the solver class, so an identical maze solved twice is only searched once.
+    The in-memory tier is an LRU bounded by entry count and/or pickled bytes;
+    an optional on-disk tier keeps solutions across simulation runs.
+
+    Optional Parameters
+
+    max_entries: int
+        Evict the least recently used entry once more than this many are held. (default 1024)
+    max_bytes: int
+        Evict the least recently used entry once the pickled size of all entries
+        exceeds this many bytes. (default None, unbounded)
+    directory: str
+        Local directory for the on-disk tier. (default None, memory only)
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=None, directory=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        # dict: {key, (pickled size, solutions)}
+        self._entries = OrderedDict()
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def hash_grid(grid):
+        """ Fast digest of a maze grid, covering its shape, dtype and raw bytes
+
+        Args:
+            grid (np.array): maze array
+        Returns:
+            str: hex digest of the grid
+        """
+        h = blake2b(digest_size=16)
+        h.update(str((grid.shape, grid.dtype.str)).encode())
+        h.update(grid.tobytes())
+        return h.hexdigest()
+
+    @staticmethod
+    def make_key(grid_digest, start, end, solver):
+        """ Build the cache key of a single solve
+
+        Args:
+            grid_digest (str): digest of the maze grid, see hash_grid
+            start (tuple): position in maze to start from
+            end (list): positions in maze to finish at
+            solver (MazeSolver): solver instance, or class, used for the solve
+        Returns:
+            str: hex digest identifying the solve
+        """
+        if isinstance(solver, type):
+            cls, options = solver, ()
+        else:
+            cls, options = type(solver), solver.cache_options()
+        h = blake2b(digest_size=16)
+        h.update(grid_digest.encode())
+        h.update(repr((tuple(start), [tuple(e) for e in end],
+                       cls.__module__, cls.__qualname__, options)).encode())
+        return h.hexdigest()
+
+    def get(self, key):
+        """ Look up a solve, first in memory then on disk
+
+        Args:
+            key (str): cache key, see make_key
+        Returns:
+            list: cached solutions, or None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        if self.directory is not None:
+            path = self._path(key)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    data = f.read()
+                solutions = pickle.loads(data)
+                self._store(key, solutions, len(data))
+                self.hits += 1
+                return solutions
+
+        self.misses += 1
+        return None
+
+    def put(self, key, solutions):
+        """ Save the solutions of a solve into every tier
+
+        Args:
+            key (str): cache key, see make_key
+            solutions (list): solutions returned by the solver
+        Returns:
+            None
+        """
+        data = pickle.dumps(solutions, protocol=pickle.HIGHEST_PROTOCOL)
+        self._store(key, solutions, len(data))
+
+        if self.directory is not None:
+            # write then rename, so a concurrent reader never sees half a file
+            path = self._path(key)
+            tmp = path + '.tmp{}'.format(os.getpid())
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+
+    def clear(self):
+        """ Drop the in-memory tier and reset the counters; the on-disk tier is kept
+
+        Returns:
+            None
+        """
+        self._entries.clear()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def _store(self, key, solutions, size):
+        """ Insert an entry into the in-memory LRU and evict as required
+
+        Args:
+            key (str): cache key
+            solutions (list): solutions to cache
+            size (int): pickled size of the solutions, in bytes
+        Returns:
+            None
+        """
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.nbytes -= old[0]
+
+        self._entries[key] = (size, solutions)
+        self.nbytes += size
+
+        while self._entries and (
+                (self.max_entries is not None and len(self._entries) > self.max_entries) or
+                (self.max_bytes is not None and self.nbytes > self.max_bytes)):
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self.nbytes -= evicted
+
+    def _path(self, key):
+        """ Location of an entry in the on-disk tier
+
+        Args:
+            key (str): cache key
+        Returns:
+            str: file path
+        """
+        return os.path.join(self.directory, key + '.pkl')
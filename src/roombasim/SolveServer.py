@@ -0,0 +1,368 @@
+""" Local solve service: JSON-lines over TCP or a Unix socket, one request per line.
+
+Requests, each with an optional "id" echoed back in its response:
+
+    {"op": "generate", "maze": name, "rows": 20, "cols": 20, "rooms": [[[1, 1], [5, 5]]],
+     "hunt_order": "random", "seed": 1, "entrances": 3}
+    {"op": "put", "maze": name, "grid": [[1, 1, ...], ...], "start": [r, c], "end": [[r, c], ...]}
+    {"op": "solve", "maze": name, "solver": "AStar", "options": {"k": 2},
+     "start": [r, c], "end": [[r, c], ...], "connectivity": 4}
+    {"op": "drop", "maze": name}
+
+A solve without start or end uses the maze's stored entrances. Responses stream
+back as each job finishes, so they may come out of request order:
+
+    {"id": ..., "ok": true, "solutions": [[[r, c], ...]], "cost": 123, "cached": false}
+    {"id": ..., "ok": true, "solutions": [[[r, c], ...]], "cached": true}
+    {"id": ..., "ok": false, "error": "..."}
+
+    python -m roombasim.SolveServer --port 8765
+"""
+import argparse
+import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .Maze import Maze
+from .MazeRoomGen import DungeonRooms
+from .SolutionCache import SolutionCache
+# solver name in requests -> MazeSolver subclass, imported on first request
+from . import SOLVERS
+
+
+def make_solver(name, options=None):
+    """ Build a solver from its request name and JSON options
+
+    Args:
+        name (str): key of SOLVERS
+        options (dict): keyword arguments of the solver, cells as [r, c] lists
+    Returns:
+        MazeSolver: a fresh solver
+    """
+    assert name in SOLVERS, 'Unknown solver {}.'.format(name)
+    options = dict(options or {})
+    if 'chargers' in options:
+        options['chargers'] = [tuple(c) for c in options['chargers']]
+    if 'weights' in options:
+        options['weights'] = tuple(options['weights'])
+    return SOLVERS[name](**options)
+
+
+def _generate(job):
+    """ Worker: generate a maze, and its entrances if asked for
+
+    Args:
+        job (dict): generate request
+    Returns:
+        np.array, tuple, list: grid, start and ends (None and [] without entrances)
+    """
+    m = Maze(job.get('seed'))
+    rooms = [[tuple(corner) for corner in room] for room in job.get('rooms', [])]
+    m.generator = DungeonRooms(job['rows'], job['cols'], rooms=rooms, hunt_order=job.get('hunt_order', 'random'))
+    m.generate()
+    if job.get('entrances'):
+        m.generate_entrances(job['entrances'])
+    return m.grid, m.start, m.end
+
+
+def _to_json(solutions):
+    """ Solutions as they are written in a response
+
+    Args:
+        solutions (list): Path per solution
+    Returns:
+        list: per solution, its cells as [r, c] lists
+    """
+    return [s.coords().tolist() for s in solutions]
+
+
+def _solve_batch(grid, jobs):
+    """ Worker: solve every query of a batch on one shared grid
+
+    Args:
+        grid (np.array): maze array
+        jobs (list): solve requests, with start and end filled in
+    Returns:
+        list: per job, {'solutions': Paths, 'cost'} or {'error'}
+    """
+    m = Maze()
+    m.grid = grid
+    results = []
+    for job in jobs:
+        try:
+            m.start = tuple(job['start'])
+            m.end = [tuple(e) for e in job['end']]
+            m.connectivity = job.get('connectivity', 4)
+            m.solver = make_solver(job.get('solver', 'BFS'), job.get('options'))
+            m.solve()
+            results.append({'solutions': m.solutions, 'cost': m.solver.cost})
+        except (AssertionError, TypeError, ValueError) as e:
+            results.append({'error': str(e) or type(e).__name__})
+    return results
+
+
+class SolveServer:
+    """
+    Asyncio JSON-lines server that keeps named mazes and one warm SolutionCache for
+    every client. Solves that arrive within `batch_window` seconds of each other on
+    the same maze are coalesced into one batch (identical queries run once) and
+    solved in a worker process, so the event loop only ever does I/O.
+
+    Optional Parameters
+
+    workers: int
+        Size of the process pool. (default None, one per CPU)
+    cache: SolutionCache
+        Shared cache of solutions. (default a new in-memory SolutionCache)
+    batch_window: float
+        Seconds a batch stays open for more queries on the same maze. (default 0.002)
+    line_limit: int
+        Longest request line accepted, in bytes; a put of a 201x201 grid is about
+        120 KiB. (default 16 MiB)
+    """
+
+    def __init__(self, workers=None, cache=None, batch_window=0.002, line_limit=2 ** 24):
+        self.cache = SolutionCache() if cache is None else cache
+        self.batch_window = batch_window
+        self.line_limit = line_limit
+        # dict: {name, {'grid', 'digest', 'start', 'end'}}
+        self.mazes = {}
+        # number of batches sent to the pool
+        self.batches = 0
+        self._pool = ProcessPoolExecutor(workers)
+        # dict: {grid digest, {cache key, (job, [futures])}} of the open batches
+        self._open = {}
+        self._server = None
+        # tasks serving the open connections
+        self._clients = set()
+
+    async def start(self, host='127.0.0.1', port=0, path=None):
+        """ Listen on a TCP port, or on a Unix socket if a path is given
+
+        Args:
+            host (str): TCP interface
+            port (int): TCP port, 0 for any free one
+            path (str): Unix socket path
+        Returns:
+            asyncio.AbstractServer: the listening server
+        """
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._client, path=path, limit=self.line_limit)
+        else:
+            self._server = await asyncio.start_server(self._client, host, port, limit=self.line_limit)
+        return self._server
+
+    async def close(self):
+        """ Stop listening and shut the process pool down
+
+        Returns: None
+        """
+        if self._server is not None:
+            self._server.close()
+        for task in list(self._clients):
+            task.cancel()
+        if self._clients:
+            await asyncio.wait(self._clients)
+        if self._server is not None:
+            await self._server.wait_closed()
+        self._pool.shutdown()
+
+    async def handle(self, job):
+        """ Run one request
+
+        Args:
+            job (dict): decoded request
+        Returns:
+            dict: response, without the id
+        """
+        try:
+            op = job.get('op')
+            if op == 'solve':
+                return await self._solve(job)
+            if op == 'generate':
+                loop = asyncio.get_running_loop()
+                grid, start, end = await loop.run_in_executor(self._pool, _generate, job)
+                maze = self._store(job['maze'], grid, start, end)
+                return {'ok': True, 'shape': list(grid.shape), 'start': maze['start'], 'end': maze['end']}
+            if op == 'put':
+                grid = np.array(job['grid'], dtype=np.int8)
+                assert grid.ndim == 2, 'A grid must be a list of rows.'
+                self._store(job['maze'], grid, job.get('start'), job.get('end', []))
+                return {'ok': True, 'shape': list(grid.shape)}
+            if op == 'drop':
+                return {'ok': self.mazes.pop(job['maze'], None) is not None}
+            assert False, 'Unknown op {}.'.format(op)
+        except (AssertionError, KeyError, TypeError, ValueError) as e:
+            return {'ok': False, 'error': str(e) or type(e).__name__}
+
+    def _store(self, name, grid, start, end):
+        """ Keep a maze under a name, replacing any maze stored there before
+
+        Returns:
+            dict: the stored maze
+        """
+        grid.setflags(write=False)
+        maze = {'grid': grid, 'digest': SolutionCache.hash_grid(grid),
+                'start': None if start is None else [int(v) for v in start],
+                'end': [[int(v) for v in e] for e in end]}
+        self.mazes[name] = maze
+        return maze
+
+    async def _solve(self, job):
+        """ Answer a solve from the cache, or add it to the open batch of its maze
+
+        Args:
+            job (dict): solve request
+        Returns:
+            dict: response, without the id
+        """
+        name = job.get('maze')
+        assert name in self.mazes, 'Unknown maze {}.'.format(name)
+        maze = self.mazes[name]
+        job = dict(job)
+        job['start'] = job.get('start') or maze['start']
+        job['end'] = job.get('end') or maze['end']
+        assert job['start'] is not None and job['end'], 'Start and end must be set first.'
+
+        # same digest scheme as Maze.solve
+        digest = maze['digest']
+        connectivity = job.get('connectivity', 4)
+        if connectivity != 4:
+            digest += ':{}-connected'.format(connectivity)
+        solver = make_solver(job.get('solver', 'BFS'), job.get('options'))
+        key = self.cache.make_key(digest, tuple(job['start']), [tuple(e) for e in job['end']], solver)
+        hit = self.cache.get(key)
+        if hit is not None:
+            return {'ok': True, 'solutions': _to_json(hit), 'cached': True}
+
+        # batches are per grid, not per name: a put while one is open starts a new
+        # batch for the new grid, and the open one still solves the grid its keys hash
+        future = asyncio.get_running_loop().create_future()
+        grid = maze['grid']
+        batch = self._open.get(maze['digest'])
+        if batch is None:
+            batch = self._open[maze['digest']] = {}
+            asyncio.get_running_loop().call_later(
+                self.batch_window, lambda: asyncio.ensure_future(self._flush(maze['digest'], grid)))
+        batch.setdefault(key, (job, []))[1].append(future)
+        return await future
+
+    async def _flush(self, digest, grid):
+        """ Close the open batch of a grid and solve it in the process pool
+
+        Args:
+            digest (str): SolutionCache.hash_grid of the grid
+            grid (np.array): maze array the batch was opened on
+        Returns: None
+        """
+        batch = self._open.pop(digest)
+        keys = list(batch)
+        self.batches += 1
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self._pool, _solve_batch, grid,
+                                                 [batch[key][0] for key in keys])
+        except Exception as e:
+            results = [{'error': 'Worker failed: {}'.format(e)}] * len(keys)
+
+        for key, result in zip(keys, results):
+            if 'error' in result:
+                response = {'ok': False, 'error': result['error']}
+            else:
+                # Paths, as Maze.solve caches them, so the two can share a cache directory
+                self.cache.put(key, result['solutions'])
+                response = {'ok': True, 'solutions': _to_json(result['solutions']), 'cost': result['cost'],
+                            'cached': False}
+            for future in batch[key][1]:
+                if not future.done():
+                    future.set_result(response)
+
+    async def _client(self, reader, writer):
+        """ Serve one connection: every request line runs as its own task, and its
+        response line is written as soon as it is ready
+
+        Returns: None
+        """
+        lock = asyncio.Lock()
+        tasks = set()
+        me = asyncio.current_task()
+        self._clients.add(me)
+
+        async def reply(response):
+            async with lock:
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+
+        async def answer(line):
+            try:
+                job = json.loads(line)
+                assert isinstance(job, dict), 'A request must be a JSON object.'
+            except (ValueError, AssertionError) as e:
+                job, response = {}, {'ok': False, 'error': 'Bad request: {}'.format(e)}
+            else:
+                response = await self.handle(job)
+            response['id'] = job.get('id')
+            await reply(response)
+
+        # inside a line longer than line_limit, which is dropped as it arrives
+        skipping = False
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b'\n')
+                except asyncio.IncompleteReadError as e:
+                    # last line without a newline, b'' at the end of the stream
+                    line = e.partial
+                except asyncio.LimitOverrunError as e:
+                    await reader.readexactly(e.consumed)
+                    skipping = True
+                    continue
+                if skipping:
+                    skipping = False
+                    await reply({'ok': False, 'error': 'Bad request: longer than {} bytes.'.format(self.line_limit),
+                                 'id': None})
+                    line = b''
+                if not line:
+                    if reader.at_eof():
+                        break
+                    continue
+                if line.strip():
+                    task = asyncio.ensure_future(answer(line))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.wait(tasks)
+        except (ConnectionError, asyncio.CancelledError):
+            for task in tasks:
+                task.cancel()
+        finally:
+            self._clients.discard(me)
+            writer.close()
+
+
+async def serve(host='127.0.0.1', port=8765, path=None, workers=None):
+    """ Run a SolveServer until cancelled
+
+    Returns: None
+    """
+    server = SolveServer(workers)
+    listener = await server.start(host, port, path)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='JSON-lines maze solve service')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help='listen on this Unix socket path instead of TCP')
+    parser.add_argument('--workers', type=int, help='worker processes, default one per CPU')
+    args = parser.parse_args(argv)
+    asyncio.run(serve(args.host, args.port, args.unix, args.workers))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+from time import perf_counter
+
+
+class SolveStats:
+    """
+    Counters of a single solve, kept in MazeSolver.stats when the solver is created
+    with stats=True. Unlike MazeSolver.cost, they start from zero on every solve.
+
+    A "search" below is one run of a solver's inner search: a leg between two ends,
+    an anytime improvement round, or a spur search for an alternative route. The
+    searches count into these themselves, by expand() and finish().
+    """
+
+    def __init__(self):
+        # cells taken off the frontier and expanded
+        self.expanded = 0
+        # cells reached (put on the frontier), summed over the searches
+        self.generated = 0
+        # largest frontier (queue, stack or heap) seen
+        self.frontier_peak = 0
+        # most cells reached by any one search
+        self.visited_peak = 0
+        # wall time of every search, in order
+        self.leg_times = []
+        # wall time of the input checks and grid preparation before searching
+        self.preprocess_time = 0.0
+        # wall time of the searching, and the rest of the solve after preprocessing
+        self.search_time = 0.0
+        # peak traced memory in KiB, when asked for and tracemalloc was not already running
+        self.memory_peak = None
+        # perf_counter() at the end of the last search, or the start of searching
+        self._mark = None
+
+    def start(self):
+        """ Mark the start of the searching, the first search is timed from here
+
+        Returns: None
+        """
+        self._mark = perf_counter()
+
+    def expand(self, frontier):
+        """ Count one expansion, as a search takes a cell off its frontier
+
+        Args:
+            frontier (int): frontier size before the cell is taken off
+        Returns: None
+        """
+        self.expanded += 1
+        if frontier > self.frontier_peak:
+            self.frontier_peak = frontier
+
+    def finish(self, reached):
+        """ Close one search, as it returns
+
+        Args:
+            reached (int): cells the search reached, its start included
+        Returns: None
+        """
+        now = perf_counter()
+        self.leg_times.append(now - self._mark)
+        self._mark = now
+        self.generated += reached
+        if reached > self.visited_peak:
+            self.visited_peak = reached
+
+    def as_dict(self):
+        """ The counters, ready for JSON
+
+        Returns:
+            dict: counter name -> value
+        """
+        return {name: value for name, value in vars(self).items() if not name.startswith('_')}
@@ -0,0 +1,234 @@
+import json
+from math import exp, log
+from time import perf_counter
+
+# log(seconds) = coefficients . (1, log cells, free_ratio, room_area, junctions, log goals),
+# fitted by `python -m roombasim.Benchmark --solvers BFS DFS Greedy AStar --sizes 15 51 101 201
+# --densities 0.0 0.2 0.4 --goals 1 3 6 --repeats 2 --no-memory --fit`
+COEFFICIENTS = {
+    'BFS': (-9.7479, 1.2724, -11.5441, -1.5102, 5.6709, 0.8028),
+    'DFS': (-6.8067, 1.7385, -28.4008, -13.4074, 24.3195, 0.9599),
+    'Greedy': (-9.8214, 1.3148, -12.155, -0.1832, 4.642, 0.6553),
+    'AStar': (-10.855, 1.3062, -9.6942, -7.522, 11.2541, 0.4241),
+}
+
+
+class SolverSelector:
+    """
+    Picks the solver expected to be fastest on a maze, from cheap grid statistics
+    and a per-solver log-linear cost model. Set Maze.solver = 'auto' to use one.
+
+    Every solve it chooses for is added to history, with the statistics and the
+    predicted and actual seconds, so the model can be refit from real solves:
+
+        SolverSelector(SolverSelector.fit(selector.history))
+
+    Optional Parameters
+
+    coefficients: dict
+        Solver name -> cost model coefficients, see COEFFICIENTS. (default COEFFICIENTS)
+    options: dict
+        Constructor arguments of the chosen solver, such as k or multi_target. (default None)
+    log: function
+        Called with every history record as it is made. (default None)
+    """
+
+    def __init__(self, coefficients=None, options=None, log=None):
+        self.coefficients = dict(COEFFICIENTS if coefficients is None else coefficients)
+        self.options = dict(options or {})
+        self.log = log
+        # one record per solve chosen for, see record()
+        self.history = []
+        # number of history records already written by save()
+        self._saved = 0
+
+    @staticmethod
+    def features(grid, end):
+        """ Cheap statistics of a maze, each one vectorized pass over the grid
+
+        Args:
+            grid (np.array): maze array
+            end (list): end cells
+        Returns:
+            dict: free_ratio: fraction of open cells,
+                room_area: fraction of open cells inside an open 2x2 block, i.e. in rooms rather than corridors,
+                junctions: fraction of open cells with 3 or more open neighbours,
+                goals: number of ends,
+                cells: size of the grid
+        """
+        import numpy as np
+        free = np.asarray(grid) == 0
+        H, W = free.shape
+        n_free = max(1, int(np.count_nonzero(free)))
+
+        block = free[:-1, :-1] & free[1:, :-1] & free[:-1, 1:] & free[1:, 1:]
+        room = np.zeros_like(free)
+        room[:-1, :-1] |= block
+        room[1:, :-1] |= block
+        room[:-1, 1:] |= block
+        room[1:, 1:] |= block
+
+        padded = np.pad(free, 1).astype(np.uint8)
+        degree = padded[:-2, 1:-1] + padded[2:, 1:-1] + padded[1:-1, :-2] + padded[1:-1, 2:]
+
+        return {'free_ratio': n_free / (H * W),
+                'room_area': int(np.count_nonzero(room)) / n_free,
+                'junctions': int(np.count_nonzero(free & (degree >= 3))) / n_free,
+                'goals': len(end),
+                'cells': H * W}
+
+    @staticmethod
+    def design(features):
+        """ Model inputs of a set of statistics
+
+        Args:
+            features (dict): see features()
+        Returns:
+            tuple: the terms the coefficients multiply
+        """
+        return (1.0, log(max(1, features['cells'])), features['free_ratio'], features['room_area'],
+                features['junctions'], log(max(1, features['goals'])))
+
+    def predict(self, features):
+        """ Predicted solve time of every solver
+
+        Args:
+            features (dict): see features()
+        Returns:
+            dict: solver name -> seconds
+        """
+        x = SolverSelector.design(features)
+        return {name: exp(sum(a * b for a, b in zip(c, x))) for name, c in self.coefficients.items()}
+
+    def choose(self, features):
+        """ The solver predicted to be fastest
+
+        Args:
+            features (dict): see features()
+        Returns:
+            str, float: solver name, predicted seconds
+        """
+        assert self.coefficients, 'No solvers to choose from.'
+        predicted = self.predict(features)
+        name = min(predicted, key=predicted.get)
+        return name, predicted[name]
+
+    def pick(self, grid, end):
+        """ Choose a solver for a maze, and build it
+
+        Args:
+            grid (np.array): maze array
+            end (list): end cells
+        Returns:
+            str, MazeSolver, dict, float: solver name, new solver instance, statistics of the maze, predicted seconds
+        """
+        from . import SOLVERS
+        features = SolverSelector.features(grid, end)
+        name, predicted = self.choose(features)
+        return name, SOLVERS.create(name, **self.options), features, predicted
+
+    def timed(self, run, name, features, predicted):
+        """ Pass a resumable solve through, timing the solver's own work and not the
+        pauses in between, then record it
+
+        Args:
+            run (generator): MazeSolver.iter_solve of the chosen solver
+            name (str): solver name
+            features (dict): statistics of the maze
+            predicted (float): predicted seconds
+        Yields:
+            None: at every pause of the solve
+        Returns:
+            list: the solutions
+        """
+        elapsed = 0.0
+        while True:
+            t = perf_counter()
+            try:
+                next(run)
+            except StopIteration as done:
+                elapsed += perf_counter() - t
+                self.record(name, features, predicted, elapsed)
+                return done.value
+            elapsed += perf_counter() - t
+            yield
+
+    def record(self, name, features, predicted, actual):
+        """ Add a solve to history, and pass it to log
+
+        Args:
+            name (str): solver name
+            features (dict): statistics of the maze
+            predicted (float): predicted seconds
+            actual (float): measured seconds
+        Returns:
+            dict: the record
+        """
+        entry = {'solver': name, 'features': features, 'predicted': predicted, 'time': actual}
+        self.history.append(entry)
+        if self.log is not None:
+            self.log(entry)
+        return entry
+
+    def save(self, file):
+        """ Append the history records made since the last save to a JSON-lines file,
+        for refitting later, so saving again never writes a record twice
+
+        Args:
+            file (str): path of the file
+        Returns:
+            None
+        """
+        with open(file, 'a') as f:
+            for entry in self.history[self._saved:]:
+                f.write(json.dumps(entry) + '\n')
+        self._saved = len(self.history)
+
+    @staticmethod
+    def load(file):
+        """ Records saved by save()
+
+        Args:
+            file (str): path of the file
+        Returns:
+            list: the records
+        """
+        with open(file) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    @staticmethod
+    def samples(report):
+        """ Training records of a Benchmark report, one per case and solver
+
+        Args:
+            report (dict): see Benchmark.sweep
+        Returns:
+            list: records in the format of history
+        """
+        return [{'solver': name, 'features': record['features'], 'time': record[name]['time']}
+                for record in report['records'] for name in report['solvers']]
+
+    @staticmethod
+    def fit(records, prior=None):
+        """ Least-squares fit of the cost model of every solver in the records.
+        Solvers with fewer records than coefficients keep their prior ones.
+
+        Args:
+            records (list): history records, or samples() of a benchmark
+            prior (dict): coefficients to start from (default COEFFICIENTS)
+        Returns:
+            dict: solver name -> coefficients
+        """
+        import numpy as np
+        coefficients = dict(COEFFICIENTS if prior is None else prior)
+        by_solver = {}
+        for r in records:
+            if r['time'] > 0:
+                by_solver.setdefault(r['solver'], []).append(r)
+        for name, rows in by_solver.items():
+            X = np.array([SolverSelector.design(r['features']) for r in rows])
+            if len(rows) < X.shape[1]:
+                continue
+            y = np.log([r['time'] for r in rows])
+            coefficients[name] = tuple(round(float(c), 4) for c in np.linalg.lstsq(X, y, rcond=None)[0])
+        return coefficients
@@ -0,0 +1,214 @@
+""" Inspired from code sample provided by Wu, Jingjing
+
+Command line front end for benchmark tables, charts and maze drawings. Everything
+heavy (NumPy, the solvers, matplotlib) is imported by the command that needs it,
+so starting up costs next to nothing, and matplotlib is only loaded to draw a chart.
+
+    python -m roombasim.Visualization bench --tests 10 --metric expanded --csv table.csv --png chart.png
+    python -m roombasim.Visualization bench --tests 5                  # interactive chart window
+    python -m roombasim.Visualization maze --size 41 --solver AStar --png maze.png --text
+"""
+import argparse
+import csv
+import json
+import sys
+
+# benchmark columns: SOLVERS names, and their chart labels
+ALGORITHMS = ('BFS', 'DFS', 'Greedy', 'AStar')
+LABELS = ('BFS', 'DFS', 'Greedy', 'A*')
+
+
+def make_maze(size=15, density=0.2, goals=4, seed=None, hunt_order='serpentine'):
+    """ Generate a maze with rooms and entrances, as the benchmarks use them
+
+    Args:
+        size (int): cells per side of the grid, odd
+        density (float): fraction of the grid covered by rooms
+        goals (int): number of ends
+        seed (int): random seed, None for a fresh maze
+        hunt_order (str): 'random' or 'serpentine'
+    Returns:
+        Maze: generated maze, with entrances
+    """
+    from .Maze import Maze
+    from .MazeRoomGen import DungeonRooms
+    from .Benchmark import random_rooms
+
+    m = Maze(seed)
+    rooms = random_rooms(size, density, 0 if seed is None else seed)
+    m.generator = DungeonRooms((size - 1) // 2, (size - 1) // 2, rooms=rooms, hunt_order=hunt_order)
+    m.generate()
+    m.generate_entrances(goals)
+    return m
+
+
+def benchmark_table(no_of_tests=5, workers=None, metric='length', size=15, density=0.2, goals=4, seed=0):
+    """ Solve fresh mazes with BFS, DFS, Greedy and A* across a process pool
+
+    Args:
+        no_of_tests (int): number of mazes, one row each
+        workers (int): worker processes, None for one per CPU, 1 to stay in this process
+        metric (str): 'length' of the solutions, or a SolveStats counter such as 'expanded'
+        seed (int): seed of the first maze, the others follow on
+        see make_maze for the others
+    Returns:
+        list: one row per maze, the metric of each algorithm in ALGORITHMS order
+    """
+    from . import Benchmark
+    mazes = [make_maze(size, density, goals, seed + i) for i in range(no_of_tests)]
+    return Benchmark.solve_table(mazes, ALGORITHMS, workers, metric=metric)
+
+
+def format_table(table):
+    """ Plain-text table, one row per maze
+
+    Args:
+        table (list): see benchmark_table
+    Returns:
+        str: aligned text
+    """
+    rows = [[''] + list(LABELS)] + [['Maze {}'.format(i + 1)] + [str(v) for v in row] for i, row in enumerate(table)]
+    widths = [max(len(row[j]) for row in rows) for j in range(len(rows[0]))]
+    return '\n'.join(' '.join(v.rjust(w) for v, w in zip(row, widths)) for row in rows)
+
+
+def write_csv(table, out):
+    """ Write a benchmark table as CSV, with a header row
+
+    Args:
+        table (list): see benchmark_table
+        out (str): file path
+    Returns:
+        None
+    """
+    with open(out, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['maze'] + list(ALGORITHMS))
+        for i, row in enumerate(table):
+            writer.writerow([i + 1] + list(row))
+
+
+def plot_table(table, metric='length', out=None):
+    """ Bar chart of a benchmark table: one group per algorithm, one bar per maze
+
+    Args:
+        table (list): see benchmark_table
+        metric (str): what the table holds, for the title
+        out (str): image file to save to without a display, None to open a window
+    Returns:
+        None
+    """
+    import matplotlib
+    if out is not None:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+    width = 0.8 / max(1, len(table))
+    for i, row in enumerate(table):
+        ax.bar([j + (i - (len(table) - 1) / 2) * width for j in range(len(LABELS))], row, width,
+               label='Maze {}'.format(i + 1))
+    ax.set_xticks(range(len(LABELS)))
+    ax.set_xticklabels(LABELS)
+    ax.set_title('Benchmark: {}'.format(metric))
+    ax.legend()
+
+    if out is None:
+        plt.show()
+    else:
+        fig.savefig(out, dpi=150, bbox_inches='tight')
+    plt.close(fig)
+
+
+def draw_graph(no_of_tests=5, workers=None, metric='length', out=None):
+    """ Benchmark efficiency of solution among algorithms.
+    Plot graph based on the result.
+
+    Args:
+        no_of_tests (int): number of tests to be done for a graph, default is 5
+        workers (int): benchmark worker processes, None for one per CPU
+        metric (str): 'length' of the solutions, or a SolveStats counter such as 'expanded'
+        out (str): image file to save the chart to, None to show it in a window
+    Returns:
+        list: the benchmark table
+    """
+    result = benchmark_table(no_of_tests, workers, metric)
+    print(format_table(result))
+    plot_table(result, metric, out)
+    return result
+
+
+def bench(args):
+    """ The bench command: build a table, print it, write whatever files were asked for
+
+    Returns:
+        int: exit status
+    """
+    table = benchmark_table(args.tests, args.workers, args.metric, args.size, args.density, args.goals, args.seed)
+    print(format_table(table))
+    if args.csv:
+        write_csv(table, args.csv)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'metric': args.metric, 'algorithms': list(ALGORITHMS), 'table': table}, f, indent=1)
+    if args.png or not args.headless:
+        plot_table(table, args.metric, args.png)
+    return 0
+
+
+def maze(args):
+    """ The maze command: generate, solve, and draw one maze
+
+    Returns:
+        int: exit status
+    """
+    from . import SOLVERS
+    from .MazeRenderer import MazeRenderer
+
+    m = make_maze(args.size, args.density, args.goals, args.seed)
+    m.solver = 'auto' if args.solver == 'auto' else SOLVERS.create(args.solver)
+    m.solve()
+    if m.selector is not None:
+        entry = m.selector.history[-1]
+        print('auto: {solver}, predicted {predicted:.4f}s, took {time:.4f}s'.format(**entry), file=sys.stderr)
+    if args.png:
+        m.write_png(args.png, renderer=MazeRenderer(scale=args.scale))
+    if args.text or not args.png:
+        m.write_text(sys.stdout)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Maze benchmark charts and drawings')
+    commands = parser.add_subparsers(dest='command')
+
+    table = commands.add_parser('bench', help='solve mazes with every algorithm, tabulate and chart a metric')
+    table.add_argument('--tests', type=int, default=5, help='mazes to solve')
+    table.add_argument('--workers', type=int, help='worker processes, default one per CPU')
+    table.add_argument('--metric', default='length', help="'length', or a SolveStats counter such as expanded")
+    table.add_argument('--csv', help='write the table as CSV here')
+    table.add_argument('--json', help='write the table as JSON here')
+    table.add_argument('--png', help='save the chart here instead of opening a window')
+    table.add_argument('--headless', action='store_true', help='never open a window; chart only with --png')
+
+    draw = commands.add_parser('maze', help='generate, solve and draw one maze')
+    draw.add_argument('--solver', default='AStar', help="SOLVERS name, or 'auto' to pick the fastest")
+    draw.add_argument('--png', help='save the drawing here')
+    draw.add_argument('--scale', type=int, default=4, help='PNG pixels per cell side')
+    draw.add_argument('--text', action='store_true', help='print the drawing too, when saving a PNG')
+
+    for command, size in ((table, 15), (draw, 41)):
+        command.add_argument('--size', type=int, default=size, help='odd cells per side')
+        command.add_argument('--density', type=float, default=0.2, help='fraction of the grid in rooms')
+        command.add_argument('--goals', type=int, default=4, help='number of ends')
+        command.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args(argv)
+    if args.command is None:
+        # the original behaviour: a five-maze chart in a window
+        args = parser.parse_args(['bench'])
+    return bench(args) if args.command == 'bench' else maze(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,57 @@
+""" Maze generation and path planning for a cleaning robot.
+
+Importing the package is cheap: algorithms are found by name in the registries
+and imported on first use, and the classes below are only imported when first
+accessed, so NumPy and the solvers load only when actually needed.
+
+    import roombasim
+    maze = roombasim.Maze(seed=1)
+    maze.generator = roombasim.GENERATORS['DungeonRooms'](10, 10)
+    maze.generate()
+    maze.generate_entrances(3)
+    maze.solver = roombasim.SOLVERS.create('AStar')
+    maze.solve()
+"""
+from importlib import import_module
+from .Registry import Registry
+
+GENERATORS = Registry('generator', {
+    'DungeonRooms': 'MazeRoomGen:DungeonRooms',
+})
+
+SOLVERS = Registry('solver', {
+    'BFS': 'BFSAlgo:BFSAlgo',
+    'DFS': 'DFSAlgo:DFSAlgo',
+    'Greedy': 'GreedyAlgo:GreedyAlgo',
+    'AStar': 'AStarAlgo:AStarAlgo',
+    'Dijkstra': 'DijkstraAlgo:DijkstraAlgo',
+    'Anytime': 'AnytimeAlgo:AnytimeAlgo',
+    'Battery': 'BatteryAlgo:BatteryAlgo',
+})
+
+# public name -> module that defines it, imported on first access
+_LAZY = {
+    'Maze': 'Maze',
+    'MazeSolver': 'MazeSolver',
+    'SolutionCache': 'SolutionCache',
+    'Path': 'Path',
+    'SolveStats': 'SolveStats',
+    'SolverSelector': 'SolverSelector',
+    'DeadEndFiller': 'DeadEndFilling',
+    'Landmarks': 'Landmarks',
+    'ExpansionTrace': 'ExpansionTrace',
+    'MazeRenderer': 'MazeRenderer',
+    'CooperativePlanner': 'CooperativePlanner',
+    'CoveragePlanner': 'CoveragePlanner',
+    'FrontierExplorer': 'FrontierExplorer',
+}
+
+__all__ = ['GENERATORS', 'SOLVERS', 'Registry'] + list(_LAZY)
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    value = getattr(import_module('.' + _LAZY[name], __name__), name)
+    globals()[name] = value
+    return value